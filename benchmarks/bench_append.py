@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Incremental Append Benchmark
+Times adding one new day to synthetic datasets of increasing size, comparing
+the append-only splice with the full merge, sort and rewrite path.
+
+Usage:
+    python benchmarks/bench_append.py [--sizes 4000 100000 1000000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from synthetic import make_frame, warm_derived_files, write_csv, workspace
+from src.config import CSV_FILENAME, DATA_DIR
+from src.data_manager import DataManager
+
+
+def time_append(method_name: str, rows: int) -> float:
+    """Write a fresh dataset and time appending the next day through the given method."""
+    df = write_csv(os.path.join(DATA_DIR, CSV_FILENAME), rows)
+    latest = datetime.strptime(df['Gregorian Date'].iloc[0], '%Y/%m/%d').date()
+    new_rows = make_frame(1, end=latest + timedelta(days=1)).to_dict('records')
+    
+    # Steady state: the derived files were written by the previous update
+    warm_derived_files()
+    manager = DataManager()
+    start = time.perf_counter()
+    getattr(manager, method_name)(new_rows)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4000, 100000, 1000000], help='Dataset sizes in rows')
+    args = parser.parse_args()
+    
+    workspace('append-bench-')
+    logging.disable(logging.INFO)
+    
+    print(f"{'rows':>9}  {'splice':>9}  {'rewrite':>9}  speedup")
+    for rows in args.sizes:
+        splice = time_append('append_new_data', rows)
+        rewrite = time_append('_merge_and_rewrite', rows)
+        print(f"{rows:>9}  {splice:>8.3f}s  {rewrite:>8.3f}s  {rewrite / splice:6.1f}x")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Dashboard Artifact Benchmark
+Builds the dashboard artifact (src/artifacts.py) for a dataset and loads it
+with docs/script.js under Node.js, next to the CSV path it replaces. The
+decoded days must equal what parseCSV reads, every precomputed indicator
+must match the JavaScript calculation within its rounding, and the weekly
+and monthly bars must equal a pandas resample. Then rows are appended
+through DataManager, which must extend the artifact in place to what a
+full rebuild gives. Reports file sizes and load times.
+
+Usage:
+    python benchmarks/bench_artifacts.py [--csv data/Dollar_Rial_Price_Dataset.csv] [--rows N] [--new-days 5]
+"""
+
+import argparse
+import gzip
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from synthetic import write_csv, workspace
+from src.artifacts import build_artifact, load_artifact, _decode_series
+from src.config import ARTIFACT_BAR_PERIODS, COLUMN_MAPPING, CSV_FILENAME, DATA_DIR, WEEK_END
+from src.data_manager import DataManager
+
+SCRIPT_JS = os.path.join(ROOT_DIR, 'docs', 'script.js')
+
+SERIES = [
+    'RSI', 'Stochastic %K', 'Stochastic %D', 'Momentum', 'MACD', 'MACD Signal', 'EMA 12', 'EMA 26', 'EMA 50',
+    'Tenkan-sen', 'Kijun-sen', 'Senkou Span A', 'Senkou Span B', 'Chikou Span'
+]
+
+# Appended to docs/script.js; both loaders run against a stub fetch that serves the local files
+JS_RUNNER = """
+const names = %s;
+const fields = ['time', 'pdate', 'open', 'low', 'high', 'close'];
+const records = data => data.map(item => fields.map(field => item[field]));
+result = (async () => {
+    let started = process.hrtime.bigint();
+    await loadCSV();
+    const csvLoadMs = Number(process.hrtime.bigint() - started) / 1e6;
+    const macdLines = calculateMACD(allData, 12, 26, 9);
+    const cloud = calculateIchimoku(allData);
+    const computed = [
+        calculateRSI(allData, 14), calculateStochastic(allData, 14, 3), calculateStochasticSlow(allData, 14, 3, 3),
+        calculateMomentum(allData, 10), macdLines.macd, macdLines.signal,
+        calculateEMA(allData, 12), calculateEMA(allData, 26), calculateEMA(allData, 50),
+        cloud.tenkanSen, cloud.kijunSen, cloud.senkouSpanA, cloud.senkouSpanB, cloud.chikouSpan
+    ];
+    const csvMs = Number(process.hrtime.bigint() - started) / 1e6;
+    const csvData = records(allData);
+    
+    started = process.hrtime.bigint();
+    await loadArtifact();
+    const artifactLoadMs = Number(process.hrtime.bigint() - started) / 1e6;
+    const loaded = names.map(name => name === 'Chikou Span' ? laggingSpan(allData, 26) : precomputedSeries(name));
+    const artifactMs = Number(process.hrtime.bigint() - started) / 1e6;
+    
+    const series = {};
+    names.forEach((name, i) => { series[name] = {computed: computed[i], loaded: loaded[i]}; });
+    return {
+        csvLoadMs, csvMs, artifactLoadMs, artifactMs, series, csvData,
+        artifactData: records(allData), weekly: records(precomputed.weekly), monthly: records(precomputed.monthly)
+    };
+})();
+"""
+
+NODE_PROGRAM = """
+const fs = require('fs');
+const vm = require('vm');
+const [scriptPath, csvPath, artifactPath, runner] = process.argv.slice(1);
+const serve = path => ({ok: true, status: 200, text: async () => fs.readFileSync(path, 'utf8'),
+                        json: async () => JSON.parse(fs.readFileSync(path, 'utf8'))});
+const fetch = async url => serve(url.endsWith('.csv') ? csvPath : artifactPath);
+const context = {document: {addEventListener() {}}, window: {}, console: {log() {}, warn() {}, error: console.error},
+                 process, fetch};
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(scriptPath, 'utf8') + runner, context);
+context.result.then(result => process.stdout.write(JSON.stringify(result)));
+"""
+
+
+def run_javascript(csv_path: str, artifact_path: str) -> dict:
+    runner = JS_RUNNER % json.dumps(SERIES)
+    output = subprocess.run(['node', '-e', NODE_PROGRAM, SCRIPT_JS, csv_path, artifact_path, runner],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def compare_series(artifact: dict, javascript: dict) -> list:
+    """Names of the precomputed series that differ from the JavaScript calculation by more than their rounding."""
+    failures = []
+    for name in SERIES:
+        # The lagging span is drawn from the decoded closes, so it is exact
+        decimals = artifact['indicators'][name]['decimals'] if name in artifact['indicators'] else 0
+        tolerance = 0.5 * 10 ** -decimals + 1e-6
+        computed = {point['time']: point['value'] for point in javascript[name]['computed']
+                    if point['value'] is not None and not math.isnan(point['value'])}
+        loaded = {point['time']: point['value'] for point in javascript[name]['loaded']}
+        if computed.keys() != loaded.keys():
+            failures.append(f"{name}: {len(computed.keys() ^ loaded.keys())} days drawn by only one path")
+            continue
+        wrong = [time for time, value in computed.items() if abs(value - loaded[time]) > tolerance]
+        if wrong:
+            failures.append(f"{name}: {len(wrong)} values off by more than {tolerance:g} (first: {wrong[0]})")
+    return failures
+
+
+def resampled_bars(df: pd.DataFrame, period: str) -> list:
+    """Bars the way pandas resamples them, dated by their first trading day, as the JavaScript records."""
+    rule = {'weekly': f'W-{WEEK_END}', 'monthly': 'MS'}[period]
+    dates = pd.to_datetime(df[COLUMN_MAPPING["gregorian_date"]], format='%Y/%m/%d')
+    daily = df.assign(time=dates).set_index('time').sort_index()
+    daily['first_day'] = daily.index
+    bars = daily.resample(rule).agg({
+        'first_day': 'first', COLUMN_MAPPING["open_price"]: 'first', COLUMN_MAPPING["low_price"]: 'min',
+        COLUMN_MAPPING["high_price"]: 'max', COLUMN_MAPPING["close_price"]: 'last'
+    }).dropna()
+    return [[row.first_day.strftime('%Y-%m-%d'), None, *(int(value) for value in row[1:])]
+            for row in bars.itertuples(index=False)]
+
+
+def check_append(df: pd.DataFrame, new_days: int) -> tuple:
+    """
+    Append the newest days through DataManager.
+    
+    Returns (extended artifact matches a rebuild, append seconds, artifact update seconds, rebuilds).
+    """
+    workspace('artifact-append-', df.iloc[new_days:])
+    manager = DataManager()
+    manager.get_indicator_state()
+    manager.update_artifact()
+    
+    rebuilds = []
+    rebuild = manager._rebuild_artifact
+    manager._rebuild_artifact = lambda: rebuilds.append(1) or rebuild()
+    update_times = []
+    extend = manager._extend_artifact
+    
+    def timed_extend(*args):
+        started = time.perf_counter()
+        try:
+            return extend(*args)
+        finally:
+            update_times.append(time.perf_counter() - started)
+    
+    manager._extend_artifact = timed_extend
+    start = time.perf_counter()
+    manager.append_new_data(df.iloc[:new_days].to_dict('records'))
+    append_time = time.perf_counter() - start
+    
+    extended = load_artifact(manager.artifact_path)
+    expected = build_artifact(pd.read_csv(manager.csv_path), manager._content_signature())
+    days = len(df)
+    matches = all(extended[key] == expected[key] for key in expected if key != 'indicators')
+    for name, encoded in expected['indicators'].items():
+        want = _decode_series(encoded, days)
+        got = _decode_series(extended['indicators'][name], days)
+        # Running EMA, MACD and RSI values may differ in the last float bit, so allow one unit of rounding
+        present = ~np.isnan(want)
+        matches = matches and np.array_equal(present, ~np.isnan(got)) and \
+            bool(np.all(np.abs(want[present] - got[present]) <= 1.01 * 10 ** -encoded['decimals']))
+    return matches, append_time, sum(update_times), len(rebuilds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=os.path.join(ROOT_DIR, DATA_DIR, CSV_FILENAME), help='Dataset to check')
+    parser.add_argument('--rows', type=int, help='Use a synthetic dataset of this many rows instead')
+    parser.add_argument('--new-days', type=int, default=5, help='Days appended to check the incremental update')
+    args = parser.parse_args()
+    
+    if shutil.which('node') is None:
+        print("❌ Node.js is required to run docs/script.js")
+        return 1
+    
+    workdir = tempfile.mkdtemp(prefix='artifact-bench-')
+    csv_path = os.path.abspath(args.csv)
+    if args.rows:
+        csv_path = os.path.join(workdir, 'synthetic.csv')
+        write_csv(csv_path, args.rows)
+    df = pd.read_csv(csv_path)
+    
+    start = time.perf_counter()
+    artifact = build_artifact(df)
+    build_time = time.perf_counter() - start
+    artifact_path = os.path.join(workdir, 'dataset.dashboard.json')
+    with open(artifact_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, separators=(',', ':'))
+    
+    javascript = run_javascript(csv_path, artifact_path)
+    
+    if javascript['artifactData'] != javascript['csvData']:
+        print("❌ The days decoded from the artifact differ from what parseCSV reads")
+        return 1
+    failures = compare_series(artifact, javascript['series'])
+    if failures:
+        print("❌ Precomputed indicators differ from docs/script.js:")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    for name in ARTIFACT_BAR_PERIODS:
+        if javascript[name] != resampled_bars(df, name):
+            print(f"❌ The {name} bars differ from a pandas resample")
+            return 1
+    
+    matches, append_time, update_time, rebuilds = check_append(df, args.new_days)
+    if rebuilds or not matches:
+        print(f"❌ Appending {args.new_days} days did not extend the artifact to what a rebuild gives "
+              f"({rebuilds} rebuilds)")
+        return 1
+    
+    with open(csv_path, 'rb') as f:
+        csv_bytes = f.read()
+    with open(artifact_path, 'rb') as f:
+        artifact_bytes = f.read()
+    
+    print(f"{len(df)} rows: decoded days, {len(SERIES)} indicator series and "
+          f"{', '.join(ARTIFACT_BAR_PERIODS)} bars match; appending {args.new_days} days extends the artifact")
+    print(f"{'':<34}{'CSV':>10}{'artifact':>10}")
+    print(f"{'size (KiB)':<34}{len(csv_bytes) / 1024:>10.1f}{len(artifact_bytes) / 1024:>10.1f}")
+    print(f"{'gzipped (KiB)':<34}{len(gzip.compress(csv_bytes)) / 1024:>10.1f}"
+          f"{len(gzip.compress(artifact_bytes)) / 1024:>10.1f}")
+    print(f"{'load bars (ms, Node.js)':<34}{javascript['csvLoadMs']:>10.2f}{javascript['artifactLoadMs']:>10.2f}")
+    print(f"{'bars + all indicators (ms)':<34}{javascript['csvMs']:>10.2f}{javascript['artifactMs']:>10.2f}")
+    print(f"{'artifact build (ms)':<34}{'':>10}{build_time * 1000:>10.1f}")
+    print(f"{f'artifact extend, {args.new_days} days (ms)':<34}{'':>10}{update_time * 1000:>10.1f}")
+    print(f"{f'append of {args.new_days} days (ms)':<34}{'':>10}{append_time * 1000:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Asyncio Scraper Benchmark
+Runs a full scrape followed by an incremental update with the threaded HTTP
+scraper and with AsyncHttpScraper against the local fake TGJU server, checks
+that both rebuild the recorded dataset byte for byte, and measures how long
+the event loop stalls while the async scraper runs next to other tasks.
+
+Usage:
+    python benchmarks/bench_async.py [--latency 0.05] [--page-size 100] [--workers 4] [--error-rate 0.1]
+"""
+
+import argparse
+import asyncio
+import filecmp
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from fake_tgju import FakeTGJUServer, time_full_then_update, DEFAULT_CSV, load_recorded_rows
+from synthetic import workspace
+from src.config import CSV_FILENAME, DATA_DIR
+from src.async_scraper import AsyncHttpScraper
+
+async def heartbeat(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Tick every `interval` seconds and return the worst lateness of a tick."""
+    worst = 0.0
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - expected)
+    return worst
+
+
+async def run_async(scraper: AsyncHttpScraper) -> tuple:
+    """Run the scraper next to a heartbeat task; return (success, worst loop stall)."""
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(heartbeat(stop))
+    try:
+        success = await scraper.run()
+    finally:
+        stop.set()
+    return success, await ticker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.05, help='Per-request server latency in seconds')
+    parser.add_argument('--page-size', type=int, default=100, help='Rows requested per page')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent page requests')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of API requests answered with 503')
+    parser.add_argument('--retry-delay', type=float, default=0.05, help='Base backoff of the async scraper in seconds')
+    args = parser.parse_args()
+    
+    all_rows = load_recorded_rows()
+    results = {}
+    stalls = []
+    
+    with FakeTGJUServer(latency=args.latency, error_rate=args.error_rate) as server:
+        def threaded():
+            return server.scraper(page_size=args.page_size, workers=args.workers).run()
+        
+        def asynchronous():
+            scraper = AsyncHttpScraper(api_url=server.api_url(), page_size=args.page_size, workers=args.workers,
+                                       rate_limit=0, retry_delay=args.retry_delay)
+            success, stall = asyncio.run(run_async(scraper))
+            stalls.append(stall)
+            return success
+        
+        for name, run in (('threaded', threaded), ('asyncio', asynchronous)):
+            workspace(f'async-bench-{name}-')
+            ok, full_time, update_time = time_full_then_update(server, all_rows, run)
+            if not ok:
+                print(f"❌ The {name} scraper failed")
+                return 1
+            if not filecmp.cmp(os.path.join(DATA_DIR, CSV_FILENAME), DEFAULT_CSV, shallow=False):
+                print(f"❌ The {name} scraper did not reproduce the recorded dataset")
+                return 1
+            results[name] = (full_time, update_time)
+        
+        errors = server.error_count
+    
+    print(f"{len(all_rows)} rows, {args.page_size} per page, {args.workers} workers, "
+          f"{args.latency * 1000:.0f} ms latency, {errors} injected 503s")
+    print(f"{'':<12}{'full scrape':>12}{'update':>10}")
+    for name, (full_time, update_time) in results.items():
+        print(f"{name + ':':<12}{full_time:11.2f}s{update_time:9.2f}s")
+    print(f"Worst event loop stall during async runs: {max(stalls) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Parallel Backfill Benchmark
+Times a full HTTP backfill against the local fake TGJU server with an
+artificial per-request latency, for several worker counts, and checks that
+every run produces the same rows. The speedup itself is asserted by
+tests/test_backfill.py.
+
+Usage:
+    python benchmarks/bench_backfill.py [--latency 0.05] [--page-size 30] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_tgju import FakeTGJUServer
+from synthetic import workspace
+
+
+def run_backfill(server: FakeTGJUServer, workers: int, page_size: int):
+    """Run one backfill and return (seconds, rows)."""
+    scraper = server.scraper(page_size=page_size, workers=workers)
+    scraper.data_manager.journal.clear()
+    scraper.start_time = datetime.now()
+    start = time.perf_counter()
+    rows = scraper._backfill()
+    return time.perf_counter() - start, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.05, help='Per-request server latency in seconds')
+    parser.add_argument('--page-size', type=int, default=30, help='Rows requested per page')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='Worker counts to compare')
+    args = parser.parse_args()
+    
+    workspace('backfill-bench-')
+    
+    with FakeTGJUServer(latency=args.latency) as server:
+        baseline_time, baseline_rows = None, None
+        for workers in args.workers:
+            elapsed, rows = run_backfill(server, workers, args.page_size)
+            if baseline_rows is None:
+                baseline_time, baseline_rows = elapsed, rows
+            elif rows != baseline_rows:
+                print(f"❌ {workers} workers produced different rows than {args.workers[0]}")
+                return 1
+            print(f"{workers:>3} workers: {elapsed:7.2f}s  {len(rows)} rows  {baseline_time / elapsed:5.1f}x")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
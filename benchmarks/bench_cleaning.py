@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Cell Cleaning Benchmark
+Times the per-cell cleaners against the vectorized Arrow path of
+clean_prices, clean_changes and parse_dates at several batch sizes (a
+Selenium page, an API page and a whole historical dump), checks that both
+paths agree, and times the batch functions, which pick a path by size.
+Every tenth cell uses Persian digits, as the site sometimes does.
+
+Usage:
+    python benchmarks/bench_cleaning.py [--cells 30 10000 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from synthetic import make_frame
+from src.config import COLUMN_MAPPING
+from src import utils
+
+PERSIAN_DIGITS = str.maketrans('0123456789,.%', '۰۱۲۳۴۵۶۷۸۹٬٫٪')
+
+CLEANERS = {
+    'prices': (COLUMN_MAPPING["close_price"], utils._clean_price, utils.clean_prices),
+    'changes': (COLUMN_MAPPING["change_percent"], utils._clean_change, utils.clean_changes),
+    'dates': (COLUMN_MAPPING["gregorian_date"], utils._parse_date, utils.parse_dates),
+}
+
+
+def raw_cells(df: pd.DataFrame, column: str) -> list:
+    """Format a column the way the site shows it, with Persian digits in every tenth cell."""
+    if column == COLUMN_MAPPING["close_price"]:
+        cells = [f"{value:,}" for value in df[column]]
+    else:
+        cells = [str(value) for value in df[column]]
+    return [cell.translate(PERSIAN_DIGITS) if i % 10 == 0 else cell for i, cell in enumerate(cells)]
+
+
+def best_time(function, cells, budget: float = 1.0) -> float:
+    """Best of several runs, repeating small batches for about `budget` seconds."""
+    best = float('inf')
+    deadline = time.perf_counter() + budget
+    runs = 0
+    while runs < 3 or (time.perf_counter() < deadline and runs < 1000):
+        start = time.perf_counter()
+        function(cells)
+        best = min(best, time.perf_counter() - start)
+        runs += 1
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cells', type=int, nargs='+', default=[30, 10000, 1000000], help='Batch sizes in cells')
+    args = parser.parse_args()
+    
+    if not utils._load_arrow():
+        print("❌ pyarrow is not installed, so there is no vectorized path")
+        return 1
+    
+    threshold = utils.VECTORIZE_MIN_CELLS
+    
+    def vectorized(clean_batch, cells):
+        utils.VECTORIZE_MIN_CELLS = 0
+        try:
+            return clean_batch(cells)
+        finally:
+            utils.VECTORIZE_MIN_CELLS = threshold
+    
+    frame = make_frame(max(args.cells))
+    print(f"Batch functions vectorize from {threshold} cells")
+    print(f"{'cleaner':<9}{'cells':>9}  {'per cell':>10}  {'vectorized':>10}  {'speedup':>7}  {'batch fn':>10}")
+    
+    for name, (column, clean_one, clean_batch) in CLEANERS.items():
+        for size in args.cells:
+            cells = raw_cells(frame.head(size), column)
+            
+            looped = [clean_one(cell) for cell in cells]
+            if vectorized(clean_batch, cells) != looped or clean_batch(cells) != looped:
+                print(f"❌ The {name} paths disagree at {size} cells")
+                return 1
+            
+            loop_time = best_time(lambda batch: [clean_one(cell) for cell in batch], cells)
+            vector_time = best_time(lambda batch: vectorized(clean_batch, batch), cells)
+            batch_time = best_time(clean_batch, cells)
+            print(
+                f"{name:<9}{size:>9}  {loop_time * 1000:>8.3f}ms  {vector_time * 1000:>8.3f}ms  "
+                f"{loop_time / vector_time:>6.1f}x  {batch_time * 1000:>8.3f}ms"
+            )
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+CLI Benchmark
+Drives main.py's commands in-process against the local fake TGJU server,
+on a synthetic dataset that misses the newest days and a run of older
+ones. Checks that `query --json` reports what is stored, that
+`update --check --dry-run` finds the missing newest days without writing,
+that `update --check` adds them without reading the whole CSV, that
+`backfill` fills the hole and `verify` then finds nothing wrong. Prints how
+long each command took, and a regular `update` for comparison.
+
+Usage:
+    python benchmarks/bench_cli.py [--rows 100000] [--new-days 3] [--hole 300]
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from contextlib import redirect_stdout
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from fake_tgju import FakeTGJUServer
+from synthetic import make_frame, warm_derived_files, workspace
+from src import http_scraper, instruments
+from src.config import CSV_FILENAME, DATA_DIR, DEFAULT_INSTRUMENT
+from src.metrics import REGISTRY
+import main as cli
+
+
+def run(*argv) -> tuple:
+    """Run one command; return (exit code, parsed JSON output or None, seconds)."""
+    output = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(output):
+        code = cli.main(['--metrics-dir', os.path.join(os.getcwd(), 'metrics'), *argv])
+    seconds = time.perf_counter() - start
+    text = output.getvalue()
+    return code, (json.loads(text)[DEFAULT_INSTRUMENT] if '--json' in argv else None), seconds
+
+
+def csv_reads() -> int:
+    return REGISTRY.get(instrument=DEFAULT_INSTRUMENT).to_dict()['timers'].get('load_csv', {}).get('count', 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='Rows of the served dataset')
+    parser.add_argument('--new-days', type=int, default=3, help='Newest days missing locally')
+    parser.add_argument('--hole', type=int, default=300, help='Older days missing locally, for backfill')
+    args = parser.parse_args()
+    
+    logging.disable(logging.WARNING)
+    df = make_frame(args.rows)
+    hole = df.iloc[args.rows // 2:args.rows // 2 + args.hole]
+    local = df.drop(hole.index).iloc[args.new_days:]
+    newest = df['Gregorian Date'].iloc[:args.new_days].tolist()
+    
+    workspace('cli-bench-', local)
+    local_path = os.path.join(DATA_DIR, CSV_FILENAME)
+    shutil.copy(local_path, 'local.csv')
+    
+    timings = {}
+    failures = []
+    with FakeTGJUServer.from_frame(df) as server:
+        http_scraper.API_URL_TEMPLATE = instruments.API_URL_TEMPLATE = server.api_url_template()
+        
+        warm_derived_files()
+        code, summary, timings['query --summary'] = run('query', '--summary', '--json')
+        if code or summary['total_records'] != len(local) or summary['latest_date'] != local['Gregorian Date'].iloc[0]:
+            failures.append(f"query --summary reported {summary}")
+        
+        code, preview, timings['update --check --dry-run'] = run('update', '--check', '2', '--dry-run', '--json')
+        if code or sorted(preview['new_records']) != sorted(newest):
+            failures.append(f"the dry run found {preview['new_records']}, expected {newest}")
+        if os.path.getsize(local_path) != os.path.getsize('local.csv'):
+            failures.append("the dry run changed the dataset")
+        
+        REGISTRY.reset()
+        code, update, timings['update --check'] = run('update', '--check', '--json')
+        if code or update['rows_added'] != args.new_days or update['latest_date'] != newest[0]:
+            failures.append(f"update --check reported {update}")
+        if csv_reads():
+            failures.append(f"update --check read the whole CSV {csv_reads()} times")
+        
+        first, last = hole['Gregorian Date'].iloc[-1], hole['Gregorian Date'].iloc[0]
+        code, backfill, timings['backfill'] = run('backfill', '--from', first, '--to', last, '--json')
+        if code or backfill['rows_added'] != args.hole:
+            failures.append(f"backfill of {first} to {last} reported {backfill}")
+        
+        code, report, timings['verify'] = run('verify', '--strict', '--json')
+        if code or report['total_records'] != args.rows:
+            failures.append(f"verify reported {report['problems']}, {report['gaps']} on {report['total_records']} rows")
+        
+        code, rows, timings['query --from --to'] = run('query', '--from', first, '--to', last, '--json')
+        if code or len(rows['rows']) != args.hole:
+            failures.append(f"query --from {first} --to {last} returned {len(rows['rows'])} rows")
+        
+        # A regular update of the same state, for comparison with the quick check
+        shutil.copy('local.csv', local_path)
+        warm_derived_files()
+        code, _, timings['update'] = run('update', '--json')
+        if code:
+            failures.append("the regular update failed")
+    
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+    
+    print(f"{args.rows} rows, {args.new_days} new days, a hole of {args.hole} days; every command checked out")
+    for name, seconds in timings.items():
+        print(f"{name + ':':<28}{seconds:8.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
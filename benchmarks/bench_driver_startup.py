@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Driver Startup Benchmark
+Measures ChromeDriver resolution with and without the version manifest, and
+the cost of a fresh Chrome per scrape versus borrowing a warm one from a
+DriverPool, by loading the saved history page N times. Requires Chrome.
+
+Usage:
+    python benchmarks/bench_driver_startup.py [--loads 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from selenium.webdriver.common.by import By
+from src.config import TABLE_SELECTOR
+from src.drivers import DriverManifest, DriverPool, create_driver, detect_chrome_version, resolve_driver_path
+
+FIXTURE_URL = f"file://{os.path.abspath(os.path.join(os.path.dirname(__file__), 'fixtures', 'history_page.html'))}"
+
+
+def load_page(driver) -> int:
+    """Load the fixture and return the number of table rows."""
+    driver.get(FIXTURE_URL)
+    return len(driver.find_elements(By.CSS_SELECTOR, TABLE_SELECTOR))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--loads', '-n', type=int, default=5, help='Page loads per strategy')
+    args = parser.parse_args()
+    
+    chrome_version = detect_chrome_version()
+    if not chrome_version:
+        print("❌ Chrome not found")
+        return 1
+    print(f"Chrome {chrome_version}")
+    
+    manifest = DriverManifest(os.path.join(tempfile.mkdtemp(prefix='driver-bench-'), 'chromedriver.json'))
+    start = time.perf_counter()
+    resolve_driver_path(manifest)
+    uncached = time.perf_counter() - start
+    start = time.perf_counter()
+    _, source = resolve_driver_path(manifest)
+    cached = time.perf_counter() - start
+    if source != "cached":
+        print("❌ Second resolution did not hit the manifest")
+        return 1
+    
+    print(f"Driver resolution:      {uncached:7.3f}s uncached, {cached:7.3f}s from manifest")
+    
+    start = time.perf_counter()
+    for _ in range(args.loads):
+        driver = create_driver()
+        try:
+            load_page(driver)
+        finally:
+            driver.quit()
+    fresh = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    with DriverPool(size=1) as pool:
+        for _ in range(args.loads):
+            with pool.borrow() as driver:
+                load_page(driver)
+        stats = pool.stats()
+    pooled = time.perf_counter() - start
+    
+    print(f"Fresh Chrome per load:  {fresh:7.2f}s for {args.loads} loads")
+    print(f"Warm driver pool:       {pooled:7.2f}s for {args.loads} loads "
+          f"(cold start {stats['avg_cold_start']}s, warm borrow {stats['avg_warm_borrow']}s)")
+    print(f"Speedup:                {fresh / pooled:7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+Measures startup with `python -X importtime` for the ways the project is
+entered: importing the package, the utils helpers, DataManager for
+read-only analytics, `main.py --help`, and the read-only `query --summary`
+and `verify` commands on the committed dataset. Each scenario must stay clear of
+the heavy packages it does not need (selenium, pandas, ...); a new import
+of one fails the run. Times are the median over several fresh
+interpreters, counting only what the scenario imports beyond a bare
+interpreter.
+
+With --baseline (results saved earlier with --output) a scenario also
+fails when it got more than --tolerance slower, or started importing a
+third-party package it did not import before.
+
+Usage:
+    python benchmarks/bench_import.py [--runs 7] [--output imports.json] [--baseline previous.json] [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+HEAVY = ('selenium', 'webdriver_manager', 'pandas', 'numpy', 'pyarrow', 'lxml', 'aiohttp', 'requests')
+
+# Packages only the scraping commands need
+SCRAPING = ('selenium', 'webdriver_manager', 'aiohttp', 'requests', 'lxml')
+
+# Scenario -> (interpreter arguments, heavy packages it must not import)
+SCENARIOS = {
+    'import src': (['-c', 'import src'], HEAVY),
+    'src.utils helpers': (['-c', 'from src.utils import clean_prices, parse_table_html, setup_logging'], HEAVY),
+    'src.data_manager': (['-c', 'from src.data_manager import DataManager'], SCRAPING),
+    'main.py --help': (['main.py', '--help'], HEAVY),
+    'main.py query --summary': (['main.py', 'query', '--summary', '--json'], SCRAPING),
+    'main.py verify': (['main.py', 'verify', '--json'], SCRAPING),
+}
+
+# Modules a bare interpreter imports, filled in by main()
+BARE_MODULES = set()
+
+# Slowdowns smaller than this are noise, whatever the ratio
+NOISE_MS = 5.0
+
+# "import time: self [us] | cumulative | name", nested imports indented under the name column
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def import_times(arguments: list) -> dict:
+    """Cumulative microseconds of each top-level import of one fresh interpreter."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *arguments], cwd=ROOT_DIR,
+                            capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"{' '.join(arguments)} failed:\n{result.stderr[-2000:]}")
+    times = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def imported_modules(arguments: list) -> set:
+    """Every module name the scenario imports (nested ones included)."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *arguments], cwd=ROOT_DIR,
+                            capture_output=True, text=True)
+    return {match.group(4) for match in map(LINE.match, result.stderr.splitlines()) if match}
+
+
+def measure(arguments: list, bare: set, runs: int) -> float:
+    """Median milliseconds of the top-level imports a bare interpreter does not make."""
+    totals = []
+    for _ in range(runs):
+        times = import_times(arguments)
+        totals.append(sum(micros for name, micros in times.items() if name not in bare) / 1000)
+    return statistics.median(totals)
+
+
+def third_party(modules: set) -> list:
+    """Top-level packages outside the standard library and this project."""
+    packages = {name.split('.')[0] for name in modules - BARE_MODULES}
+    return sorted(package for package in packages
+                  if package not in sys.stdlib_module_names and package not in ('src', 'main')
+                  and not package.startswith('_'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=7, help='Fresh interpreters per scenario; the median is kept')
+    parser.add_argument('--output', help='Write the results here as JSON')
+    parser.add_argument('--baseline', help='Earlier results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown, as a fraction')
+    args = parser.parse_args()
+    
+    bare = set(import_times(['-c', 'pass']))
+    # Site customizations of this environment, not of the scenarios
+    BARE_MODULES.update(imported_modules(['-c', 'pass']))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['scenarios']
+    
+    results = {}
+    failures = []
+    print(f"{'scenario':<26}{'imports':>10}  third-party packages")
+    for name, (arguments, forbidden) in SCENARIOS.items():
+        modules = imported_modules(arguments)
+        packages = third_party(modules)
+        heavy = [package for package in forbidden if package in packages]
+        if heavy:
+            failures.append(f"{name} imports {', '.join(heavy)}")
+        
+        milliseconds = measure(arguments, bare, args.runs)
+        results[name] = {'milliseconds': round(milliseconds, 2), 'packages': packages}
+        print(f"{name:<26}{milliseconds:8.1f}ms  {', '.join(packages) or '-'}")
+        
+        before = baseline.get(name) if baseline else None
+        if before:
+            if milliseconds > before['milliseconds'] * (1 + args.tolerance) and \
+                    milliseconds - before['milliseconds'] > NOISE_MS:
+                failures.append(f"{name} takes {milliseconds:.1f}ms, {before['milliseconds']:.1f}ms before")
+            new_packages = sorted(set(packages) - set(before['packages']))
+            if new_packages:
+                failures.append(f"{name} now imports {', '.join(new_packages)}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'scenarios': results}, f, indent=2)
+    
+    if failures:
+        print("❌ Startup regressed:")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
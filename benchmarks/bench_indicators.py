@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Technical Indicator Benchmark
+Checks src/indicators.py against the dashboard's own JavaScript: docs/script.js
+is run under Node.js on the same CSV (through its parseCSV), and every series
+must match point for point. Also checks that advancing a saved IndicatorState
+day by day gives the values of a full recompute, then times the JavaScript,
+the vectorized full computation, and the incremental update of one new day.
+
+--write-fixture instead saves what docs/script.js computes for
+benchmarks/fixtures/indicators.csv as the golden file tests/test_indicators.py
+checks against, so the tests do not need Node.js. Regenerate it whenever the
+dashboard's calculations change.
+
+Usage:
+    python benchmarks/bench_indicators.py [--csv data/Dollar_Rial_Price_Dataset.csv] [--rows N] [--new-days 5]
+    python benchmarks/bench_indicators.py --write-fixture
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from synthetic import write_csv
+from src.config import CSV_FILENAME, DATA_DIR
+from src.indicators import IndicatorState, compute_indicators
+
+SCRIPT_JS = os.path.join(ROOT_DIR, 'docs', 'script.js')
+FIXTURE_CSV = os.path.join(ROOT_DIR, 'benchmarks', 'fixtures', 'indicators.csv')
+GOLDEN_PATH = os.path.join(ROOT_DIR, 'benchmarks', 'fixtures', 'indicators_golden.json')
+
+# Appended to docs/script.js and run in a Node.js context with stub document and window objects
+JS_RUNNER = """
+const data = parseCSV(csvText);
+const started = process.hrtime.bigint();
+const macdLines = calculateMACD(data, 12, 26, 9);
+const cloud = calculateIchimoku(data);
+const series = {
+    'RSI': calculateRSI(data, 14),
+    'Stochastic %K': calculateStochastic(data, 14, 3),
+    'Stochastic %D': calculateStochasticSlow(data, 14, 3, 3),
+    'Momentum': calculateMomentum(data, 10),
+    'MACD': macdLines.macd,
+    'MACD Signal': macdLines.signal,
+    'EMA 12': calculateEMA(data, 12),
+    'EMA 26': calculateEMA(data, 26),
+    'EMA 50': calculateEMA(data, 50),
+    'Tenkan-sen': cloud.tenkanSen,
+    'Kijun-sen': cloud.kijunSen,
+    'Senkou Span A': cloud.senkouSpanA,
+    'Senkou Span B': cloud.senkouSpanB,
+    'Chikou Span': cloud.chikouSpan
+};
+result = {ms: Number(process.hrtime.bigint() - started) / 1e6, series};
+"""
+
+NODE_PROGRAM = """
+const fs = require('fs');
+const vm = require('vm');
+const [scriptPath, csvPath, runner] = process.argv.slice(1);
+const context = {document: {addEventListener() {}}, window: {}, console, process, csvText: fs.readFileSync(csvPath, 'utf8')};
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(scriptPath, 'utf8') + runner, context);
+process.stdout.write(JSON.stringify(context.result));
+"""
+
+
+def run_javascript(csv_path: str) -> dict:
+    """Return {'ms': compute time, 'series': {name: [{time, value}, ...]}} from docs/script.js."""
+    output = subprocess.run(['node', '-e', NODE_PROGRAM, SCRIPT_JS, csv_path, JS_RUNNER],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def write_fixture() -> int:
+    """Save the series docs/script.js computes for FIXTURE_CSV to GOLDEN_PATH as {name: {date: value}}."""
+    series = run_javascript(FIXTURE_CSV)['series']
+    golden = {name: {point['time']: point['value'] for point in points} for name, points in series.items()}
+    with open(GOLDEN_PATH, 'w', encoding='utf-8') as f:
+        json.dump(golden, f, indent=1, sort_keys=True)
+        f.write('\n')
+    print(f"Wrote {len(golden)} series for {os.path.relpath(FIXTURE_CSV, ROOT_DIR)} to {GOLDEN_PATH}")
+    return 0
+
+
+def close_enough(expected, actual) -> bool:
+    if expected is None or (isinstance(expected, float) and math.isnan(expected)):
+        return actual is None or math.isnan(actual)
+    return actual is not None and math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def compare_series(python: pd.DataFrame, javascript: dict) -> list:
+    """Names of the series whose points differ between the two implementations."""
+    times = python['Gregorian Date'].str.replace('/', '-')
+    failures = []
+    for name, points in javascript.items():
+        values = dict(zip(times, python[name]))
+        drawn = {point['time'] for point in points}
+        missing = [time for time, value in values.items() if not math.isnan(value) and time not in drawn]
+        wrong = [point['time'] for point in points if not close_enough(point['value'], values.get(point['time']))]
+        if missing or wrong:
+            failures.append(f"{name}: {len(wrong)} differing, {len(missing)} missing in JS (first: {(wrong + missing)[0]})")
+    return failures
+
+
+def check_incremental(df: pd.DataFrame, new_days: int) -> bool:
+    """Advance a state built without the newest days and compare with a full recompute."""
+    df = df.sort_values('Gregorian Date')
+    state = IndicatorState.from_frame(df.iloc[:-new_days])
+    advanced = state.advance_frame(df.iloc[-new_days:])
+    expected = compute_indicators(df).tail(new_days).reset_index(drop=True)
+    for column in advanced.columns.drop('Gregorian Date'):
+        for want, got in zip(expected[column], advanced[column]):
+            if not close_enough(want, got):
+                print(f"❌ Incremental {column} is {got}, full recompute gives {want}")
+                return False
+    rebuilt = IndicatorState.from_frame(df).to_dict()
+    for key, value in state.to_dict().items():
+        if isinstance(value, float) and not math.isclose(value, rebuilt[key], rel_tol=1e-9):
+            print(f"❌ Incremental state {key} is {value}, rebuilt state has {rebuilt[key]}")
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=os.path.join(ROOT_DIR, DATA_DIR, CSV_FILENAME), help='Dataset to check')
+    parser.add_argument('--rows', type=int, help='Use a synthetic dataset of this many rows instead')
+    parser.add_argument('--new-days', type=int, default=5, help='Days replayed incrementally')
+    parser.add_argument('--write-fixture', action='store_true',
+                        help='Write the golden indicator values of the test fixture and exit')
+    args = parser.parse_args()
+    
+    if shutil.which('node') is None:
+        print("❌ Node.js is required to run docs/script.js")
+        return 1
+    if args.write_fixture:
+        return write_fixture()
+    
+    csv_path = args.csv
+    if args.rows:
+        csv_path = os.path.join(tempfile.mkdtemp(prefix='indicator-bench-'), 'synthetic.csv')
+        write_csv(csv_path, args.rows)
+    df = pd.read_csv(csv_path)
+    
+    javascript = run_javascript(csv_path)
+    start = time.perf_counter()
+    python = compute_indicators(df)
+    full_time = time.perf_counter() - start
+    
+    failures = compare_series(python, javascript['series'])
+    if failures:
+        print("❌ Python and docs/script.js disagree:")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    if not check_incremental(df, args.new_days):
+        return 1
+    
+    state = IndicatorState.from_frame(df.sort_values('Gregorian Date').iloc[:-1])
+    newest = df.sort_values('Gregorian Date').iloc[-1:]
+    runs = 1000
+    start = time.perf_counter()
+    for _ in range(runs):
+        IndicatorState.from_dict(state.to_dict()).advance_frame(newest)
+    update_time = (time.perf_counter() - start) / runs
+    
+    print(f"{len(df)} rows, {len(javascript['series'])} series match docs/script.js; "
+          f"{args.new_days} incremental days match a full recompute")
+    print(f"docs/script.js (Node.js):     {javascript['ms']:9.2f} ms")
+    print(f"compute_indicators:           {full_time * 1000:9.2f} ms")
+    print(f"IndicatorState, one new day:  {update_time * 1000:9.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Multi-Instrument Benchmark
+Updates N instruments from the local fake TGJU server twice: once as N
+separate runs (a fresh Python process per instrument, like running main.py
+once each) and once in a single process with scrape_instruments. Each mode
+does a full scrape followed by an incremental update, and both must produce
+identical datasets.
+
+Usage:
+    python benchmarks/bench_instruments.py [--instruments 4] [--latency 0.05] [--workers 3]
+"""
+
+import argparse
+import filecmp
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from fake_tgju import FakeTGJUServer, time_full_then_update, load_recorded_rows
+from src.config import INSTRUMENTS, DATA_DIR
+from synthetic import workspace
+from src.instruments import scrape_instruments
+
+SEPARATE_RUN = """
+import sys
+sys.path.insert(0, {root!r})
+from src.http_scraper import HttpScraper
+scraper = HttpScraper({slug!r}, api_url={api_url!r}, page_size={page_size}, rate_limit=0, fallback=False)
+sys.exit(0 if scraper.run() else 1)
+"""
+
+
+def run_separate(server: FakeTGJUServer, instruments, page_size: int) -> bool:
+    """Run each instrument in its own Python process, one after another."""
+    for slug in instruments:
+        code = SEPARATE_RUN.format(root=ROOT_DIR, slug=slug, api_url=server.api_url(slug), page_size=page_size)
+        if subprocess.run([sys.executable, '-c', code], capture_output=True).returncode != 0:
+            return False
+    return True
+
+
+def run_shared(server: FakeTGJUServer, instruments, page_size: int, workers: int) -> bool:
+    """Run all instruments in this process with a shared session."""
+    results = scrape_instruments(instruments, backend="http", workers=workers,
+                                 api_url_template=server.api_url_template(), rate_limit=0,
+                                 page_size=page_size, fallback=False)
+    return all(results.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--instruments', '-n', type=int, default=4, help=f'Number of instruments (max {len(INSTRUMENTS)})')
+    parser.add_argument('--latency', type=float, default=0.05, help='Per-request server latency in seconds')
+    parser.add_argument('--page-size', type=int, default=1000, help='Rows requested per page')
+    parser.add_argument('--workers', type=int, default=3, help='Instruments scraped concurrently in one process')
+    args = parser.parse_args()
+    
+    instruments = list(INSTRUMENTS)[:args.instruments]
+    all_rows = load_recorded_rows()
+    
+    with FakeTGJUServer(latency=args.latency) as server:
+        separate_dir = workspace('instruments-separate-')
+        ok, separate_full, separate_update = time_full_then_update(
+            server, all_rows, lambda: run_separate(server, instruments, args.page_size)
+        )
+        if not ok:
+            print("❌ A separate run failed")
+            return 1
+        
+        shared_dir = workspace('instruments-shared-')
+        ok, shared_full, shared_update = time_full_then_update(
+            server, all_rows, lambda: run_shared(server, instruments, args.page_size, args.workers)
+        )
+        if not ok:
+            print("❌ The shared run failed")
+            return 1
+    
+    for slug in instruments:
+        filename = INSTRUMENTS[slug]['csv_filename']
+        if not filecmp.cmp(os.path.join(separate_dir, DATA_DIR, filename),
+                           os.path.join(shared_dir, DATA_DIR, filename), shallow=False):
+            print(f"❌ {filename} differs between separate and shared runs")
+            return 1
+    
+    print(f"{len(instruments)} instruments, {len(all_rows)} rows each, {args.latency * 1000:.0f} ms latency")
+    print(f"{'':<24}{'full scrape':>12}{'update':>10}")
+    print(f"{'Separate processes:':<24}{separate_full:11.2f}s{separate_update:9.2f}s")
+    print(f"{'One process (shared):':<24}{shared_full:11.2f}s{shared_update:9.2f}s")
+    print(f"{'Speedup:':<24}{separate_full / shared_full:11.1f}x{separate_update / shared_update:9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Dataset Load Benchmark
+Compares loading the CSV and converting it to typed columns with
+DataManager.load_fast() reading the memory-mapped columnar copy, and checks
+that both give identical frames.
+
+Usage:
+    python benchmarks/bench_load.py [--sizes 4000 100000 1000000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from synthetic import write_csv, workspace
+from src.config import CSV_FILENAME, DATA_DIR
+from src.data_manager import DataManager, to_typed_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4000, 100000, 1000000], help='Dataset sizes in rows')
+    args = parser.parse_args()
+    
+    workspace('load-bench-')
+    logging.disable(logging.INFO)
+    csv_path = os.path.join(DATA_DIR, CSV_FILENAME)
+    
+    print(f"{'rows':>9}  {'csv+convert':>11}  {'load_fast':>9}  speedup  {'csv size':>10}  {'columnar':>10}")
+    for rows in args.sizes:
+        write_csv(csv_path, rows)
+        manager = DataManager()
+        manager.load_fast()  # Build the columnar copy
+        
+        start = time.perf_counter()
+        from_csv = to_typed_frame(pd.read_csv(csv_path))
+        csv_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        fast = DataManager().load_fast()
+        fast_time = time.perf_counter() - start
+        
+        pd.testing.assert_frame_equal(from_csv, fast)
+        print(
+            f"{rows:>9}  {csv_time:>10.3f}s  {fast_time:>8.3f}s  {csv_time / fast_time:6.1f}x  "
+            f"{os.path.getsize(csv_path):>10,}  {os.path.getsize(manager.columnar_path):>10,}"
+        )
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Run Metrics Benchmark
+Scrapes a synthetic dataset from the local fake TGJU server, which answers
+some requests with 503s, and checks what the instrumentation recorded: a
+full streamed scrape must count every row and every retry the server
+forced, and an incremental run must time its fetches and the append and
+count the rows it added. The exported run report must round-trip as JSON,
+the Prometheus textfile must parse, and a subscribed hook must see every
+event. Finally it measures what a timer and a counter cost per call.
+
+Usage:
+    python benchmarks/bench_metrics.py [--rows 20000] [--page-size 1000] [--error-rate 0.1]
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_tgju import FakeTGJUServer
+from synthetic import make_frame, workspace
+from src.config import METRICS_REPORT_FILENAME, METRICS_TEXTFILE_FILENAME
+from src.http_scraper import HttpScraper, create_session
+from src.metrics import Metrics, REGISTRY, subscribe, unsubscribe
+
+# One sample line of the text exposition format: name{label="value",...} number
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="(\\.|[^"\\])*",?)*\})? -?[0-9.e+-]+$')
+
+
+def scraper(server: FakeTGJUServer, args, stream: bool) -> HttpScraper:
+    # Retry the injected 503s without the production backoff
+    session = create_session()
+    session.get_adapter(server.base_url).max_retries.backoff_factor = 0
+    return server.scraper(page_size=args.page_size, workers=4, session=session, stream=stream)
+
+
+def invalid_textfile_lines(text: str) -> list:
+    """Lines of a Prometheus textfile that are neither comments nor well-formed samples."""
+    return [line for line in text.splitlines() if not line.startswith('# ') and not SAMPLE.match(line)]
+
+
+def per_call_us(function, calls: int = 100000) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def overhead() -> dict:
+    """Microseconds per timer and counter call, beyond an empty loop, without and with a hook."""
+    metrics = Metrics(bench='overhead')
+    
+    def timed():
+        with metrics.time('stage'):
+            pass
+    
+    baseline = per_call_us(lambda: None)
+    costs = {'timer': per_call_us(timed) - baseline,
+             'counter': per_call_us(lambda: metrics.increment('rows')) - baseline}
+    hook = subscribe(lambda event: None)
+    try:
+        costs['timer, one hook'] = per_call_us(timed) - baseline
+        costs['counter, one hook'] = per_call_us(lambda: metrics.increment('rows')) - baseline
+    finally:
+        unsubscribe(hook)
+    return costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000, help='Rows served by the fake server')
+    parser.add_argument('--page-size', type=int, default=1000, help='Rows per API page')
+    parser.add_argument('--error-rate', type=float, default=0.1, help='Fraction of API requests answered with 503')
+    parser.add_argument('--new-days', type=int, default=5, help='Rows missing locally before the incremental run')
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    df = make_frame(args.rows)
+    events = []
+    subscribe(events.append)
+    
+    with FakeTGJUServer.from_frame(df, error_rate=args.error_rate, seed=3) as server:
+        workspace('metrics-full-')
+        REGISTRY.reset()
+        if not scraper(server, args, stream=True).scrape_all_data(incremental=False):
+            print("❌ The full scrape failed")
+            return 1
+        full = scraper(server, args, stream=True).metrics.to_dict()
+        injected = server.error_count
+        
+        workspace('metrics-update-', df.iloc[args.new_days:])
+        REGISTRY.reset()
+        server.error_rate = 0
+        started = datetime.now()
+        success = scraper(server, args, stream=False).run()
+        update = scraper(server, args, stream=False).metrics.to_dict()
+        metrics_dir = os.path.abspath('metrics')
+        report = REGISTRY.export(started, success, directory=metrics_dir, backend='http')
+    
+    failures = []
+    counters = full['counters']
+    if counters.get('rows_scraped') != args.rows or counters.get('rows_invalid', 0):
+        failures.append(f"full scrape counted {counters.get('rows_scraped')} rows, served {args.rows}")
+    if counters.get('retries', 0) != injected or counters.get('fetch_errors', 0):
+        failures.append(f"full scrape counted {counters.get('retries', 0)} retries and "
+                        f"{counters.get('fetch_errors', 0)} errors for {injected} injected 503s")
+    if full['timers'].get('fetch_page', {}).get('count') != -(-args.rows // args.page_size):
+        failures.append(f"full scrape timed {full['timers'].get('fetch_page', {}).get('count')} page fetches")
+    
+    for stage in ('run', 'fetch_page', 'append_new_data'):
+        if stage not in update['timers']:
+            failures.append(f"incremental run has no {stage!r} timer")
+    if update['counters'].get('rows_added') != args.new_days:
+        failures.append(f"incremental run counted {update['counters'].get('rows_added')} added rows, "
+                        f"expected {args.new_days}")
+    
+    with open(os.path.join(metrics_dir, METRICS_REPORT_FILENAME), encoding='utf-8') as f:
+        if json.load(f) != report or not report['success']:
+            failures.append("the saved run report differs from the returned one or records a failure")
+    with open(os.path.join(metrics_dir, METRICS_TEXTFILE_FILENAME), encoding='utf-8') as f:
+        text = f.read()
+    bad_lines = invalid_textfile_lines(text)
+    if bad_lines or 'stage="append_new_data"' not in text or '_last_run_success 1' not in text:
+        failures.append(f"the Prometheus textfile is malformed or incomplete: {bad_lines[:3]}")
+    
+    kinds = {event['type'] for event in events}
+    timed = sum(1 for event in events if event['type'] == 'timer' and event['name'] == 'fetch_page')
+    if kinds != {'timer', 'counter', 'run'} or timed != full['timers']['fetch_page']['count'] + \
+            update['timers']['fetch_page']['count']:
+        failures.append(f"the hook saw {sorted(kinds)} events and {timed} page fetches")
+    
+    if failures:
+        print("❌ The recorded metrics are wrong:")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    
+    unsubscribe(events.append)
+    print(f"{args.rows} rows, {injected} injected 503s: counters, timers, run report, textfile and hook events "
+          f"match what happened")
+    for name, stats in update['timers'].items():
+        print(f"   update {name:<16}{stats['count']:>4} calls {stats['total_seconds'] * 1000:9.2f} ms")
+    for name, cost in overhead().items():
+        print(f"{name + ':':<20}{cost:6.2f} µs per call")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Page Extraction Benchmark
+Compares per-cell WebDriver extraction with the single round-trip bulk path
+against a saved TGJU history page.
+
+Usage:
+    python benchmarks/bench_page_extraction.py [--iterations 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.scraper import DollarScraper
+from src.utils import parse_table_html
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'history_page.html')
+
+
+def time_call(func, iterations: int) -> float:
+    """Return the mean wall-clock time of func in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', '-n', type=int, default=20, help='Repetitions per extraction path')
+    args = parser.parse_args()
+    
+    with open(FIXTURE_PATH, encoding='utf-8') as f:
+        page_html = f.read()
+    
+    print(f"lxml parse of fixture:  {time_call(lambda: parse_table_html(page_html), args.iterations):8.2f} ms")
+    
+    scraper = DollarScraper()
+    scraper.driver = scraper._setup_driver()
+    try:
+        scraper.driver.get(f"file://{os.path.abspath(FIXTURE_PATH)}")
+        
+        per_cell = scraper._scrape_current_page(bulk=False)
+        bulk = scraper._scrape_current_page(bulk=True)
+        if per_cell != bulk:
+            print("❌ Bulk and per-cell extraction produced different rows")
+            return 1
+        
+        per_cell_ms = time_call(lambda: scraper._scrape_current_page(bulk=False), args.iterations)
+        bulk_ms = time_call(lambda: scraper._scrape_current_page(bulk=True), args.iterations)
+        
+        print(f"Per-cell WebDriver:     {per_cell_ms:8.2f} ms/page")
+        print(f"Bulk execute_script:    {bulk_ms:8.2f} ms/page")
+        print(f"Speedup:                {per_cell_ms / bulk_ms:8.1f}x ({len(bulk)} rows)")
+    finally:
+        scraper.driver.quit()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Streaming Pipeline Benchmark
+Runs a full scrape of a synthetic dataset served by the local fake TGJU
+server, holding every row in memory and again through the streaming
+pipeline, each in a fresh process so peak RSS can be compared. Then it
+breaks a streamed scrape part way through and checks that the rerun only
+fetches the remaining pages. Every run must reproduce the served dataset.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--rows 200000] [--page-size 1000] [--workers 4]
+"""
+
+import argparse
+import filecmp
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fake_tgju import FakeTGJUServer, load_recorded_rows
+from synthetic import write_csv, workspace
+from src.config import CSV_FILENAME, DATA_DIR
+from src.http_scraper import HttpScraper
+
+
+def peak_rss_mib() -> float:
+    """
+    Peak resident memory of this process in MiB (Linux).
+    
+    VmHWM is reset by exec, unlike ru_maxrss, which would report the larger
+    parent process that spawned this one.
+    """
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def scrape(api_url: str, page_size: int, workers: int, stream: bool) -> dict:
+    """Run one full scrape in the current directory and report time and peak memory."""
+    scraper = HttpScraper(api_url=api_url, page_size=page_size, workers=workers,
+                          rate_limit=0, fallback=False, stream=stream)
+    start = time.perf_counter()
+    success = scraper.scrape_all_data(incremental=False)
+    return {
+        'success': success,
+        'seconds': time.perf_counter() - start,
+        'peak_rss_mib': peak_rss_mib()
+    }
+
+
+def run_child(api_url: str, args, stream: bool) -> dict:
+    """Run scrape() in a fresh interpreter inside a new temporary directory."""
+    command = [sys.executable, os.path.abspath(__file__), '--child', api_url,
+               '--page-size', str(args.page_size), '--workers', str(args.workers)]
+    if stream:
+        command.append('--stream')
+    workdir = tempfile.mkdtemp(prefix='pipeline-bench-')
+    result = subprocess.run(command, cwd=workdir, capture_output=True, text=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['csv_path'] = os.path.join(workdir, DATA_DIR, CSV_FILENAME)
+    return report
+
+
+def interrupted_resume(server: FakeTGJUServer, args) -> tuple:
+    """Fail a streamed scrape at 80% of its pages, rerun it, and return (pages fetched on rerun, total pages, csv)."""
+    workspace('pipeline-resume-')
+    total_pages = -(-len(server.rows) // args.page_size)
+    fail_at = int(total_pages * 0.8) * args.page_size
+    
+    scraper = server.scraper(page_size=args.page_size, workers=args.workers, stream=True)
+    fetch_page = scraper._fetch_page
+    
+    def failing_fetch(start, length):
+        if start == fail_at:
+            raise ConnectionError(f"Simulated failure at row {start}")
+        return fetch_page(start, length)
+    
+    scraper._fetch_page = failing_fetch
+    try:
+        scraper.scrape_all_data(incremental=False)
+    except ConnectionError:
+        pass
+    
+    before = server.request_count
+    scraper = server.scraper(page_size=args.page_size, workers=args.workers, stream=True)
+    if not scraper.scrape_all_data(incremental=False):
+        return None, total_pages, None
+    return server.request_count - before, total_pages, os.path.abspath(os.path.join(DATA_DIR, CSV_FILENAME))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000, help='Rows in the served dataset')
+    parser.add_argument('--page-size', type=int, default=1000, help='Rows requested per page')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent page requests')
+    parser.add_argument('--child', metavar='API_URL', help=argparse.SUPPRESS)
+    parser.add_argument('--stream', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(scrape(args.child, args.page_size, args.workers, args.stream)))
+        return 0
+    
+    source_csv = os.path.join(tempfile.mkdtemp(prefix='pipeline-source-'), 'source.csv')
+    write_csv(source_csv, args.rows)
+    
+    with FakeTGJUServer(load_recorded_rows(source_csv)) as server:
+        results = {
+            'in memory': run_child(server.api_url(), args, stream=False),
+            'streamed': run_child(server.api_url(), args, stream=True),
+        }
+        for name, report in results.items():
+            if not report['success'] or not filecmp.cmp(report['csv_path'], source_csv, shallow=False):
+                print(f"❌ The {name} scrape did not reproduce the served dataset")
+                return 1
+        
+        refetched, total_pages, resumed_csv = interrupted_resume(server, args)
+        if resumed_csv is None or not filecmp.cmp(resumed_csv, source_csv, shallow=False):
+            print("❌ The resumed scrape did not reproduce the served dataset")
+            return 1
+    
+    print(f"{args.rows} rows, {args.page_size} per page, {args.workers} workers")
+    for name, report in results.items():
+        print(f"{name + ':':<12}{report['seconds']:8.2f}s  peak RSS {report['peak_rss_mib']:7.1f} MiB")
+    print(f"Resume after a failure at 80%: fetched {refetched} of {total_pages} pages again")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
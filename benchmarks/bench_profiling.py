@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Profiling Mode Benchmark
+Runs an incremental update of a synthetic dataset from the local fake
+TGJU server without profiling, under each profiling mode and with memory
+tracing, the way main.py --profile / --trace-memory wraps a run. Checks
+that every mode writes readable output (pstats that load, collapsed stacks
+that name the scraper, a memory report with a section per scrape and
+append), that the traced methods are restored afterwards, and that a run
+without profiling never imports src.profiling. Prints what each mode
+costs over a plain run.
+
+Usage:
+    python benchmarks/bench_profiling.py [--rows 100000] [--new-days 30]
+"""
+
+import argparse
+import logging
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from fake_tgju import FakeTGJUServer
+from synthetic import make_frame, workspace
+from src.config import (
+    PROFILE_STATS_FILENAME, PROFILE_REPORT_FILENAME, PROFILE_STACKS_FILENAME, PROFILE_MEMORY_FILENAME
+)
+from src.data_manager import DataManager
+from src.http_scraper import HttpScraper
+
+MODES = {
+    'off': {},
+    'cprofile': {'mode': 'cprofile'},
+    'sample': {'mode': 'sample'},
+    'trace-memory': {'trace_memory': True},
+}
+
+
+def update(server: FakeTGJUServer, df, new_days: int, page_size: int) -> float:
+    """Seconds for an incremental run that finds the newest days missing, in a fresh directory."""
+    workspace('profiling-bench-', df.iloc[new_days:])
+    start = time.perf_counter()
+    if not server.scraper(page_size=page_size).run():
+        raise RuntimeError("the update failed")
+    return time.perf_counter() - start
+
+
+def check_output(name: str, directory: str) -> list:
+    """Problems with what a mode wrote."""
+    problems = []
+    if name == 'cprofile':
+        stats = pstats.Stats(os.path.join(directory, PROFILE_STATS_FILENAME))
+        if not any(function == 'append_new_data' for _, _, function in stats.stats):
+            problems.append("the pstats have no append_new_data")
+        if not os.path.getsize(os.path.join(directory, PROFILE_REPORT_FILENAME)):
+            problems.append("the text summary is empty")
+    elif name == 'sample':
+        with open(os.path.join(directory, PROFILE_STACKS_FILENAME), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        if not lines or not all(line.rsplit(' ', 1)[1].isdigit() for line in lines):
+            problems.append("the collapsed stacks are empty or malformed")
+        elif not any('run (scraper.py' in line or 'run (http_scraper.py' in line for line in lines):
+            problems.append("no sampled stack passes through the scraper's run()")
+    elif name == 'trace-memory':
+        with open(os.path.join(directory, PROFILE_MEMORY_FILENAME), encoding='utf-8') as f:
+            report = f.read()
+        for label in ('HttpScraper.scrape_all_data', 'DataManager.append_new_data'):
+            if label not in report:
+                problems.append(f"the memory report has no {label} section")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='Rows of the served dataset')
+    parser.add_argument('--new-days', type=int, default=30, help='Days missing locally before each update')
+    parser.add_argument('--page-size', type=int, default=10, help='Rows per API page')
+    args = parser.parse_args()
+    
+    # main.py imports src.profiling only when a profiling option is given
+    command = [sys.executable, '-c', "import sys, main; sys.exit('src.profiling' in sys.modules)"]
+    if subprocess.run(command, cwd=ROOT_DIR).returncode:
+        print("❌ Importing main.py imports src.profiling without a profiling option")
+        return 1
+    
+    from src.profiling import profile_run
+    
+    logging.disable(logging.WARNING)
+    df = make_frame(args.rows)
+    originals = {name: getattr(cls, name) for cls, name in ((DataManager, 'append_new_data'),
+                                                           (HttpScraper, 'scrape_all_data'))}
+    
+    timings = {}
+    with FakeTGJUServer.from_frame(df) as server:
+        update(server, df, args.new_days, args.page_size)  # Warm imports and caches
+        for name, options in MODES.items():
+            directory = tempfile.mkdtemp(prefix=f'profiling-{name}-')
+            if options:
+                with profile_run(directory, **options):
+                    timings[name] = update(server, df, args.new_days, args.page_size)
+            else:
+                timings[name] = update(server, df, args.new_days, args.page_size)
+            problems = check_output(name, directory)
+            if problems:
+                print(f"❌ {name}: {'; '.join(problems)}")
+                return 1
+    
+    for cls, name in ((DataManager, 'append_new_data'), (HttpScraper, 'scrape_all_data')):
+        if getattr(cls, name) is not originals[name]:
+            print(f"❌ {cls.__name__}.{name} is still wrapped after memory tracing")
+            return 1
+    
+    print(f"Update of {args.new_days} days on {args.rows} rows; every mode wrote readable output")
+    for name, seconds in timings.items():
+        print(f"{name + ':':<15}{seconds:8.3f}s  {seconds / timings['off']:5.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
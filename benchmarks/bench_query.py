@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Date Query Benchmark
+Times DataManager.get_range(), get_on() and latest() against loading and
+filtering the whole CSV, on synthetic datasets of growing size. The queries
+binary-search the row index and seek to the rows they return, so their
+latency should stay flat while the full load grows with the file. Every
+answer is checked against filtering the whole frame with pandas, for
+Gregorian and Persian bounds, and an index extended by appends must equal
+one rebuilt from scratch.
+
+Usage:
+    python benchmarks/bench_query.py [--sizes 4000 100000 1000000] [--runs 200]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from synthetic import write_csv, workspace
+from src.config import COLUMN_MAPPING, CSV_FILENAME, DATA_DIR
+from src.data_manager import DataManager
+from src.row_index import RowIndex
+
+DATE = COLUMN_MAPPING["gregorian_date"]
+PERSIAN_DATE = COLUMN_MAPPING["persian_date"]
+
+
+def expected_range(df: pd.DataFrame, start: str, end: str, column: str = DATE) -> pd.DataFrame:
+    """Rows within start..end, filtered from the whole frame."""
+    dates = df[column]
+    rows = df[dates.str.fullmatch(r'\d{4}/\d{2}/\d{2}') & (dates >= start) & (dates <= end)]
+    return rows.sort_values(DATE, ascending=False).reset_index(drop=True)
+
+
+def check_answers(manager: DataManager, df: pd.DataFrame, rng: np.random.Generator) -> list:
+    """Queries whose answer differs from filtering the whole frame."""
+    failures = []
+    cases = []
+    for column, calendar in ((DATE, 'gregorian'), (PERSIAN_DATE, 'persian')):
+        for _ in range(20):
+            start, end = sorted(rng.choice(df[column].to_numpy(), 2))
+            cases.append((calendar, column, start, end))
+        cases.append((calendar, column, '0001/01/01', '9999/12/31'))
+    for calendar, column, start, end in cases:
+        try:
+            pd.testing.assert_frame_equal(manager.get_range(start, end, calendar),
+                                          expected_range(df, start, end, column))
+        except AssertionError:
+            failures.append(f"get_range({start!r}, {end!r}, {calendar!r})")
+    
+    for date in rng.choice(df[DATE].to_numpy(), 20):
+        if manager.get_on(date) != df[df[DATE] == date].to_dict('records')[0]:
+            failures.append(f"get_on({date!r})")
+    if manager.get_on('1900/01/01' if df[DATE].min() > '1900/01/01' else '9999/01/01') is not None:
+        failures.append("get_on() of a missing date")
+    for n in (1, 30, len(df) + 1):
+        want = df.sort_values(DATE, ascending=False).head(n).reset_index(drop=True)
+        if not manager.latest(n).equals(want):
+            failures.append(f"latest({n})")
+    return failures
+
+
+def check_extend(df: pd.DataFrame, new_days: int = 3) -> bool:
+    """Append the newest days one at a time; the extended index must equal a rebuilt one."""
+    df.iloc[new_days:].to_csv(os.path.join(DATA_DIR, CSV_FILENAME), index=False)
+    manager = DataManager()
+    manager.get_row_index()
+    rebuild = manager._rebuild_row_index
+    manager._rebuild_row_index = lambda: None
+    for day in reversed(range(new_days)):
+        manager.append_new_data(df.iloc[day:day + 1].to_dict('records'))
+    manager._rebuild_row_index = rebuild
+    
+    extended = RowIndex.load(manager.row_index_path)
+    rebuilt = RowIndex.from_csv(manager.csv_path, pd.read_csv(manager.csv_path), manager._content_signature())
+    return extended is not None and extended.csv_signature == rebuilt.csv_signature and \
+        np.array_equal(extended.table, rebuilt.table)
+
+
+def timed(function, runs: int) -> float:
+    """Mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4000, 100000, 1000000], help='Dataset sizes in rows')
+    parser.add_argument('--runs', type=int, default=200, help='Repetitions of each query')
+    args = parser.parse_args()
+    
+    workspace('query-bench-')
+    logging.disable(logging.INFO)
+    csv_path = os.path.join(DATA_DIR, CSV_FILENAME)
+    rng = np.random.default_rng(7)
+    
+    print(f"{'rows':>9}  {'load+filter':>11}  {'index build':>11}  {'range 30d':>9}  {'get_on':>9}  "
+          f"{'latest(30)':>10}  {'cold open':>9}")
+    for rows in args.sizes:
+        df = write_csv(csv_path, rows)
+        if not check_extend(df):
+            print(f"❌ {rows} rows: the index extended by appends differs from a rebuilt one")
+            return 1
+        
+        df = pd.read_csv(csv_path)
+        start = time.perf_counter()
+        RowIndex.from_csv(csv_path, df)
+        build_ms = (time.perf_counter() - start) * 1000
+        manager = DataManager()
+        
+        failures = check_answers(manager, df, rng)
+        if failures:
+            print(f"❌ {rows} rows: answers differ from filtering the whole frame:")
+            for failure in failures:
+                print(f"   {failure}")
+            return 1
+        
+        newest = df[DATE].iloc[0]
+        month_ago = df[DATE].iloc[min(29, rows - 1)]
+        middle = df[DATE].iloc[rows // 2]
+        full_ms = timed(lambda: expected_range(pd.read_csv(csv_path), month_ago, newest), 1)
+        range_ms = timed(lambda: manager.get_range(month_ago, newest), args.runs)
+        on_ms = timed(lambda: manager.get_on(middle), args.runs)
+        latest_ms = timed(lambda: manager.latest(30), args.runs)
+        # A new process: load the saved index (memory-mapped) and answer one query
+        cold_ms = timed(lambda: DataManager().get_on(middle), 20)
+        print(f"{rows:>9}  {full_ms:>9.2f}ms  {build_ms:>9.2f}ms  {range_ms:>7.3f}ms  {on_ms:>7.3f}ms  "
+              f"{latest_ms:>8.3f}ms  {cold_ms:>7.3f}ms")
+    
+    print("All answers match filtering the whole frame; indexes extended by appends match rebuilt ones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
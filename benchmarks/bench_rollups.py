@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+OHLC Rollup Benchmark
+Checks the materialized rollups (src/rollups.py) against a full pandas
+resample of the dataset for every period: weekly and monthly bars against
+DataFrame.resample, Persian months and years against a groupby of the
+Persian dates. Then appends the newest days one at a time through
+DataManager, which must fold each into the trailing bars without a rebuild
+and end with the bars a full resample gives. Times range queries against
+resampling the whole dataset, and an incremental update against a rebuild.
+
+Usage:
+    python benchmarks/bench_rollups.py [--csv data/Dollar_Rial_Price_Dataset.csv] [--rows N] [--new-days 10]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from synthetic import write_csv, workspace
+from src.config import COLUMN_MAPPING, CSV_FILENAME, DATA_DIR, ROLLUP_PERIODS, WEEK_END
+from src.data_manager import DataManager
+from src.rollups import Rollups, PERIOD
+
+DATE = COLUMN_MAPPING["gregorian_date"]
+PERSIAN_DATE = COLUMN_MAPPING["persian_date"]
+PRICES = [COLUMN_MAPPING[f"{name}_price"] for name in ('open', 'high', 'low', 'close')]
+AGGREGATIONS = dict(zip(PRICES, ('first', 'max', 'min', 'last')))
+
+
+def resampled(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Bars of a whole dataset the way pandas groups them, without the period labels."""
+    daily = df.assign(time=pd.to_datetime(df[DATE], format='%Y/%m/%d')).sort_values('time')
+    daily['first'] = daily['last'] = daily['time']
+    aggregations = {'first': 'first', 'last': 'last', **AGGREGATIONS, DATE: 'size'}
+    if period in ('weekly', 'monthly'):
+        rule = {'weekly': f'W-{WEEK_END}', 'monthly': 'MS'}[period]
+        bars = daily.set_index('time').resample(rule).agg(aggregations)
+        bars = bars[bars[DATE] > 0]
+    else:
+        persian = daily[PERSIAN_DATE].where(daily[PERSIAN_DATE].str.match(r'^\d{4}/\d{2}/\d{2}$'))
+        keys = persian.str[:7 if period == 'persian_month' else 4].ffill()
+        bars = daily.groupby(keys.to_numpy(), sort=False).agg(aggregations)
+    bars = bars.reset_index(drop=True)
+    bars['first'] = bars['first'].dt.strftime('%Y/%m/%d')
+    bars['last'] = bars['last'].dt.strftime('%Y/%m/%d')
+    return bars.astype({column: 'int64' for column in [*PRICES, DATE]})
+
+
+def mismatches(rollups: Rollups, df: pd.DataFrame) -> list:
+    """Periods whose rollup bars differ from a full pandas resample."""
+    failures = []
+    for period in ROLLUP_PERIODS:
+        got = rollups.query(period).drop(columns=PERIOD)
+        got.columns = range(len(got.columns))
+        want = resampled(df, period)
+        want.columns = range(len(want.columns))
+        if not got.equals(want):
+            failures.append(f"{period}: {len(got)} bars, resample gives {len(want)}")
+    return failures
+
+
+def check_append(df: pd.DataFrame, new_days: int) -> tuple:
+    """
+    Append the newest days one at a time through DataManager.
+    
+    Returns (mismatching periods, rebuilds, mean seconds per incremental update).
+    """
+    workspace('rollup-append-', df.iloc[new_days:])
+    manager = DataManager()
+    manager.get_rollups()
+    
+    rebuilds = []
+    rebuild = manager._rebuild_rollups
+    manager._rebuild_rollups = lambda: rebuilds.append(1) or rebuild()
+    update_times = []
+    extend = manager._extend_rollups
+    
+    def timed_extend(*args):
+        started = time.perf_counter()
+        try:
+            return extend(*args)
+        finally:
+            update_times.append(time.perf_counter() - started)
+    
+    manager._extend_rollups = timed_extend
+    for day in reversed(range(new_days)):
+        manager.append_new_data(df.iloc[day:day + 1].to_dict('records'))
+    
+    # A fresh manager reads the saved rollups, so this also checks what was written
+    saved = DataManager().get_rollups()
+    return mismatches(saved, df), len(rebuilds), sum(update_times) / max(len(update_times), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=os.path.join(ROOT_DIR, DATA_DIR, CSV_FILENAME), help='Dataset to check')
+    parser.add_argument('--rows', type=int, help='Use a synthetic dataset of this many rows instead')
+    parser.add_argument('--new-days', type=int, default=10, help='Days appended one at a time')
+    args = parser.parse_args()
+    
+    csv_path = os.path.abspath(args.csv)
+    if args.rows:
+        csv_path = os.path.join(tempfile.mkdtemp(prefix='rollup-bench-'), 'synthetic.csv')
+        write_csv(csv_path, args.rows)
+    df = pd.read_csv(csv_path)
+    
+    start = time.perf_counter()
+    rollups = Rollups.from_frame(df)
+    build_time = time.perf_counter() - start
+    
+    failures = mismatches(rollups, df)
+    if failures:
+        print("❌ Rollups differ from a full pandas resample:")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    
+    failures, rebuilds, update_time = check_append(df, args.new_days)
+    if rebuilds or failures:
+        print(f"❌ Appending {args.new_days} days one at a time did not extend the rollups to what a resample gives "
+              f"({rebuilds} rebuilds{': ' + '; '.join(failures) if failures else ''})")
+        return 1
+    
+    # A year of bars ending at the newest day, from the rollups and by resampling everything
+    latest = pd.to_datetime(df[DATE], format='%Y/%m/%d').max()
+    start_date = (latest - pd.DateOffset(years=1)).strftime('%Y/%m/%d')
+    runs = 200
+    print(f"{len(df)} rows: {', '.join(ROLLUP_PERIODS)} bars match a full pandas resample, "
+          f"also after appending {args.new_days} days one at a time")
+    print(f"{'period':<16}{'bars':>8}{'resample (ms)':>16}{'query (ms)':>14}")
+    for period in ROLLUP_PERIODS:
+        started = time.perf_counter()
+        resampled(df, period)
+        resample_time = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(runs):
+            rollups.query(period, start_date)
+        query_time = (time.perf_counter() - started) / runs
+        bars = len(rollups.bars[period][PERIOD])
+        print(f"{period:<16}{bars:>8}{resample_time * 1000:>16.2f}{query_time * 1000:>14.3f}")
+    print(f"Full rollup build:                  {build_time * 1000:9.2f} ms")
+    print(f"Incremental update, one day:        {update_time * 1000:9.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
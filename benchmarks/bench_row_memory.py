@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Scraped Row Memory Benchmark
+Measures the memory held by scraped rows stored as per-row dictionaries
+versus compact PriceRow objects, and the time to turn each into a DataFrame.
+
+Usage:
+    python benchmarks/bench_row_memory.py [--rows 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from synthetic import make_frame
+from src.models import PriceRow, rows_to_frame
+
+
+def measure(build):
+    """Return (rows, MiB retained) for the rows produced by build()."""
+    tracemalloc.start()
+    rows = build()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, current / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='Number of scraped rows to hold in memory')
+    args = parser.parse_args()
+    
+    # Plain Python ints and short strings, as the scraper produces them
+    records = make_frame(args.rows).to_dict('records')
+    
+    dict_rows, dict_mib = measure(lambda: [dict(record) for record in records])
+    slot_rows, slot_mib = measure(lambda: [PriceRow.from_dict(record) for record in records])
+    
+    start = time.perf_counter()
+    rows_to_frame(dict_rows)
+    dict_frame_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    rows_to_frame(slot_rows)
+    slot_frame_time = time.perf_counter() - start
+    
+    print(f"{args.rows} rows")
+    print(f"  dict rows:     {dict_mib:8.1f} MiB   to DataFrame {dict_frame_time:6.3f}s")
+    print(f"  PriceRow rows: {slot_mib:8.1f} MiB   to DataFrame {slot_frame_time:6.3f}s")
+    print(f"  memory saved:  {(1 - slot_mib / dict_mib) * 100:8.1f}%")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Fake TGJU Server
+Serves recorded TGJU responses on localhost so scrapers can run offline.
+
+Routes:
+    /v1/market/indicator/summary-table-data/<slug>   DataTables JSON pages built from a CSV
+    /profile/<slug>/history                          Saved history page fixture
+
+Usage:
+    python benchmarks/fake_tgju.py [--port 8765] [--latency 0.05] [--error-rate 0.1]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Iterable, List, Sequence
+from urllib.parse import urlparse, parse_qs
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+DEFAULT_CSV = os.path.join(ROOT_DIR, 'data', 'Dollar_Rial_Price_Dataset.csv')
+HISTORY_FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'history_page.html')
+
+
+def render_rows(records: Iterable[Sequence]) -> List[List[str]]:
+    """Render dataset rows the way the TGJU API returns them (newest first)."""
+    rows = []
+    for open_p, low, high, close, change, percent, gdate, pdate in records:
+        rows.append([
+            f"{int(open_p):,}", f"{int(low):,}", f"{int(high):,}", f"{int(close):,}",
+            f"<span class='high' dir='ltr'>{change}</span>",
+            f"<span class='high' dir='ltr'>{percent}</span>",
+            gdate, pdate
+        ])
+    return rows
+
+
+def load_recorded_rows(csv_path: str = DEFAULT_CSV) -> List[List[str]]:
+    """Load dataset rows from a CSV and render them as the API would."""
+    with open(csv_path, encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader)
+        return render_rows(reader)
+
+
+class FakeTGJUServer:
+    """Threaded local HTTP server replaying recorded TGJU responses."""
+    
+    def __init__(self, rows: List[List[str]] = None, port: int = 0, latency: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0):
+        self.rows = rows if rows is not None else load_recorded_rows()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.error_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+    
+    @classmethod
+    def from_frame(cls, df, **kwargs) -> 'FakeTGJUServer':
+        """Serve a dataset frame (e.g. from synthetic.make_frame) instead of a CSV."""
+        return cls(render_rows(df.itertuples(index=False)), **kwargs)
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def api_url(self, slug: str = 'price_dollar_rl') -> str:
+        return f"{self.base_url}/v1/market/indicator/summary-table-data/{slug}"
+    
+    def api_url_template(self) -> str:
+        """The API URL with a {slug} placeholder, as src.config.API_URL_TEMPLATE."""
+        return self.api_url('{slug}')
+    
+    def scraper(self, slug: str = 'price_dollar_rl', **kwargs):
+        """An HttpScraper pointed at this server, unthrottled and without the Selenium fallback."""
+        from src.http_scraper import HttpScraper
+        kwargs.setdefault('rate_limit', 0)
+        kwargs.setdefault('fallback', False)
+        return HttpScraper(slug, api_url=self.api_url(slug), **kwargs)
+    
+    def _make_handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+            
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                    fail = server.error_rate and server._random.random() < server.error_rate
+                    if fail:
+                        server.error_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                
+                url = urlparse(self.path)
+                if fail and url.path.startswith('/v1/'):
+                    self._send(503, b'Service Unavailable', 'text/plain')
+                elif url.path.startswith('/v1/market/indicator/summary-table-data/'):
+                    query = parse_qs(url.query)
+                    start = int(query.get('start', ['0'])[0])
+                    length = int(query.get('length', ['30'])[0])
+                    payload = {
+                        'draw': int(query.get('draw', ['1'])[0]),
+                        'recordsTotal': len(server.rows),
+                        'recordsFiltered': len(server.rows),
+                        'data': server.rows[start:start + length]
+                    }
+                    self._send(200, json.dumps(payload).encode('utf-8'), 'application/json')
+                elif url.path.endswith('/history'):
+                    with open(HISTORY_FIXTURE, 'rb') as f:
+                        self._send(200, f.read(), 'text/html; charset=utf-8')
+                else:
+                    self._send(404, b'Not found', 'text/plain')
+        
+        return Handler
+    
+    def start(self) -> 'FakeTGJUServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def __enter__(self) -> 'FakeTGJUServer':
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def time_full_then_update(server: FakeTGJUServer, all_rows: List[List[str]], run, new_rows: int = 5) -> tuple:
+    """
+    Time a full scrape while the server lacks the newest `new_rows` rows, then an update that finds them.
+    
+    `run` performs one scrape and returns whether it succeeded. Returns (ok, full seconds, update seconds).
+    """
+    server.rows = all_rows[new_rows:]
+    start = time.perf_counter()
+    ok = run()
+    full_time = time.perf_counter() - start
+    
+    server.rows = all_rows
+    start = time.perf_counter()
+    ok = run() and ok
+    return ok, full_time, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.0, help='Artificial delay per request in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of API requests answered with 503')
+    parser.add_argument('--csv', default=DEFAULT_CSV, help='Dataset used to build the recorded responses')
+    args = parser.parse_args()
+    
+    server = FakeTGJUServer(load_recorded_rows(args.csv), port=args.port, latency=args.latency,
+                            error_rate=args.error_rate)
+    print(f"Serving {len(server.rows)} recorded rows at {server.api_url()}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark Suite
+Times the operations a daily update depends on without touching the
+network. It uses synthetic datasets of each size (4k rows is about the
+real dataset today) and a local fake TGJU server that replays the
+recorded history page and serves the synthetic rows as API pages:
+
+    load_existing_data   a new DataManager reading the CSV
+    get_data_summary     a new DataManager summarizing the CSV
+    append_new_data      adding the next day, with the derived files warm
+    clean_prices         utils batch cleaners over one column of raw cells
+    clean_changes          (every tenth cell in Persian digits)
+    parse_dates
+    history_page         fetching the recorded history page and parsing its table
+    scrape_full          a full HttpScraper scrape from the fake server
+    scrape_update        an incremental run that finds the newest days missing
+
+Every case is repeated and the median is kept. The results are written
+as JSON. Pass --baseline to compare them with an earlier run: the
+suite then fails when a case's median is more than --tolerance slower
+(and by more than a millisecond, to ignore timer noise). --compare
+compares two saved runs without running anything.
+
+Usage:
+    python benchmarks/run_suite.py [--sizes 4000 100000 1000000] [--repeat 5] [--only append_new_data ...]
+                                   [--output results.json] [--baseline previous.json] [--tolerance 0.25]
+    python benchmarks/run_suite.py --compare previous.json results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+sys.path.insert(0, ROOT_DIR)
+
+from bench_cleaning import raw_cells
+from fake_tgju import FakeTGJUServer, render_rows
+from synthetic import make_frame, warm_derived_files, workspace
+from src import utils
+from src.config import COLUMN_MAPPING, CSV_FILENAME, DATA_DIR
+from src.data_manager import DataManager
+
+DATE = COLUMN_MAPPING["gregorian_date"]
+
+# Scraping a million rows from the fake server mostly times the server, so scrapes stop at this size
+SCRAPE_MAX_ROWS = 100000
+
+# Changes smaller than this are timer noise, whatever the ratio
+NOISE_SECONDS = 0.001
+
+
+class Dataset:
+    """A synthetic dataset of one size, with its CSV and warm derived files kept in a template directory."""
+    
+    def __init__(self, rows: int, new_days: int = 5):
+        self.rows = rows
+        self.new_days = new_days
+        self.df = make_frame(rows)
+        latest = datetime.strptime(self.df[DATE].iloc[0], '%Y/%m/%d').date()
+        self.next_day = make_frame(1, end=latest + timedelta(days=1)).to_dict('records')
+        
+        self.scratch_dirs = []
+        self.template = workspace(f'suite-{rows}-', self.df)
+        # Steady state: the derived files were written by the previous update
+        warm_derived_files()
+    
+    def scratch(self) -> str:
+        """A new empty directory, made the current directory and removed by cleanup()."""
+        path = tempfile.mkdtemp(prefix=f'suite-{self.rows}-run-')
+        self.scratch_dirs.append(path)
+        os.chdir(path)
+        return path
+    
+    def workdir(self) -> str:
+        """A fresh copy of the template directory, made the current directory."""
+        path = self.scratch()
+        shutil.copytree(os.path.join(self.template, DATA_DIR), os.path.join(path, DATA_DIR))
+        return path
+    
+    def cleanup(self):
+        os.chdir(ROOT_DIR)
+        for path in [self.template, *self.scratch_dirs]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def measure(setup, run, repeat: int) -> list:
+    """Seconds of `run(setup())` for each repetition; setup is not timed."""
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def dataset_cases(dataset: Dataset) -> dict:
+    """Cases that need a dataset on disk: name -> (setup, run)."""
+    def read_only():
+        os.chdir(dataset.template)
+    
+    def append(_):
+        if not DataManager().append_new_data(dataset.next_day):
+            raise RuntimeError("append_new_data failed")
+    
+    cases = {
+        'load_existing_data': (read_only, lambda _: DataManager().load_existing_data()),
+        'get_data_summary': (read_only, lambda _: DataManager().get_data_summary()),
+        'append_new_data': (dataset.workdir, append),
+    }
+    cleaners = {'clean_prices': (COLUMN_MAPPING["close_price"], utils.clean_prices),
+                'clean_changes': (COLUMN_MAPPING["change_percent"], utils.clean_changes),
+                'parse_dates': (DATE, utils.parse_dates)}
+    for name, (column, clean) in cleaners.items():
+        cells = raw_cells(dataset.df, column)
+        cases[name] = (lambda: None, lambda _, clean=clean, cells=cells: clean(cells))
+    return cases
+
+
+def scrape_cases(dataset: Dataset, server: FakeTGJUServer) -> dict:
+    """Cases that scrape the dataset from the fake server: name -> (setup, run)."""
+    def missing_newest():
+        dataset.workdir()
+        dataset.df.iloc[dataset.new_days:].to_csv(os.path.join(DATA_DIR, CSV_FILENAME), index=False)
+    
+    def check(success: bool):
+        if not success:
+            raise RuntimeError("the scrape failed")
+    
+    return {
+        'scrape_full': (dataset.scratch, lambda _: check(server.scraper().scrape_all_data(incremental=False))),
+        'scrape_update': (missing_newest, lambda _: check(server.scraper().run())),
+    }
+
+
+def history_page(server: FakeTGJUServer):
+    response = requests.get(f"{server.base_url}/profile/price_dollar_rl/history", timeout=10)
+    response.raise_for_status()
+    if not utils.parse_table_html(response.text):
+        raise RuntimeError("no rows in the recorded history page")
+
+
+def summarize(times: list) -> dict:
+    return {
+        'median_seconds': round(statistics.median(times), 6),
+        'min_seconds': round(min(times), 6),
+        'runs': [round(seconds, 6) for seconds in times]
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args) -> dict:
+    """Run every selected case at every size; returns the results document."""
+    wanted = set(args.only) if args.only else None
+    results = {}
+    
+    def record(name: str, rows, setup, run):
+        if wanted and name not in wanted:
+            return
+        key = f"{name}/{rows}" if rows else name
+        results[key] = summarize(measure(setup, run, args.repeat))
+        print(f"{key:<32}{results[key]['median_seconds'] * 1000:12.2f} ms", flush=True)
+    
+    with FakeTGJUServer(rows=[]) as server:
+        record('history_page', None, lambda: None, lambda _: history_page(server))
+        for rows in args.sizes:
+            dataset = Dataset(rows)
+            try:
+                for name, (setup, run) in dataset_cases(dataset).items():
+                    record(name, rows, setup, run)
+                if rows <= args.scrape_max_rows:
+                    server.rows = render_rows(dataset.df.itertuples(index=False))
+                    for name, (setup, run) in scrape_cases(dataset, server).items():
+                        record(name, rows, setup, run)
+            finally:
+                dataset.cleanup()
+    
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list:
+    """Cases whose median got slower than the baseline allows, printing a table of every shared case."""
+    regressions = []
+    print(f"\nAgainst {baseline.get('commit') or 'baseline'} ({baseline.get('created')}):")
+    print(f"{'case':<32}{'baseline':>12}{'current':>12}{'change':>9}")
+    for key, result in current['results'].items():
+        before = baseline['results'].get(key)
+        if before is None:
+            continue
+        old, new = before['median_seconds'], result['median_seconds']
+        ratio = new / old if old else float('inf')
+        regressed = ratio > 1 + tolerance and new - old > NOISE_SECONDS
+        marker = '  ❌' if regressed else ''
+        print(f"{key:<32}{old * 1000:10.2f}ms{new * 1000:10.2f}ms{(ratio - 1) * 100:+8.0f}%{marker}")
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4000, 100000, 1000000], help='Dataset sizes in rows')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions of each case; the median is kept')
+    parser.add_argument('--only', nargs='+', metavar='CASE', help='Run only these cases')
+    parser.add_argument('--scrape-max-rows', type=int, default=SCRAPE_MAX_ROWS,
+                        help='Largest dataset the scrape cases run on')
+    parser.add_argument('--output', help='Where to write the results (default: benchmarks/results/<time>.json)')
+    parser.add_argument('--baseline', help='Earlier results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown of a median, as a fraction')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='Compare two saved runs and exit')
+    args = parser.parse_args()
+    
+    if args.compare:
+        regressions = compare(load_results(args.compare[0]), load_results(args.compare[1]), args.tolerance)
+    else:
+        baseline = load_results(args.baseline) if args.baseline else None
+        output = os.path.abspath(args.output or os.path.join(
+            RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        ))
+        # Failures raise; the scrapers' progress and warnings would only break up the table
+        logging.disable(logging.WARNING)
+        
+        current = run_suite(args)
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"Results written to {output}")
+        regressions = compare(baseline, current, args.tolerance) if baseline else []
+    
+    if regressions:
+        print(f"❌ {len(regressions)} cases slower than the baseline by more than {args.tolerance:.0%}: "
+              f"{', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Synthetic OHLC datasets in the same CSV layout as the real one, for benchmarks."""
+
+import os
+import sys
+import tempfile
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import COLUMN_MAPPING, CSV_FILENAME, DATA_DIR
+
+
+def make_frame(rows: int, end: date = date(2026, 8, 6), seed: int = 42) -> pd.DataFrame:
+    """
+    Build a newest-first frame of `rows` consecutive days ending at `end`.
+    
+    Datasets longer than the calendar allows start at 0001/01/01 instead.
+    """
+    rng = np.random.default_rng(seed)
+    walk = np.cumsum(rng.normal(0, 0.01, rows))
+    close = (13700 * np.exp(walk - walk.min())).astype(np.int64)[::-1]
+    open_price = (close * rng.uniform(0.99, 1.01, rows)).astype(np.int64)
+    high = np.maximum(open_price, close) + rng.integers(0, 500, rows)
+    low = np.minimum(open_price, close) - rng.integers(0, 500, rows)
+    change = np.abs(np.diff(close, append=close[-1]))
+    percent = np.round(change / close * 100, 2)
+    
+    first_day = max(date.min.toordinal(), end.toordinal() - rows + 1)
+    days = [date.fromordinal(first_day + rows - 1 - i) for i in range(rows)]
+    return pd.DataFrame({
+        COLUMN_MAPPING["open_price"]: open_price,
+        COLUMN_MAPPING["low_price"]: low,
+        COLUMN_MAPPING["high_price"]: high,
+        COLUMN_MAPPING["close_price"]: close,
+        COLUMN_MAPPING["change_amount"]: change,
+        COLUMN_MAPPING["change_percent"]: [f"{p}%" for p in percent],
+        # strftime does not zero-pad years before 1000 on every platform
+        COLUMN_MAPPING["gregorian_date"]: [f"{d.year:04d}/{d.month:02d}/{d.day:02d}" for d in days],
+        # Approximate Solar Hijri dates; only the format matters for benchmarks
+        COLUMN_MAPPING["persian_date"]: [f"{max(d.year - 621, 1):04d}/{d.month:02d}/{d.day:02d}" for d in days],
+    })
+
+
+def write_csv(path: str, rows: int, **kwargs) -> pd.DataFrame:
+    """Write a synthetic dataset to `path` and return it."""
+    df = make_frame(rows, **kwargs)
+    df.to_csv(path, index=False, encoding='utf-8')
+    return df
+
+
+def workspace(prefix: str, df: pd.DataFrame = None) -> str:
+    """
+    Change into a fresh temporary directory with an empty data/ and return it.
+    
+    If `df` is given it is stored as the dataset the scrapers and DataManager use.
+    """
+    path = tempfile.mkdtemp(prefix=prefix)
+    os.chdir(path)
+    os.makedirs(DATA_DIR)
+    if df is not None:
+        df.to_csv(os.path.join(DATA_DIR, CSV_FILENAME), index=False, encoding='utf-8')
+    return path
+
+
+def warm_derived_files():
+    """Build the derived files the committed dataset keeps next to the CSV, as a previous update would."""
+    from src.data_manager import DataManager
+    manager = DataManager()
+    manager.load_fast()
+    manager.get_indicator_state()
+    manager.update_artifact()
+    manager.get_rollups()
+    manager.get_row_index()
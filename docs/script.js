@@ -1,5 +1,8 @@
 // Configuration
 const DATA_URL = 'https://raw.githubusercontent.com/kooroshkz/Dollar-Rial-Toman-Live-Price-Dataset/refs/heads/main/data/Dollar_Rial_Price_Dataset.csv';
+// Bars and indicator series precomputed by the Python data layer (src/artifacts.py)
+const ARTIFACT_URL = DATA_URL.replace(/\.csv$/, '.dashboard.json');
+const ARTIFACT_VERSION = 3;
 
 // Global variables
 let chart;
@@ -8,6 +11,7 @@ let lineSeries;
 let areaSeries;
 let currentSeriesType = 'candlestick';
 let allData = [];
+let precomputed = null;
 let indicatorCharts = {
     rsi: null,
     stochastic: null,
@@ -62,7 +66,7 @@ document.addEventListener('DOMContentLoaded', function() {
         console.log('Setting up event listeners...');
         setupEventListeners();
         console.log('✅ Event listeners set up');
-        
+    
     } catch (error) {
         console.error('❌ Initialization error:', error);
         showError(error.message);
@@ -106,7 +110,7 @@ function initializeChart() {
             },
         });
         console.log('✅ Chart created');
-
+        
         console.log('Adding series...');
         // Create all series types (initially hidden)
         candlestickSeries = chart.addCandlestickSeries({
@@ -116,12 +120,12 @@ function initializeChart() {
             wickUpColor: '#238636',
             wickDownColor: '#f85149',
         });
-
+        
         lineSeries = chart.addLineSeries({
             color: '#58a6ff',
             lineWidth: 2,
         });
-
+        
         areaSeries = chart.addAreaSeries({
             topColor: 'rgba(88, 166, 255, 0.56)',
             bottomColor: 'rgba(88, 166, 255, 0.04)',
@@ -133,7 +137,7 @@ function initializeChart() {
         lineSeries.applyOptions({ visible: false });
         areaSeries.applyOptions({ visible: false });
         console.log('✅ All series added');
-
+        
         // Handle resize
         window.addEventListener('resize', () => {
             chart.applyOptions({ width: chartContainer.clientWidth });
@@ -149,7 +153,7 @@ function initializeChart() {
             });
         });
         console.log('✅ Resize handler added');
-        
+    
     } catch (error) {
         console.error('❌ Chart initialization error:', error);
         showError('Failed to initialize chart: ' + error.message);
@@ -169,37 +173,23 @@ const SAMPLE_DATA = [
 async function loadData() {
     try {
         console.log('Starting data load...');
-        console.log('Fetching data from:', DATA_URL);
-        
-        // Try to fetch real data first
-        const response = await fetch(DATA_URL, {
-            method: 'GET',
-            mode: 'cors',
-            headers: {
-                'Accept': 'text/csv,text/plain,*/*'
-            }
-        });
         
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
+        // Prefer the small precomputed artifact; parse the CSV if it is unavailable
+        try {
+            await loadArtifact();
+        } catch (artifactError) {
+            console.warn('Precomputed data unavailable, parsing the CSV instead:', artifactError);
+            precomputed = null;
+            await loadCSV();
         }
-        
-        const csvText = await response.text();
-        console.log('CSV data loaded, length:', csvText.length);
-        
-        allData = parseCSV(csvText);
-        console.log('Parsed data points:', allData.length);
-        
-        if (allData.length === 0) {
-            throw new Error('No data parsed from CSV');
-        }
-        
+    
     } catch (error) {
         console.error('Error loading real data:', error);
         console.log('Using sample data for local preview...');
         
         // Use sample data as fallback
         allData = SAMPLE_DATA;
+        precomputed = null;
         console.log('Sample data loaded:', allData.length, 'records');
         
         // Show a message to user
@@ -214,6 +204,7 @@ async function loadData() {
     
     console.log('Updating chart...');
     updateChart(allData);
+    showBarControls(precomputed !== null);
     
     console.log('Hiding loading indicator...');
     hideLoading();
@@ -224,6 +215,144 @@ async function loadData() {
     console.log('✅ Data loading complete');
 }
 
+// Fetch and parse the CSV dataset
+async function loadCSV() {
+    console.log('Fetching data from:', DATA_URL);
+    
+    const response = await fetch(DATA_URL, {
+        method: 'GET',
+        mode: 'cors',
+        headers: {
+            'Accept': 'text/csv,text/plain,*/*'
+        }
+    });
+    
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    const csvText = await response.text();
+    console.log('CSV data loaded, length:', csvText.length);
+    
+    allData = parseCSV(csvText);
+    console.log('Parsed data points:', allData.length);
+    
+    if (allData.length === 0) {
+        throw new Error('No data parsed from CSV');
+    }
+}
+
+// Fetch the precomputed artifact: daily, weekly and monthly bars plus the indicator series
+async function loadArtifact() {
+    console.log('Fetching precomputed data from:', ARTIFACT_URL);
+    
+    const response = await fetch(ARTIFACT_URL, {
+        method: 'GET',
+        mode: 'cors',
+        headers: {
+            'Accept': 'application/json,*/*'
+        }
+    });
+    
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    const artifact = await response.json();
+    if (artifact.version !== ARTIFACT_VERSION) {
+        throw new Error(`Unsupported artifact version: ${artifact.version}`);
+    }
+    
+    allData = decodeBars(artifact.daily);
+    precomputed = {
+        times: allData.map(item => item.time),
+        indicators: artifact.indicators,
+        weekly: decodeBars(artifact.weekly),
+        monthly: decodeBars(artifact.monthly)
+    };
+    console.log('Precomputed data loaded:', allData.length, 'days up to', artifact.latest_date);
+    
+    if (allData.length === 0) {
+        throw new Error('No data in the precomputed artifact');
+    }
+}
+
+// Decode bars stored as a start date, gaps in days and delta-coded prices
+function decodeBars(encoded) {
+    const times = decodeDates(encoded.start, encoded.gaps);
+    const pdates = encoded.persian_date ? decodePersianDates(encoded.persian_date) : [];
+    const open = decodeDeltas(encoded.open);
+    const low = decodeDeltas(encoded.low);
+    const high = decodeDeltas(encoded.high);
+    const close = decodeDeltas(encoded.close);
+    
+    return times.map((time, i) => ({
+        gdate: time.replace(/-/g, '/'),
+        pdate: pdates[i],
+        time: time,
+        open: open[i],
+        low: low[i],
+        high: high[i],
+        close: close[i],
+        value: close[i]
+    }));
+}
+
+// Running sums of delta-coded integers scaled by 10^decimals (negative for tens of rials); null stays a gap
+function decodeDeltas(deltas, decimals = 0) {
+    const scale = Math.pow(10, Math.abs(decimals));
+    let total = 0;
+    return deltas.map(delta => {
+        if (delta === null) return null;
+        total += delta;
+        return decimals < 0 ? total * scale : total / scale;
+    });
+}
+
+// YYYY-MM-DD dates from a start date and the gaps in days between them
+function decodeDates(start, gaps) {
+    const dayMs = 24 * 60 * 60 * 1000;
+    let timestamp = Date.parse(`${start}T00:00:00Z`);
+    const dates = [start];
+    for (const gap of gaps) {
+        timestamp += gap * dayMs;
+        dates.push(new Date(timestamp).toISOString().slice(0, 10));
+    }
+    return dates;
+}
+
+// Persian dates stored as deltas of their YYYYMMDD numbers; other text is stored as is
+function decodePersianDates(encoded) {
+    let number = 0;
+    return encoded.map(item => {
+        if (typeof item === 'string') return item;
+        number += item;
+        const year = String(Math.floor(number / 10000)).padStart(4, '0');
+        const month = String(Math.floor(number / 100) % 100).padStart(2, '0');
+        const day = String(number % 100).padStart(2, '0');
+        return `${year}/${month}/${day}`;
+    });
+}
+
+// A precomputed indicator series as chart points, or null without the artifact
+function precomputedSeries(name) {
+    const series = precomputed && precomputed.indicators[name];
+    if (!series) return null;
+    
+    const points = [];
+    decodeDeltas(series.deltas, series.decimals).forEach((value, i) => {
+        if (value !== null) {
+            points.push({ time: precomputed.times[series.start + i], value: value });
+        }
+    });
+    return points;
+}
+
+// Chikou Span: each close drawn `shift` days back; the artifact leaves it out since it repeats the closes
+function laggingSpan(data, shift = 26) {
+    return data.slice(shift).map((item, i) => ({ time: data[i].time, value: item.close }));
+}
+
 // Show data source message
 function showDataSourceMessage(message) {
     const messageDiv = document.createElement('div');
@@ -357,31 +486,10 @@ function updateRecentDataTable(recentData) {
 // Update chart with data
 function updateChart(data) {
     if (data.length === 0) return;
-
-    console.log('Preparing chart data...');
-    // Prepare data for different series types
-    const candlestickData = data.map(item => ({
-        time: item.time,
-        open: item.open,
-        high: item.high,
-        low: item.low,
-        close: item.close,
-    }));
-
-    const lineData = data.map(item => ({
-        time: item.time,
-        value: item.close,
-    }));
-
+    
     console.log('Setting data to series...');
-    console.log('Sample candlestick data:', candlestickData.slice(0, 2));
-    console.log('Sample line data:', lineData.slice(0, 2));
-
-    // Set data for all series
-    candlestickSeries.setData(candlestickData);
-    lineSeries.setData(lineData);
-    areaSeries.setData(lineData);
-
+    setPriceData(data);
+    
     console.log('Fitting content...');
     // Fit content to show all data
     chart.timeScale().fitContent();
@@ -408,9 +516,48 @@ function updateChart(data) {
     }
 }
 
+// Set bars on the candlestick, line and area series
+function setPriceData(data) {
+    // Prepare data for different series types
+    const candlestickData = data.map(item => ({
+        time: item.time,
+        open: item.open,
+        high: item.high,
+        low: item.low,
+        close: item.close,
+    }));
+    
+    const lineData = data.map(item => ({
+        time: item.time,
+        value: item.close,
+    }));
+    
+    // Set data for all series
+    candlestickSeries.setData(candlestickData);
+    lineSeries.setData(lineData);
+    areaSeries.setData(lineData);
+}
+
+// Switch the price chart between daily bars and the precomputed weekly or monthly bars
+function switchBars(period) {
+    const bars = precomputed && precomputed[period] ? precomputed[period] : allData;
+    setPriceData(bars);
+    chart.timeScale().fitContent();
+}
+
+// Weekly and monthly bars come with the precomputed artifact only
+function showBarControls(visible) {
+    const controls = document.getElementById('barControls');
+    if (!controls) return;
+    controls.style.display = visible ? 'flex' : 'none';
+    controls.querySelectorAll('.chart-btn').forEach(btn => {
+        btn.classList.toggle('active', btn.getAttribute('data-bars') === 'daily');
+    });
+}
+
 // Setup event listeners
 function setupEventListeners() {
-    const chartButtons = document.querySelectorAll('.chart-btn');
+    const chartButtons = document.querySelectorAll('.chart-btn[data-type]');
     
     chartButtons.forEach(button => {
         button.addEventListener('click', () => {
@@ -423,6 +570,17 @@ function setupEventListeners() {
         });
     });
     
+    const barButtons = document.querySelectorAll('.chart-btn[data-bars]');
+    
+    barButtons.forEach(button => {
+        button.addEventListener('click', () => {
+            switchBars(button.getAttribute('data-bars'));
+            
+            barButtons.forEach(btn => btn.classList.remove('active'));
+            button.classList.add('active');
+        });
+    });
+    
     setupIndicatorEventListeners();
 }
 
@@ -444,7 +602,7 @@ function switchChartType(type) {
     candlestickSeries.applyOptions({ visible: false });
     lineSeries.applyOptions({ visible: false });
     areaSeries.applyOptions({ visible: false });
-
+    
     // Show the selected series
     switch (type) {
         case 'candlestick':
@@ -457,7 +615,7 @@ function switchChartType(type) {
             areaSeries.applyOptions({ visible: true });
             break;
     }
-
+    
     currentSeriesType = type;
 }
 
@@ -513,7 +671,7 @@ function removeIndicator(indicatorType) {
             document.getElementById('rsiWindow').style.display = 'none';
             indicators.rsi = null;
             break;
-            
+        
         case 'stochastic':
             if (indicatorCharts.stochastic) {
                 indicatorCharts.stochastic.remove();
@@ -522,7 +680,7 @@ function removeIndicator(indicatorType) {
             document.getElementById('stochasticWindow').style.display = 'none';
             indicators.stochastic = { main: null, slow: null };
             break;
-            
+        
         case 'momentum':
             if (indicatorCharts.momentum) {
                 indicatorCharts.momentum.remove();
@@ -531,7 +689,7 @@ function removeIndicator(indicatorType) {
             document.getElementById('momentumWindow').style.display = 'none';
             indicators.momentum = null;
             break;
-            
+        
         case 'macd':
             if (indicatorCharts.macd) {
                 indicatorCharts.macd.remove();
@@ -540,7 +698,7 @@ function removeIndicator(indicatorType) {
             document.getElementById('macdWindow').style.display = 'none';
             indicators.macd = { main: null, signal: null };
             break;
-            
+        
         case 'ichimoku':
             // Remove all Ichimoku components from main chart
             Object.values(indicators.ichimoku).forEach(series => {
@@ -556,7 +714,7 @@ function removeIndicator(indicatorType) {
                 chikouSpan: null
             };
             break;
-            
+        
         case 'ema':
             // Remove all EMA lines from main chart
             Object.values(indicators.ema).forEach(series => {
@@ -619,7 +777,7 @@ function createIndicatorChart(containerId, title) {
 
 // Add RSI indicator in separate window
 function addRSI() {
-    const rsiData = calculateRSI(allData, 14);
+    const rsiData = precomputedSeries('RSI') || calculateRSI(allData, 14);
     
     // Show RSI window
     document.getElementById('rsiWindow').style.display = 'block';
@@ -691,8 +849,8 @@ function addRSI() {
 
 // Add Stochastic indicator in separate window
 function addStochastic() {
-    const stochasticData = calculateStochastic(allData, 14, 3);
-    const stochasticSlowData = calculateStochasticSlow(allData, 14, 3, 3);
+    const stochasticData = precomputedSeries('Stochastic %K') || calculateStochastic(allData, 14, 3);
+    const stochasticSlowData = precomputedSeries('Stochastic %D') || calculateStochasticSlow(allData, 14, 3, 3);
     
     // Show Stochastic window
     document.getElementById('stochasticWindow').style.display = 'block';
@@ -764,7 +922,7 @@ function addStochastic() {
 
 // Add Momentum indicator in separate window
 function addMomentum() {
-    const momentumData = calculateMomentum(allData, 10);
+    const momentumData = precomputedSeries('Momentum') || calculateMomentum(allData, 10);
     
     // Show Momentum window
     document.getElementById('momentumWindow').style.display = 'block';
@@ -812,7 +970,9 @@ function addMomentum() {
 
 // Add MACD indicator in separate window
 function addMACD() {
-    const macdData = calculateMACD(allData, 12, 26, 9);
+    const macdData = precomputed
+        ? { macd: precomputedSeries('MACD'), signal: precomputedSeries('MACD Signal') }
+        : calculateMACD(allData, 12, 26, 9);
     
     // Show MACD window
     document.getElementById('macdWindow').style.display = 'block';
@@ -873,7 +1033,13 @@ function addMACD() {
 
 // Add Complete Ichimoku Cloud
 function addIchimoku() {
-    const ichimokuData = calculateIchimoku(allData);
+    const ichimokuData = precomputed ? {
+        tenkanSen: precomputedSeries('Tenkan-sen'),
+        kijunSen: precomputedSeries('Kijun-sen'),
+        senkouSpanA: precomputedSeries('Senkou Span A'),
+        senkouSpanB: precomputedSeries('Senkou Span B'),
+        chikouSpan: laggingSpan(allData, 26)
+    } : calculateIchimoku(allData);
     
     // Tenkan-sen (Conversion Line) - 9 period
     indicators.ichimoku.tenkanSen = chart.addLineSeries({
@@ -920,9 +1086,9 @@ function addIchimoku() {
 
 // Add EMA indicator (best setup: 12, 26, 50) - Overlay on main chart
 function addEMA() {
-    const ema12 = calculateEMA(allData, 12);
-    const ema26 = calculateEMA(allData, 26);
-    const ema50 = calculateEMA(allData, 50);
+    const ema12 = precomputedSeries('EMA 12') || calculateEMA(allData, 12);
+    const ema26 = precomputedSeries('EMA 26') || calculateEMA(allData, 26);
+    const ema50 = precomputedSeries('EMA 50') || calculateEMA(allData, 50);
     
     // EMA 12 (fastest) - bright color
     indicators.ema.ema12 = chart.addLineSeries({
@@ -1041,30 +1207,6 @@ function calculateMomentum(data, period = 10) {
     return momentum;
 }
 
-// Calculate MACD with Signal Line
-function calculateMACD(data, fastPeriod = 12, slowPeriod = 26, signalPeriod = 9) {
-    const emaFast = calculateEMA(data, fastPeriod);
-    const emaSlow = calculateEMA(data, slowPeriod);
-    const macd = [];
-    
-    // Calculate MACD line (fast EMA - slow EMA)
-    const startIndex = slowPeriod - 1;
-    for (let i = startIndex; i < data.length; i++) {
-        const fastValue = emaFast[i - startIndex].value;
-        const slowValue = emaSlow[i - startIndex].value;
-        
-        macd.push({
-            time: data[i].time,
-            value: fastValue - slowValue
-        });
-    }
-    
-    // Calculate Signal line (EMA of MACD)
-    const signal = calculateEMAFromValues(macd, signalPeriod);
-    
-    return { macd, signal };
-}
-
 // Calculate Stochastic with Slow %D
 function calculateStochasticSlow(data, kPeriod = 14, dPeriod = 3, slowDPeriod = 3) {
     const stochastic = [];
@@ -1104,8 +1246,9 @@ function calculateMACD(data, fastPeriod = 12, slowPeriod = 26, signalPeriod = 9)
     // Calculate MACD line (fast EMA - slow EMA)
     const startIndex = slowPeriod - 1;
     for (let i = startIndex; i < data.length; i++) {
-        const fastValue = emaFast[i - startIndex].value;
-        const slowValue = emaSlow[i - startIndex].value;
+        // Both EMAs start at the first day, so they are indexed like data
+        const fastValue = emaFast[i].value;
+        const slowValue = emaSlow[i].value;
         
         macd.push({
             time: data[i].time,
@@ -1257,11 +1400,11 @@ function showError(message) {
             </div>
         `;
     }
-
+    
     // Update table
     const tbody = document.getElementById('recentDataBody');
     tbody.innerHTML = '<tr><td colspan="6" class="loading" style="color: #e74c3c;">Failed to load data</td></tr>';
-
+    
     // Update stats
     document.getElementById('totalRecords').textContent = 'Error';
     document.getElementById('lastUpdate').textContent = 'Error';
@@ -8,51 +8,360 @@ from tgju.org with automatic pagination and incremental updates.
 Author: Koorosh Komeili Zadeh
 """
 
+import argparse
+import json
 import sys
-import os
+import time
+from contextlib import nullcontext
+from datetime import date, datetime
 
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-from src.scraper import DollarScraper
+from src.backends import SCRAPER_BACKENDS
+from src.config import (
+    INSTRUMENTS, PROFILE_URL_TEMPLATE, DATA_DIR, METRICS_DIR, PROFILE_DIR, UPDATE_CHECK_RECORDS, SYNC_MAX_GAP_DAYS
+)
+from src.metrics import REGISTRY
+from src.registry import resolve_instruments
 from src.utils import setup_logging
 
+# The scraping modules (selenium, pandas, requests) are imported where they are used,
+# so --help and argument errors return without loading them
 
-def main():
-    """Main entry point for the dollar scraper."""
+
+def parse_args(argv=None):
+    """Parse command line options; without a command, `update` runs."""
+    parser = argparse.ArgumentParser(
+        description="Scrape TGJU price history into CSV datasets.",
+        epilog="Options above go before the command, except --instrument, which also goes after it."
+    )
+    instrument_help = f"Instruments to work on, or 'all' (default: USD/IRR). Known: {', '.join(INSTRUMENTS)}"
+    parser.add_argument('--instrument', '-i', nargs='+', metavar='SLUG', help=instrument_help)
+    parser.add_argument('--backend', choices=sorted(SCRAPER_BACKENDS), help='Scraper backend (default from config)')
+    parser.add_argument(
+        '--watch', type=float, metavar='SECONDS',
+        help='Keep running and update every SECONDS, reusing warm Chrome drivers between updates'
+    )
+    parser.add_argument(
+        '--metrics-dir', default=METRICS_DIR, metavar='DIR',
+        help=f'Where to write the run report and Prometheus textfile after each run (default: {METRICS_DIR})'
+    )
+    parser.add_argument(
+        '--profile', choices=('cprofile', 'sample'),
+        help='Profile the run: cprofile writes pstats and a summary, sample writes collapsed stacks for flamegraphs'
+    )
+    parser.add_argument(
+        '--trace-memory', action='store_true',
+        help='Snapshot memory with tracemalloc around every scrape and append and report the top allocators (slow)'
+    )
+    parser.add_argument(
+        '--profile-dir', default=PROFILE_DIR, metavar='DIR',
+        help=f'Where to write the profiling output (default: {PROFILE_DIR})'
+    )
+    parser.set_defaults(check=None, dry_run=False, fill_gaps=False, json=False)
+    
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--json', action='store_true', help='Print the result as JSON, keyed by instrument')
+    # A missing -i after the command must not overwrite one given before it
+    output.add_argument('--instrument', '-i', nargs='+', metavar='SLUG', default=argparse.SUPPRESS,
+                        help=instrument_help)
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    
+    update = commands.add_parser('update', parents=[output], help='Fetch rows newer than the dataset (default)')
+    update.add_argument(
+        '--check', type=int, nargs='?', const=UPDATE_CHECK_RECORDS, metavar='RECORDS',
+        help=f'Only compare the newest RECORDS rows on the site (default {UPDATE_CHECK_RECORDS}) with the newest '
+             'stored rows; falls back to a regular update when they are all new'
+    )
+    update.add_argument('--dry-run', action='store_true', help='Show the new rows without writing them')
+    update.add_argument(
+        '--fill-gaps', action='store_true',
+        help=f'Also re-check the site pages that cover gaps of more than {SYNC_MAX_GAP_DAYS} days in the stored '
+             'dates (the ones verify lists) and add the rows missing there'
+    )
+    
+    backfill = commands.add_parser('backfill', parents=[output], help='Fetch a date range in parallel and merge it')
+    backfill.add_argument('--from', dest='start', required=True, metavar='YYYY/MM/DD', help='First Gregorian date')
+    backfill.add_argument('--to', dest='end', metavar='YYYY/MM/DD', help='Last Gregorian date (default: newest)')
+    backfill.add_argument('--dry-run', action='store_true', help='Show the missing rows without writing them')
+    
+    verify = commands.add_parser('verify', parents=[output], help='Check dataset integrity and scan for gaps')
+    verify.add_argument(
+        '--max-gap-days', type=int, default=SYNC_MAX_GAP_DAYS, metavar='DAYS',
+        help=f'Report stored neighbours further apart than DAYS (default: {SYNC_MAX_GAP_DAYS})'
+    )
+    verify.add_argument('--strict', action='store_true',
+                        help='Fail on warnings and gaps too, not only on integrity problems')
+    
+    query = commands.add_parser('query', parents=[output], help='Read stored rows or a dataset summary')
+    query.add_argument('--from', dest='start', metavar='YYYY/MM/DD', help='First date of a range')
+    query.add_argument('--to', dest='end', metavar='YYYY/MM/DD', help='Last date of a range')
+    query.add_argument('--calendar', choices=('gregorian', 'persian'), default='gregorian',
+                       help='Calendar of the dates given (default: gregorian)')
+    single = query.add_mutually_exclusive_group()
+    single.add_argument('--latest', type=int, metavar='N', help='The newest N rows')
+    single.add_argument('--on', metavar='YYYY/MM/DD', help='The row of one date')
+    single.add_argument('--summary', action='store_true', help='Record count and date range (default)')
+    
+    args = parser.parse_args(argv)
+    args.command = args.command or 'update'
+    if args.watch and args.command != 'update':
+        parser.error("--watch only applies to the update command")
+    if args.command == 'update' and args.dry_run and args.watch:
+        parser.error("--dry-run cannot be combined with --watch")
+    if args.command == 'update' and args.dry_run and args.fill_gaps:
+        parser.error("--dry-run cannot be combined with --fill-gaps")
+    if args.command == 'query' and (args.start or args.end) and (args.latest is not None or args.on or args.summary):
+        parser.error("--from/--to cannot be combined with --latest, --on or --summary")
+    if args.command == 'query' and args.latest is not None and args.latest < 1:
+        parser.error("--latest needs N of at least 1")
+    return args
+
+
+def print_results(results: dict, as_json: bool):
+    """Print per-instrument results as JSON on stdout, or as indented text."""
+    if as_json:
+        print(json.dumps(results, indent=2, ensure_ascii=False, default=str))
+        return
+    
+    for instrument, result in results.items():
+        print(f"{INSTRUMENTS[instrument]['name']} ({instrument}):")
+        for key, value in result.items():
+            if key == 'rows':
+                import pandas as pd
+                print(pd.DataFrame(value).to_string(index=False) if value else "  no rows")
+            elif isinstance(value, list):
+                print(f"  {key}: {len(value)}")
+                for item in value:
+                    print(f"    {', '.join(f'{k}: {v}' for k, v in item.items()) if isinstance(item, dict) else item}")
+            else:
+                print(f"  {key}: {value}")
+
+
+def update_artifacts(instruments, logger) -> bool:
+    """Bring each dataset's dashboard artifact up to date; appends already extend it, so this rarely rebuilds."""
+    from src.data_manager import DataManager
+    success = True
+    for instrument in instruments:
+        if not DataManager(INSTRUMENTS[instrument]['csv_filename']).update_artifact():
+            logger.warning(f"Could not write the dashboard artifact for {instrument}")
+            success = False
+    return success
+
+
+def export_metrics(started: datetime, success: bool, instruments, backend, directory: str, logger):
+    """Write the run report and Prometheus textfile; a failure here never fails the run."""
+    try:
+        REGISTRY.export(started, success, directory=directory, instruments=list(instruments), backend=backend)
+    except Exception as e:
+        logger.warning(f"Could not write run metrics to {directory}: {e}")
+
+
+def watch(instruments, backend, interval: float, metrics_dir: str, logger, fill_gaps: bool = False) -> int:
+    """Long-lived mode: update on a fixed interval with one persistent driver pool."""
+    from src.drivers import DriverPool
+    from src.instruments import scrape_instruments
+    print(f"\nUpdating every {interval:g}s. Press Ctrl+C to stop.")
+    
+    with DriverPool() as pool:
+        try:
+            while True:
+                started = time.monotonic()
+                REGISTRY.reset()
+                run_started = datetime.now()
+                results = scrape_instruments(instruments, backend=backend, driver_pool=pool, fill_gaps=fill_gaps)
+                update_artifacts([instrument for instrument, success in results.items() if success], logger)
+                failed = [instrument for instrument, success in results.items() if not success]
+                export_metrics(run_started, not failed, instruments, backend, metrics_dir, logger)
+                logger.info(f"Update finished; failed: {failed or 'none'}; driver pool: {pool.stats()}")
+                time.sleep(max(0, interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+    
+    return 0
+
+
+def print_header(instruments):
     print("=" * 60)
-    print("USD/IRR Exchange Rate Scraper")
+    print("TGJU Exchange Rate Scraper")
     print("=" * 60)
-    print("Target: https://www.tgju.org/profile/price_dollar_rl/history")
-    print("Output: data/Dollar_Rial_Price_Dataset.csv")
+    for instrument in instruments:
+        print(f"Target: {PROFILE_URL_TEMPLATE.format(slug=instrument)}")
+        print(f"Output: {DATA_DIR}/{INSTRUMENTS[instrument]['csv_filename']}")
     print("=" * 60)
+
+
+def preview_update(args, instruments, logger) -> int:
+    """update --dry-run: grow the check until it reaches stored data and report what is new."""
+    from src.backends import create_scraper
+    results = {}
+    for instrument in instruments:
+        scraper = create_scraper("http", instrument=instrument, fallback=False)
+        records = args.check or UPDATE_CHECK_RECORDS
+        while True:
+            comparison = scraper.check_newest(records)
+            if comparison['complete'] or comparison['checked'] < records:
+                break
+            records *= 2
+        results[instrument] = {
+            'latest_date': scraper.data_manager.get_latest_date(),
+            'checked': comparison['checked'],
+            'new_records': [row.gregorian_date for row in comparison['new']],
+            'changed_records': [row.gregorian_date for row in comparison['changed']]
+        }
+    print_results(results, args.json)
+    return 0
+
+
+def run_update(args, instruments, logger) -> int:
+    """Bring the datasets up to date, or keep doing so with --watch."""
+    from src.data_manager import DataManager
+    from src.instruments import scrape_instruments
+    if args.dry_run:
+        return preview_update(args, instruments, logger)
+    if args.watch:
+        return watch(instruments, args.backend, args.watch, args.metrics_dir, logger, args.fill_gaps)
+    
+    if not args.json:
+        print_header(instruments)
+        print("\nStarting scraper...")
+    started = datetime.now()
+    results = scrape_instruments(instruments, backend=args.backend, check=args.check, fill_gaps=args.fill_gaps)
+    success = all(results.values())
+    if success:
+        update_artifacts(instruments, logger)
+    export_metrics(started, success, instruments, args.backend, args.metrics_dir, logger)
+    
+    if args.json:
+        print_results({
+            instrument: {
+                'success': results[instrument],
+                'rows_added': sum(REGISTRY.get(instrument=instrument).counters.get(name, 0)
+                                  for name in ('rows_added', 'rows_saved')),
+                'latest_date': DataManager(INSTRUMENTS[instrument]['csv_filename']).get_latest_date()
+            } for instrument in instruments
+        }, True)
+    elif success:
+        print("\nScraping completed successfully!")
+        print("Check the 'data' folder for your CSV file.")
+    else:
+        print("\nScraping failed. Check the log file for details.")
+    return 0 if success else 1
+
+
+def run_backfill(args, instruments, logger) -> int:
+    """Fetch the site's rows of a date range and merge the ones the datasets are missing."""
+    from src.backends import create_scraper
+    from src.models import date_to_ordinal
+    start_day = date_to_ordinal(args.start)
+    end_day = date_to_ordinal(args.end) if args.end else date.today().toordinal()
+    if start_day is None or end_day is None or start_day > end_day:
+        print(f"Invalid date range: {args.start} to {args.end or 'today'}. Use YYYY/MM/DD, oldest first")
+        return 2
+    if args.backend == "selenium":
+        print("backfill needs the http backend")
+        return 2
+    
+    started = datetime.now()
+    results = {}
+    for instrument in instruments:
+        scraper = create_scraper("http", instrument=instrument, fallback=False)
+        try:
+            rows = scraper.fetch_range(start_day, end_day)
+        except Exception as e:
+            logger.error(f"Backfill of {instrument} failed: {e}")
+            results[instrument] = {'success': False}
+            continue
+        
+        stored = scraper.data_manager.get_date_index()
+        missing = [row for row, known in zip(rows, stored.contains([row.day for row in rows])) if not known]
+        result = {'success': True, 'fetched': len(rows), 'rows_added': 0 if args.dry_run else len(missing)}
+        if args.dry_run:
+            result['missing_records'] = [row.gregorian_date for row in missing]
+        elif missing:
+            result['success'] = scraper.data_manager.append_new_data(missing)
+        results[instrument] = result
+    
+    success = all(result['success'] for result in results.values())
+    if not args.dry_run:
+        update_artifacts([instrument for instrument, result in results.items() if result['success']], logger)
+        export_metrics(started, success, instruments, "http", args.metrics_dir, logger)
+    print_results(results, args.json)
+    return 0 if success else 1
+
+
+def run_verify(args, instruments, logger) -> int:
+    """Check every dataset; fails on integrity problems, and on warnings and gaps with --strict."""
+    from src.data_manager import DataManager
+    results = {}
+    for instrument in instruments:
+        report = DataManager(INSTRUMENTS[instrument]['csv_filename'], read_only=True).verify(args.max_gap_days)
+        report['ok'] = not report['problems'] and not (args.strict and (report['warnings'] or report['gaps']))
+        results[instrument] = report
+    
+    print_results(results, args.json)
+    return 0 if all(result['ok'] for result in results.values()) else 1
+
+
+def run_query(args, instruments, logger) -> int:
+    """Read stored rows through the data layer; nothing is scraped."""
+    from src.data_manager import DataManager
+    results = {}
+    for instrument in instruments:
+        data_manager = DataManager(INSTRUMENTS[instrument]['csv_filename'], read_only=True)
+        try:
+            if args.on:
+                row = data_manager.get_on(args.on, args.calendar)
+                results[instrument] = {'rows': [row] if row else []}
+            elif args.latest is not None:
+                results[instrument] = {'rows': data_manager.latest(args.latest).to_dict('records')}
+            elif args.start or args.end:
+                rows = data_manager.get_range(args.start, args.end, args.calendar)
+                results[instrument] = {'rows': rows.to_dict('records')}
+            else:
+                results[instrument] = data_manager.get_data_summary()
+        except ValueError as e:
+            print(e)
+            return 2
+    
+    print_results(results, args.json)
+    return 0
+
+
+COMMANDS = {
+    'update': run_update,
+    'backfill': run_backfill,
+    'verify': run_verify,
+    'query': run_query,
+}
+
+
+def main(argv=None):
+    """Main entry point for the dollar scraper."""
+    args = parse_args(argv)
+    try:
+        instruments = resolve_instruments(args.instrument)
+    except ValueError as e:
+        print(e)
+        return 2
     
     logger = setup_logging()
     
+    profiling = nullcontext()
+    if args.profile or args.trace_memory:
+        # Only imported when asked for, so normal runs pay nothing for it
+        from src.profiling import profile_run
+        profiling = profile_run(args.profile_dir, args.profile, args.trace_memory)
+    
     try:
-        # Initialize scraper
-        scraper = DollarScraper()
-        
-        # Run the scraper
-        print("\nStarting scraper...")
-        success = scraper.run()
-        
-        if success:
-            print("\nScraping completed successfully!")
-            print("Check the 'data' folder for your CSV file.")
-        else:
-            print("\nScraping failed. Check the log file for details.")
-            return 1
-            
+        with profiling:
+            return COMMANDS[args.command](args, instruments, logger)
+    
     except KeyboardInterrupt:
-        print("\nScraping interrupted by user.")
+        print("\nInterrupted by user.")
         return 1
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         print(f"\nUnexpected error: {e}")
         return 1
-    
-    return 0
 
 
 if __name__ == "__main__":
@@ -1,8 +1,48 @@
-"""Init file for the src package."""
+"""
+Init file for the src package.
+
+The classes and functions below are imported from their modules on first
+access, so `import src` or `from src import utils` does not pull in
+selenium, pandas or aiohttp until something needs them.
+"""
+
+import importlib
 
-from .scraper import DollarScraper
-from .data_manager import DataManager
 from .config import *
 from .utils import *
 
-__all__ = ['DollarScraper', 'DataManager']
+# Public name -> module that defines it
+_LAZY_EXPORTS = {
+    'DollarScraper': 'scraper',
+    'HttpScraper': 'http_scraper',
+    'AsyncHttpScraper': 'async_scraper',
+    'create_scraper': 'backends',
+    'DataManager': 'data_manager',
+    'scrape_instruments': 'instruments',
+    'DriverPool': 'drivers',
+    'compute_indicators': 'indicators',
+    'IndicatorState': 'indicators',
+    'build_artifact': 'artifacts',
+    'extend_artifact': 'artifacts',
+    'Rollups': 'rollups',
+    'Metrics': 'metrics',
+    'REGISTRY': 'metrics',
+    'subscribe': 'metrics',
+}
+
+__all__ = ['DollarScraper', 'HttpScraper', 'AsyncHttpScraper', 'DataManager', 'create_scraper', 'scrape_instruments', 'DriverPool',
+           'compute_indicators', 'IndicatorState', 'build_artifact', 'extend_artifact', 'Rollups',
+           'Metrics', 'REGISTRY', 'subscribe']
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value  # Later lookups skip this function
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -0,0 +1,257 @@
+"""
+Precomputed dashboard data: compact columnar JSON that docs/script.js loads instead of parsing the CSV.
+
+Holds the daily, weekly and monthly bars and the indicator series the
+dashboard draws, so the page computes nothing. Numbers are stored as
+integers (scaled by 10**decimals) and each one as the difference from the
+previous value of its column, which keeps the file small and compressing
+well. Null marks a gap and leaves the running value unchanged.
+"""
+
+import json
+import os
+from typing import Dict, Any, Optional, List
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    ARTIFACT_VERSION, ARTIFACT_DECIMALS, ARTIFACT_PRICE_DECIMALS, ARTIFACT_BAR_PERIODS,
+    STOCHASTIC_PERIODS, MOMENTUM_PERIOD, EMA_PERIODS, ICHIMOKU_PERIODS
+)
+from .indicators import compute_indicators, _floats
+from .rollups import DATE, PERSIAN_DATE, OHLC, FIRST_DATE, aggregate, period_keys, _daily_frame
+from .storage import atomic_write
+
+# Lines drawn on the price chart, rounded to ARTIFACT_PRICE_DECIMALS
+PRICE_SERIES = tuple(f'EMA {period}' for period in EMA_PERIODS) + (
+    'Tenkan-sen', 'Kijun-sen', 'Senkou Span A', 'Senkou Span B'
+)
+
+# The lagging span is the daily close drawn a base period back; the dashboard shifts the closes itself
+SKIPPED_SERIES = ('Chikou Span',)
+
+# Days of history behind any windowed indicator value (leading span B is a window shifted forward)
+WINDOW_LOOKBACK = max(sum(STOCHASTIC_PERIODS), MOMENTUM_PERIOD + 1, ICHIMOKU_PERIODS[2] + ICHIMOKU_PERIODS[1])
+
+
+def _decimals(name: str) -> int:
+    if name in PRICE_SERIES:
+        return ARTIFACT_PRICE_DECIMALS
+    # MACD is a difference of prices, in whole rials like the bars
+    return 0 if name.startswith('MACD') else ARTIFACT_DECIMALS
+
+
+def _encode_deltas(values, decimals: int = 0, previous: int = 0) -> List[Optional[int]]:
+    """Encode values following a column whose running (scaled) value is `previous`."""
+    scaled = np.round(np.asarray(values, dtype='float64') * 10.0 ** decimals)
+    present = ~np.isnan(scaled)
+    if present.all():
+        return np.diff(scaled, prepend=previous).astype('int64').tolist()
+    deltas = iter(np.diff(scaled[present], prepend=previous).astype('int64').tolist())
+    return [next(deltas) if is_present else None for is_present in present.tolist()]
+
+
+def _decode_deltas(deltas: list, decimals: int = 0, previous: int = 0) -> np.ndarray:
+    values = np.asarray(deltas, dtype='float64')
+    present = ~np.isnan(values)
+    totals = previous + np.cumsum(values[present])
+    values[present] = totals / 10 ** decimals if decimals >= 0 else totals * 10 ** -decimals
+    return values
+
+
+def _total(deltas: list) -> int:
+    """Running (scaled) value at the end of a delta-coded column; gaps and text leave it unchanged."""
+    try:
+        return sum(filter(None, deltas))
+    except TypeError:  # Persian dates keep unparsable text
+        return sum(delta for delta in deltas if isinstance(delta, int))
+
+
+def _encode_persian_dates(dates: pd.Series, previous: int = 0) -> list:
+    """Persian dates as differences of their YYYYMMDD numbers; text that is not such a date is kept as is."""
+    is_date = dates.str.fullmatch(r'[0-9]{4}/[0-9]{2}/[0-9]{2}').fillna(False)
+    numbers = pd.to_numeric(dates.where(is_date).str.replace('/', '', regex=False))
+    deltas = _encode_deltas(numbers, previous=previous)
+    return [delta if matched else text for delta, matched, text in zip(deltas, is_date.tolist(), dates.tolist())]
+
+
+def _decode_persian_dates(encoded: list, number: int = 0) -> List[str]:
+    dates = []
+    for item in encoded:
+        if isinstance(item, str):
+            dates.append(item)
+            continue
+        number += item
+        dates.append(f"{number // 10000:04d}/{number // 100 % 100:02d}/{number % 100:02d}")
+    return dates
+
+
+def _bars(daily: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Rollup bars of a ROLLUP_PERIODS period, each dated by its first trading day."""
+    return aggregate(daily, period).rename(columns={FIRST_DATE: DATE})[[DATE, *OHLC.values()]]
+
+
+def _encode_bars(bars: pd.DataFrame) -> Dict[str, Any]:
+    """Bars as columns; dates are the first date plus the gaps in days between consecutive bars."""
+    days = bars[DATE].to_numpy().astype('datetime64[D]')
+    encoded = {'start': str(days[0]), 'gaps': np.diff(days.astype('int64')).tolist()}
+    if PERSIAN_DATE in bars:
+        encoded['persian_date'] = _encode_persian_dates(bars[PERSIAN_DATE])
+    for name, column in OHLC.items():
+        encoded[name] = _encode_deltas(bars[column])
+    return encoded
+
+
+def _decode_bars(encoded: Dict[str, Any], first: int = 0) -> pd.DataFrame:
+    """Decode the bars from index `first` on; the deltas before it are only summed."""
+    start = np.datetime64(encoded['start'], 'D') + sum(encoded['gaps'][:first])
+    offsets = np.concatenate(([0], np.cumsum(encoded['gaps'][first:], dtype='int64')))
+    bars = pd.DataFrame({DATE: (start + offsets).astype('datetime64[s]')})
+    if 'persian_date' in encoded:
+        persian = encoded['persian_date']
+        bars[PERSIAN_DATE] = _decode_persian_dates(persian[first:], _total(persian[:first]))
+    for name, column in OHLC.items():
+        bars[column] = _decode_deltas(encoded[name][first:], previous=_total(encoded[name][:first])).astype('int64')
+    return bars
+
+
+def _append_bars(encoded: Dict[str, Any], bars: pd.DataFrame):
+    """Encode bars dated after every encoded one onto the end of the columns."""
+    last_day = np.datetime64(encoded['start'], 'D').astype('int64') + sum(encoded['gaps'])
+    days = bars[DATE].to_numpy().astype('datetime64[D]').astype('int64')
+    encoded['gaps'] += np.diff(days, prepend=last_day).tolist()
+    if 'persian_date' in encoded:
+        encoded['persian_date'] += _encode_persian_dates(bars[PERSIAN_DATE], _total(encoded['persian_date']))
+    for name, column in OHLC.items():
+        encoded[name] += _encode_deltas(bars[column], previous=_total(encoded[name]))
+
+
+def _fold_bars(encoded: Dict[str, Any], daily: pd.DataFrame, period: str):
+    """Fold days newer than the last bar into it while they fall in its period, then start new bars."""
+    last_day = np.datetime64(encoded['start'], 'D') + sum(encoded['gaps'])
+    days = np.concatenate(([last_day], daily[DATE].to_numpy().astype('datetime64[D]')))
+    last_key, *keys = period_keys(pd.DataFrame({DATE: days.astype('datetime64[s]')}), period).tolist()
+    current = {name: _total(encoded[name]) for name in OHLC}
+    
+    for i, (key, day) in enumerate(zip(keys, days[1:])):
+        prices = {name: int(daily[column].iat[i]) for name, column in OHLC.items()}
+        if key == last_key:
+            prices['open'] = current['open']
+            prices['high'] = max(current['high'], prices['high'])
+            prices['low'] = min(current['low'], prices['low'])
+            for name, price in prices.items():
+                encoded[name][-1] += price - current[name]
+        else:
+            encoded['gaps'].append(int((day - last_day) // np.timedelta64(1, 'D')))
+            for name, price in prices.items():
+                encoded[name].append(price - current[name])
+            last_key, last_day = key, day
+        current = prices
+
+
+def _encode_series(name: str, values: np.ndarray) -> Dict[str, Any]:
+    """An indicator series without its leading and trailing gaps."""
+    decimals = _decimals(name)
+    present = np.flatnonzero(~np.isnan(values))
+    if not len(present):
+        return {'start': len(values), 'decimals': decimals, 'deltas': []}
+    kept = values[present[0]:present[-1] + 1]
+    return {'start': int(present[0]), 'decimals': decimals, 'deltas': _encode_deltas(kept, decimals)}
+
+
+def _decode_series(encoded: Dict[str, Any], length: int) -> np.ndarray:
+    values = np.full(length, np.nan)
+    start = encoded['start']
+    values[start:start + len(encoded['deltas'])] = _decode_deltas(encoded['deltas'], encoded['decimals'])
+    return values
+
+
+def _append_series(name: str, encoded: Dict[str, Any], rows: int, values: np.ndarray) -> Dict[str, Any]:
+    """Encode the values of the rows after the first `rows` onto the end of a series."""
+    if rows <= encoded['start']:
+        return _encode_series(name, np.concatenate((np.full(rows, np.nan), values)))
+    
+    deltas = encoded['deltas']
+    # Trailing gaps were dropped; put them back in front of the new values
+    deltas += [None] * (rows - encoded['start'] - len(deltas))
+    deltas += _encode_deltas(values, encoded['decimals'], previous=_total(deltas))
+    while deltas[-1] is None:
+        deltas.pop()
+    return encoded
+
+
+def build_artifact(df: pd.DataFrame, csv_signature: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Build the dashboard artifact from a whole dataset frame.
+    
+    Holds the daily bars, the ARTIFACT_BAR_PERIODS bars and the series of
+    compute_indicators but SKIPPED_SERIES, aligned with the daily bars.
+    None if empty.
+    """
+    if df.empty:
+        return None
+    
+    daily = _daily_frame(df)
+    indicators = compute_indicators(daily).drop(columns=[DATE, *SKIPPED_SERIES])
+    artifact = {
+        'version': ARTIFACT_VERSION,
+        'csv_signature': csv_signature,
+        'latest_date': daily[DATE].iloc[-1].strftime('%Y/%m/%d'),
+        'daily': _encode_bars(daily)
+    }
+    for period in ARTIFACT_BAR_PERIODS:
+        artifact[period] = _encode_bars(_bars(daily, period))
+    artifact['indicators'] = {name: _encode_series(name, indicators[name].to_numpy()) for name in indicators.columns}
+    return artifact
+
+
+def extend_artifact(artifact: Dict[str, Any], new_df: pd.DataFrame, state_values: pd.DataFrame,
+                    csv_signature: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Add rows newer than everything in `artifact` without recomputing the history.
+    
+    `state_values` holds what IndicatorState.advance_frame() returned for
+    the new rows and supplies the EMA, MACD and RSI values. The windowed
+    indicators of the new rows are computed over the last WINDOW_LOOKBACK
+    days only. The last weekly and monthly bars absorb the new days of
+    their period. The columns are delta-coded, so the new values are
+    appended to them and everything before stays as it is.
+    """
+    rows = len(artifact['daily']['close'])
+    new_daily = _daily_frame(new_df)
+    
+    for period in ARTIFACT_BAR_PERIODS:
+        _fold_bars(artifact[period], new_daily, period)
+    
+    context = _decode_bars(artifact['daily'], max(rows - WINDOW_LOOKBACK, 0))
+    windowed = compute_indicators(pd.concat([context, new_daily], ignore_index=True)).tail(len(new_daily))
+    _append_bars(artifact['daily'], new_daily)
+    
+    for name, encoded in artifact['indicators'].items():
+        values = _floats(state_values[name]) if name in state_values.columns else windowed[name].to_numpy()
+        artifact['indicators'][name] = _append_series(name, encoded, rows, values)
+    
+    artifact['latest_date'] = new_daily[DATE].iloc[-1].strftime('%Y/%m/%d')
+    artifact['csv_signature'] = csv_signature
+    return artifact
+
+
+def save_artifact(artifact: Dict[str, Any], path: str):
+    """Atomically write the artifact as compact JSON."""
+    # json.dumps encodes in C; json.dump to a file falls back to the pure Python encoder
+    text = json.dumps(artifact, separators=(',', ':'))
+    with atomic_write(path) as f:
+        f.write(text)
+
+
+def load_artifact(path: str) -> Optional[Dict[str, Any]]:
+    """Read a saved artifact; None if it is missing, unreadable or of another layout version."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            artifact = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return artifact if isinstance(artifact, dict) and artifact.get('version') == ARTIFACT_VERSION else None
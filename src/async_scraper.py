@@ -0,0 +1,292 @@
+"""Asyncio variant of the HTTP scraper for embedding in asyncio services."""
+
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+import aiohttp
+
+from .config import (
+    DEFAULT_INSTRUMENT, API_PAGE_SIZE, REQUEST_TIMEOUT, HTTP_POOL_SIZE,
+    MAX_RETRIES, RETRY_DELAY, BACKFILL_WORKERS, MAX_REQUESTS_PER_SECOND
+)
+from .utils import format_progress, AsyncRateLimiter
+from .http_scraper import ApiScraperBase, RETRY_STATUSES, default_headers
+from .models import PriceRow
+from .sync import DateIndex, compare_page, plan_gap_offsets
+
+
+class AsyncHttpScraper(ApiScraperBase):
+    """
+    HTTP scraper whose network waits run on an asyncio event loop.
+    
+    Pages are fetched with aiohttp, retried with jittered exponential
+    backoff, and journal and dataset writes run in worker threads, so
+    fetching, parsing and persisting different pages overlap. `run()` is a
+    coroutine and can be awaited from an existing asyncio service.
+    """
+    
+    def __init__(self, instrument: str = DEFAULT_INSTRUMENT, api_url: Optional[str] = None,
+                 page_size: int = API_PAGE_SIZE, session: Optional[aiohttp.ClientSession] = None,
+                 workers: int = BACKFILL_WORKERS, rate_limit: float = MAX_REQUESTS_PER_SECOND,
+                 max_retries: int = MAX_RETRIES, retry_delay: float = RETRY_DELAY):
+        super().__init__(instrument, api_url=api_url, page_size=page_size, workers=workers)
+        # Without a session passed in, one is opened inside the event loop by scrape_all_data()
+        self.session = session
+        self._owns_session = False
+        self.rate_limiter = AsyncRateLimiter(rate_limit)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+    
+    async def _open_session(self):
+        """Open a pooled aiohttp session unless one was passed in."""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers=default_headers(),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                connector=aiohttp.TCPConnector(limit=max(HTTP_POOL_SIZE, self.workers))
+            )
+            self._owns_session = True
+    
+    async def close(self):
+        """Close the session if this scraper opened it."""
+        if self._owns_session:
+            await self.session.close()
+            self.session = None
+            self._owns_session = False
+    
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter: half the delay is fixed, half random."""
+        delay = self.retry_delay * (2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    async def _fetch_page(self, start: int, length: int) -> Dict[str, Any]:
+        """Fetch one page of raw DataTables rows, retrying transient failures."""
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.wait()
+            started = time.perf_counter()
+            try:
+                async with self.session.get(
+                    self.api_url, params=self._page_params(start, length), headers={"Referer": self.base_url}
+                ) as response:
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUSES or attempt == self.max_retries:
+                    self.metrics.increment('fetch_errors')
+                    raise
+                error = f"HTTP {e.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    self.metrics.increment('fetch_errors')
+                    raise
+                error = repr(e)
+            finally:
+                self.metrics.observe('fetch_page', time.perf_counter() - started)
+            
+            self.metrics.increment('retries')
+            delay = self._backoff(attempt)
+            self.logger.warning(
+                f"Request for rows from {start} failed ({error}); "
+                f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+    
+    async def _fetch_rows(self, start: int, length: int) -> List[PriceRow]:
+        """Fetch and parse one page of rows."""
+        return self._parse_payload(await self._fetch_page(start, length))
+    
+    async def _backfill(self) -> List[PriceRow]:
+        """
+        Fetch the full history with at most `workers` requests in flight.
+        
+        Each page is journaled in a worker thread as soon as it arrives, while
+        the other requests continue; an interrupted backfill resumes with
+        only the missing pages.
+        """
+        first_page = await self._fetch_page(0, self.page_size)
+        total_records = int(first_page.get("recordsFiltered", first_page.get("recordsTotal", 0)))
+        offsets = list(range(0, total_records, self.page_size))
+        
+        pages = await asyncio.to_thread(self._start_journal, mode="full", total=total_records)
+        if pages:
+            self.logger.info(f"Resuming backfill: {len(pages)} pages already journaled")
+        
+        if 0 not in pages:
+            pages[0] = self._parse_payload(first_page)
+            await asyncio.to_thread(self._record_page, 0, pages[0])
+        
+        pending = [offset for offset in offsets if offset not in pages]
+        self.logger.info(
+            f"Backfilling {total_records} records in {len(offsets)} pages "
+            f"({len(pending)} to fetch) with {self.workers} concurrent requests"
+        )
+        
+        semaphore = asyncio.Semaphore(self.workers)
+        
+        async def fetch(offset: int) -> tuple:
+            async with semaphore:
+                page_data = await self._fetch_rows(offset, self.page_size)
+            await asyncio.to_thread(self._record_page, offset, page_data)
+            return offset, page_data
+        
+        failures = []
+        for next_page in asyncio.as_completed([fetch(offset) for offset in pending]):
+            try:
+                offset, page_data = await next_page
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Keep journaling the other pages so a rerun only fetches the failures
+                failures.append(e)
+                continue
+            pages[offset] = page_data
+            self.logger.info(format_progress(len(pages), len(offsets), self.start_time))
+        
+        if failures:
+            self.logger.error(f"{len(failures)} pages failed; rerun to resume from the journal")
+            raise failures[0]
+        
+        # Merge in offset order so rows stay newest first
+        return [row for offset in offsets for row in pages.get(offset, [])]
+    
+    async def _fill_gaps(self, date_index: DateIndex, scraped: List[PriceRow]) -> List[PriceRow]:
+        """Fetch the pages that cover suspicious holes in the stored dates, `workers` at a time."""
+        offsets = plan_gap_offsets(date_index, len(scraped), self.page_size)
+        if not offsets:
+            return []
+        
+        self.logger.info(f"Checking {len(offsets)} pages that cover gaps in the stored dates")
+        semaphore = asyncio.Semaphore(self.workers)
+        
+        async def fetch(offset: int) -> List[PriceRow]:
+            async with semaphore:
+                return await self._fetch_rows(offset, self.page_size)
+        
+        found = []
+        seen_days = {row.day for row in scraped}
+        for page_data in await asyncio.gather(*(fetch(offset) for offset in offsets)):
+            comparison = compare_page(date_index, page_data)
+            self._note_revisions(comparison['changed'])
+            for row in comparison['new']:
+                if row.day not in seen_days:
+                    seen_days.add(row.day)
+                    found.append(row)
+        
+        self.logger.info(f"Recovered {len(found)} missing records from gap pages")
+        return found
+    
+    async def _update(self, fill_gaps: bool = False) -> List[PriceRow]:
+        """Fetch pages newest first until they reach the stored data, then optionally the gap pages."""
+        date_index = await asyncio.to_thread(self.data_manager.get_date_index)
+        summary = await asyncio.to_thread(self.data_manager.get_data_summary)
+        self.logger.info(f"Existing data summary: {summary}")
+        if not len(date_index):
+            date_index = None
+        
+        scraped = []
+        journal_writes = []
+        journaled_pages = {}
+        start = 0
+        total_records = None
+        
+        while total_records is None or start < total_records:
+            if start in journaled_pages:
+                page_data = journaled_pages[start]
+                self.logger.info(f"Using journaled rows {start + 1} to {start + self.page_size}")
+            else:
+                self.logger.info(f"Fetching rows {start + 1} to {start + self.page_size} from {self.api_url}")
+                payload = await self._fetch_page(start, self.page_size)
+                
+                if total_records is None:
+                    total_records = int(payload.get("recordsFiltered", payload.get("recordsTotal", 0)))
+                    journaled_pages = await asyncio.to_thread(
+                        self._start_journal, mode="incremental", total=total_records
+                    )
+                
+                page_data = self._parse_payload(payload)
+                # Journal in the background while the page is compared and the next one fetched
+                journal_writes.append(asyncio.create_task(
+                    asyncio.to_thread(self._record_page, start, page_data)
+                ))
+            
+            if not page_data:
+                self.logger.warning("No data returned for this page. Stopping.")
+                break
+            
+            start += self.page_size
+            
+            if date_index is None:
+                scraped.extend(page_data)
+                continue
+            
+            comparison = compare_page(date_index, page_data)
+            scraped.extend(comparison['new'])
+            self._note_revisions(comparison['changed'])
+            
+            if comparison['reached_stored']:
+                self.logger.info(f"Reached existing data. Added {len(comparison['new'])} new records from this page")
+                break
+        
+        await asyncio.gather(*journal_writes)
+        if fill_gaps and date_index is not None:
+            scraped.extend(await self._fill_gaps(date_index, scraped))
+        return scraped
+    
+    async def scrape_all_data(self, incremental: bool = True, fill_gaps: bool = False) -> bool:
+        """
+        Scrape historical data from the API.
+        
+        Args:
+            incremental: If True, only scrape new data since last run
+            fill_gaps: If True (incremental only), also re-check pages that
+                cover holes of more than SYNC_MAX_GAP_DAYS in the stored dates
+        """
+        self.start_time = datetime.now()
+        self.scraped_data = []
+        self.revised_data = []
+        await self._open_session()
+        
+        try:
+            self.logger.info(f"Starting {self.instrument_name} scraper (asyncio backend)...")
+            
+            if incremental:
+                self.scraped_data = await self._update(fill_gaps)
+            else:
+                self.scraped_data = await self._backfill()
+            
+            self.logger.info(f"\nScraping completed! Total records scraped: {len(self.scraped_data)}")
+            
+            return await asyncio.to_thread(self._save_scraped_data, incremental)
+        
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self.logger.error(f"Asyncio backend failed: {e}")
+            return False
+        finally:
+            await self.close()
+    
+    async def run(self, fill_gaps: bool = False) -> bool:
+        """Main entry point; await it from a running event loop. `fill_gaps` as for scrape_all_data()."""
+        try:
+            # Lock files block, so wait for them in a worker thread
+            await asyncio.to_thread(self.data_manager.lock.acquire)
+        except TimeoutError as e:
+            self.logger.error(f"Another run is still updating the dataset: {e}")
+            return False
+        
+        try:
+            with self.metrics.time('run'):
+                existing_summary = await asyncio.to_thread(self.data_manager.get_data_summary)
+                
+                if existing_summary['total_records'] > 0:
+                    self.logger.info("Existing data found. Running incremental update...")
+                    return await self.scrape_all_data(incremental=True, fill_gaps=fill_gaps)
+                else:
+                    self.logger.info("No existing data found. Starting full scrape...")
+                    return await self.scrape_all_data(incremental=False)
+        
+        except Exception as e:
+            self.logger.error(f"Error in main run: {e}")
+            return False
+        finally:
+            self.data_manager.lock.release()
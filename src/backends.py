@@ -0,0 +1,24 @@
+"""Registry of interchangeable scraper backends."""
+
+import importlib
+from typing import Optional
+
+from .config import SCRAPER_BACKEND
+
+
+# Backend name -> (module, class); the module is imported when a scraper is created
+SCRAPER_BACKENDS = {
+    "http": (".http_scraper", "HttpScraper"),
+    "selenium": (".scraper", "DollarScraper"),
+}
+
+
+def create_scraper(backend: Optional[str] = None, **kwargs) -> 'DollarScraper':
+    """Create a scraper for the given backend name (defaults to SCRAPER_BACKEND)."""
+    backend = backend or SCRAPER_BACKEND
+    
+    if backend not in SCRAPER_BACKENDS:
+        raise ValueError(f"Unknown scraper backend: {backend}. Choose from {sorted(SCRAPER_BACKENDS)}")
+    
+    module, name = SCRAPER_BACKENDS[backend]
+    return getattr(importlib.import_module(module, __package__), name)(**kwargs)
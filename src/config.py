@@ -1,7 +1,28 @@
 """Configuration settings for the dollar scraper."""
 
-# Target URL
-BASE_URL = "https://www.tgju.org/profile/price_dollar_rl/history"
+# Target URLs, filled in with an instrument's TGJU profile slug
+PROFILE_URL_TEMPLATE = "https://www.tgju.org/profile/{slug}/history"
+API_URL_TEMPLATE = "https://api.tgju.org/v1/market/indicator/summary-table-data/{slug}"  # DataTables JSON source of the history table
+
+# Instrument registry: TGJU profile slug -> display name and output dataset
+INSTRUMENTS = {
+    "price_dollar_rl": {"name": "USD/IRR", "csv_filename": "Dollar_Rial_Price_Dataset.csv"},
+    "price_eur": {"name": "EUR/IRR", "csv_filename": "Euro_Rial_Price_Dataset.csv"},
+    "price_aed": {"name": "AED/IRR", "csv_filename": "Dirham_Rial_Price_Dataset.csv"},
+    "price_gbp": {"name": "GBP/IRR", "csv_filename": "Pound_Rial_Price_Dataset.csv"},
+    "price_try": {"name": "TRY/IRR", "csv_filename": "Lira_Rial_Price_Dataset.csv"},
+    "sekee": {"name": "Emami Gold Coin", "csv_filename": "Gold_Coin_Rial_Price_Dataset.csv"},
+    "geram18": {"name": "18K Gold (gram)", "csv_filename": "Gold_18K_Rial_Price_Dataset.csv"},
+}
+DEFAULT_INSTRUMENT = "price_dollar_rl"
+INSTRUMENT_WORKERS = 3  # Instruments scraped concurrently in one process (HTTP backend)
+
+# Default instrument URLs
+BASE_URL = PROFILE_URL_TEMPLATE.format(slug=DEFAULT_INSTRUMENT)
+API_URL = API_URL_TEMPLATE.format(slug=DEFAULT_INSTRUMENT)
+
+# Scraper backend: "http" reads API_URL directly, "selenium" drives headless Chrome
+SCRAPER_BACKEND = "http"
 
 # Chrome driver settings
 CHROME_OPTIONS = [
@@ -12,20 +33,52 @@ CHROME_OPTIONS = [
     "--window-size=1920,1080",
     "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 ]
+CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"]  # Probed for the version
+DRIVER_MANIFEST_PATH = "~/.cache/tgju-scraper/chromedriver.json"  # Resolved ChromeDriver paths keyed by Chrome version
+DRIVER_POOL_SIZE = 2  # Warm Chrome instances a DriverPool keeps for reuse
+DRIVER_BORROW_TIMEOUT = 300  # seconds to wait for a free pooled driver
 
 # Scraping settings
 DEFAULT_PAGE_SIZE = 30  # Default number of rows per page
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
 
+# Page navigation waits (Selenium backend)
+PAGE_LOAD_TIMEOUT = 30  # Upper bound in seconds for a table redraw
+MIN_PAGE_TIMEOUT = 5  # Lower bound for the adaptive redraw timeout
+PAGE_TIMEOUT_FACTOR = 4  # Adaptive timeout = factor x recent average redraw time
+PAGE_DELAY = 0  # Optional politeness delay between pages, in seconds
+
+# Incremental sync settings
+SYNC_MAX_GAP_DAYS = 6  # Longer holes between stored days are re-checked for missing rows
+UPDATE_CHECK_RECORDS = 10  # Newest site rows `main.py update --check` compares before falling back to a full sync
+
+# HTTP backend settings
+API_PAGE_SIZE = 1000  # Rows requested per API call
+REQUEST_TIMEOUT = 30  # seconds
+HTTP_POOL_SIZE = 10  # Pooled connections per host
+
+# Parallel backfill settings
+BACKFILL_WORKERS = 4  # Concurrent page fetches during a full scrape
+MAX_REQUESTS_PER_SECOND = 5.0  # Global rate limit shared by all workers
+
+# Streaming pipeline settings
+STREAM_FULL_SCRAPES = True  # Stream full HTTP scrapes to disk instead of holding every row in memory
+PIPELINE_QUEUE_SIZE = 4  # Pages buffered between two stages before the earlier one blocks
+PIPELINE_BATCH_SIZE = 1000  # Rows per flush to the dataset
+
 # Data settings
-CSV_FILENAME = "Dollar_Rial_Price_Dataset.csv"
+CSV_FILENAME = INSTRUMENTS[DEFAULT_INSTRUMENT]["csv_filename"]
 DATA_DIR = "data"
+COLUMNAR_COMPRESSION = "zstd"  # Compression of the typed .feather copy next to the CSV
+FILE_LOCK_TIMEOUT = 300  # seconds to wait for another run to release the dataset
 
 # Table selectors
+DATATABLE_SELECTOR = "#DataTables_Table_0"  # The history table itself, for the DataTables page API
 TABLE_SELECTOR = "#DataTables_Table_0 tbody tr"
 NEXT_BUTTON_SELECTOR = "#DataTables_Table_0_next"
 PAGINATION_INFO_SELECTOR = "#DataTables_Table_0_info"
+PROCESSING_SELECTOR = "#DataTables_Table_0_processing"
 
 # Column mapping (English headers only)
 COLUMN_MAPPING = {
@@ -38,3 +91,47 @@ COLUMN_MAPPING = {
     "gregorian_date": "Gregorian Date",
     "persian_date": "Persian Date"
 }
+
+# Columns derived from consecutive close prices, stored in the columnar copy only
+DERIVED_COLUMNS = {
+    "net_change": "Net Change",
+    "net_change_percent": "Net Change Percent",
+    "change_mismatch": "Change Mismatch"
+}
+CHANGE_PERCENT_TOLERANCE = 0.01  # Percentage points the site's rounded percent may differ by
+
+# Technical indicators (the parameters the dashboard in docs/script.js uses)
+RSI_PERIOD = 14
+STOCHASTIC_PERIODS = (14, 3)  # %K lookback, %D smoothing
+MOMENTUM_PERIOD = 10
+MACD_PERIODS = (12, 26, 9)  # Fast EMA, slow EMA, signal EMA
+EMA_PERIODS = (12, 26, 50)
+ICHIMOKU_PERIODS = (9, 26, 52)  # Conversion line, base line (also the span shift), leading span B
+
+# Dashboard artifact (compact JSON the dashboard loads instead of parsing the CSV and computing indicators)
+ARTIFACT_VERSION = 3  # Bump when the layout changes; docs/script.js checks it
+ARTIFACT_DECIMALS = 1  # Decimals kept for oscillator values (RSI, Stochastic, Momentum)
+ARTIFACT_PRICE_DECIMALS = -1  # Price-level lines are rounded to tens of rials, well below a pixel on the chart
+ARTIFACT_BAR_PERIODS = ("weekly", "monthly")  # ROLLUP_PERIODS included as downsampled bars
+
+# OHLC rollups (materialized next to the dataset and extended on append)
+ROLLUP_PERIODS = ("weekly", "monthly", "persian_month", "persian_year")
+WEEK_END = "FRI"  # Weeks run Saturday to Friday, as in Iran
+
+# Row index (byte offsets of the CSV rows sorted by date, for seek-based range reads)
+ROW_INDEX_VERSION = 1  # Bump when the layout changes
+
+# Run metrics (per-stage timers and counters, written by main.py at the end of every run)
+METRICS_DIR = "metrics"
+METRICS_REPORT_FILENAME = "run_report.json"
+METRICS_TEXTFILE_FILENAME = "tgju_scraper.prom"  # For the node_exporter textfile collector
+METRICS_PREFIX = "tgju_scraper"
+
+# Profiling (opt-in from main.py with --profile / --trace-memory)
+PROFILE_DIR = "profiles"
+PROFILE_SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+PROFILE_TOP_N = 25  # Functions and allocation sites listed in the text reports
+PROFILE_STATS_FILENAME = "run.pstats"
+PROFILE_REPORT_FILENAME = "run.txt"
+PROFILE_STACKS_FILENAME = "run.collapsed"  # For flamegraph.pl, speedscope or inferno
+PROFILE_MEMORY_FILENAME = "memory.txt"
@@ -1,22 +1,119 @@
 """Data management module for handling CSV operations and data persistence."""
 
+import csv
+import hashlib
 import os
+import shutil
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 import logging
 
-from .config import CSV_FILENAME, DATA_DIR, COLUMN_MAPPING
-from .utils import setup_logging
+from .config import (
+    CSV_FILENAME, DATA_DIR, COLUMN_MAPPING, DERIVED_COLUMNS, CHANGE_PERCENT_TOLERANCE,
+    FILE_LOCK_TIMEOUT, COLUMNAR_COMPRESSION, SYNC_MAX_GAP_DAYS
+)
+from .utils import setup_logging, DATE_PATTERN
+from .storage import atomic_write, FileLock, ScrapeJournal, StagedFile
+from .models import PriceRow, rows_to_frame, date_to_ordinal, dates_to_ordinals, ordinal_to_date
+from .sync import DateIndex
+from .indicators import IndicatorState
+from .artifacts import build_artifact, extend_artifact, load_artifact, save_artifact
+from .rollups import Rollups
+from .row_index import RowIndex
+from .metrics import Metrics, REGISTRY
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # The columnar copy is optional
+    pa = None
+
+
+PRICE_COLUMNS = [
+    COLUMN_MAPPING["open_price"], COLUMN_MAPPING["low_price"],
+    COLUMN_MAPPING["high_price"], COLUMN_MAPPING["close_price"]
+]
+
+
+def add_derived_columns(typed: pd.DataFrame, previous_close: Optional[int] = None) -> pd.DataFrame:
+    """
+    Add signed change columns computed from consecutive close prices.
+    
+    Rows are newest first, so each row's previous close is the next row's;
+    `previous_close` is the close of the day before the last row, when those
+    rows are stored elsewhere. TGJU divides by the lower of the two closes
+    and shows both values unsigned, so the stored text is cross-checked
+    against the absolute values and disagreements are flagged. The site
+    compares with its own previous day, so a row whose previous day is
+    missing from the data is flagged too.
+    """
+    close = typed[COLUMN_MAPPING["close_price"]]
+    previous = close.shift(-1)
+    if previous_close is not None and len(previous):
+        previous.iloc[-1] = previous_close
+    
+    net_change = close - previous
+    base = pd.concat([close, previous], axis=1).min(axis=1, skipna=False)
+    net_percent = (net_change / base * 100).astype('float64')
+    
+    scraped_amount = typed[COLUMN_MAPPING["change_amount"]]
+    scraped_percent = typed[COLUMN_MAPPING["change_percent"]]
+    amount_differs = scraped_amount.notna() & net_change.notna() & (scraped_amount != net_change.abs())
+    percent_differs = (scraped_percent - net_percent.abs()).abs() > CHANGE_PERCENT_TOLERANCE
+    
+    typed[DERIVED_COLUMNS["net_change"]] = net_change.astype('Int64')
+    typed[DERIVED_COLUMNS["net_change_percent"]] = net_percent
+    typed[DERIVED_COLUMNS["change_mismatch"]] = (amount_differs | percent_differs).fillna(False).astype(bool)
+    return typed
+
+
+def to_typed_frame(df: pd.DataFrame, previous_close: Optional[int] = None) -> pd.DataFrame:
+    """
+    Convert dataset rows to typed columns: int64 prices, float change percent, datetime64 dates.
+    
+    The derived columns of add_derived_columns are added at the end.
+    """
+    if df.empty:
+        return df
+    
+    typed = pd.DataFrame({column: pd.to_numeric(df[column], errors='coerce').astype('Int64') for column in PRICE_COLUMNS})
+    change_amount = df[COLUMN_MAPPING["change_amount"]].astype(str).str.replace(',', '', regex=False)
+    change_percent = df[COLUMN_MAPPING["change_percent"]].astype(str).str.rstrip('%')
+    typed[COLUMN_MAPPING["change_amount"]] = pd.to_numeric(change_amount, errors='coerce').astype('Int64')
+    typed[COLUMN_MAPPING["change_percent"]] = pd.to_numeric(change_percent, errors='coerce').astype('float64')
+    typed[COLUMN_MAPPING["gregorian_date"]] = pd.to_datetime(
+        df[COLUMN_MAPPING["gregorian_date"]], format='%Y/%m/%d', errors='coerce'
+    )
+    typed[COLUMN_MAPPING["persian_date"]] = df[COLUMN_MAPPING["persian_date"]].astype(str)
+    return add_derived_columns(typed, previous_close)
 
 
 class DataManager:
     """Handles data persistence and CSV operations."""
     
-    def __init__(self):
+    def __init__(self, csv_filename: str = CSV_FILENAME, metrics: Optional[Metrics] = None, read_only: bool = False):
         self.logger = setup_logging()
-        self.csv_path = os.path.join(DATA_DIR, CSV_FILENAME)
-        self._ensure_data_directory()
+        # A scraper passes its own, so its report covers the dataset writes too
+        self.metrics = metrics or REGISTRY.get(dataset=csv_filename)
+        self.csv_path = os.path.join(DATA_DIR, csv_filename)
+        self.columnar_path = f"{os.path.splitext(self.csv_path)[0]}.feather"
+        self.indicator_state_path = f"{os.path.splitext(self.csv_path)[0]}.indicators.json"
+        self.artifact_path = f"{os.path.splitext(self.csv_path)[0]}.dashboard.json"
+        self.rollup_path = f"{os.path.splitext(self.csv_path)[0]}.rollups.json"
+        self.row_index_path = f"{os.path.splitext(self.csv_path)[0]}.index"
+        self._rollups = None
+        self._row_index = None
+        self.read_count = 0
+        self.lock = FileLock.shared(f"{self.csv_path}.lock", timeout=FILE_LOCK_TIMEOUT)
+        self.journal = ScrapeJournal(f"{self.csv_path}.journal")
+        self.staging = StagedFile(f"{self.csv_path}.partial")
+        # Read-only managers never write next to the dataset: derived state that is
+        # missing or out of date is built in memory instead of being rebuilt on disk
+        self.read_only = read_only
+        self._invalidate_cache()
+        if not read_only:
+            self._ensure_data_directory()
     
     def _ensure_data_directory(self):
         """Ensure the data directory exists."""
@@ -24,41 +121,85 @@ class DataManager:
             os.makedirs(DATA_DIR)
             self.logger.info(f"Created data directory: {DATA_DIR}")
     
-    def load_existing_data(self) -> pd.DataFrame:
-        """Load existing CSV data if it exists."""
-        if os.path.exists(self.csv_path):
-            try:
-                df = pd.read_csv(self.csv_path)
-                self.logger.info(f"Loaded existing data: {len(df)} records from {self.csv_path}")
-                return df
-            except Exception as e:
-                self.logger.error(f"Error loading existing data: {e}")
-                return pd.DataFrame()
-        else:
-            self.logger.info("No existing data file found. Starting fresh.")
-            return pd.DataFrame()
+    def _invalidate_cache(self):
+        """Forget the cached dataset so the next access re-reads the CSV."""
+        self._cache_df = None
+        self._cache_dates = None
+        self._cache_bounds = (None, None)
+        self._cache_index = None
+        self._cache_signature = None
     
-    def get_latest_date(self) -> Optional[str]:
-        """Get the latest date from existing data."""
-        df = self.load_existing_data()
-        if df.empty or 'Gregorian Date' not in df.columns:
+    def _file_signature(self) -> Optional[tuple]:
+        """Return (mtime, size) of the CSV file, or None if it does not exist."""
+        try:
+            stat = os.stat(self.csv_path)
+        except OSError:
             return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _set_cache(self, df: pd.DataFrame):
+        """Cache a frame that matches the file currently on disk."""
+        self._cache_df = df
+        self._cache_dates = None
+        self._cache_bounds = (None, None)
+        self._cache_index = None
+        if not df.empty and 'Gregorian Date' in df.columns:
+            self._cache_dates = pd.to_datetime(df['Gregorian Date'], format='%Y/%m/%d', errors='coerce')
+            # Dates are zero-padded YYYY/MM/DD, so string order is date order
+            stored_dates = df['Gregorian Date'].dropna().astype(str)
+            if not stored_dates.empty:
+                self._cache_bounds = (stored_dates.min(), stored_dates.max())
+        self._cache_signature = self._file_signature()
+    
+    def _load_cached(self) -> pd.DataFrame:
+        """
+        Return the dataset, reading the CSV only if it changed since the last read.
+        
+        The returned frame is shared with the cache and must not be modified.
+        """
+        signature = self._file_signature()
+        
+        if signature is None:
+            self.logger.info("No existing data file found. Starting fresh.")
+            self._invalidate_cache()
+            return pd.DataFrame()
+        
+        if self._cache_df is not None and signature == self._cache_signature:
+            return self._cache_df
         
         try:
-            # Convert to datetime for proper sorting
-            df['date_parsed'] = pd.to_datetime(df['Gregorian Date'])
-            latest_date = df['date_parsed'].max()
-            return latest_date.strftime('%Y/%m/%d')
+            with self.metrics.time('load_csv'):
+                df = pd.read_csv(self.csv_path)
+            self.read_count += 1
+            self._set_cache(df)
+            self.logger.info(f"Loaded existing data: {len(df)} records from {self.csv_path}")
+            return df
         except Exception as e:
-            self.logger.error(f"Error getting latest date: {e}")
-            return None
+            self.logger.error(f"Error loading existing data: {e}")
+            self._invalidate_cache()
+            return pd.DataFrame()
+    
+    def load_existing_data(self) -> pd.DataFrame:
+        """Load existing CSV data if it exists."""
+        return self._load_cached().copy()
     
-    def save_data(self, data: List[Dict[str, Any]], mode: str = 'w') -> bool:
+    def get_date_index(self) -> DateIndex:
+        """Sorted index of the stored dates, built once per loaded dataset."""
+        df = self._load_cached()
+        if self._cache_index is None or df is not self._cache_df:
+            self._cache_index = DateIndex.from_frame(df)
+        return self._cache_index
+    
+    def get_latest_date(self) -> Optional[str]:
+        """Get the latest date from existing data, reading only the top of the CSV unless it is loaded."""
+        return self._read_stored_header_and_latest()[1]
+    
+    def save_data(self, data: List[Union[PriceRow, Dict[str, Any]]], mode: str = 'w') -> bool:
         """
         Save data to CSV file.
         
         Args:
-            data: List of dictionaries containing row data
+            data: List of rows (PriceRow objects or dictionaries)
             mode: 'w' for overwrite, 'a' for append
         """
         if not data:
@@ -66,39 +207,169 @@ class DataManager:
             return False
         
         try:
-            # Create DataFrame
-            df = pd.DataFrame(data)
-            
-            # Reorder columns according to mapping
-            column_order = list(COLUMN_MAPPING.values())
-            df = df.reindex(columns=column_order)
-            
-            # Save to CSV
-            if mode == 'a' and os.path.exists(self.csv_path):
-                df.to_csv(self.csv_path, mode='a', header=False, index=False, encoding='utf-8')
-            else:
-                df.to_csv(self.csv_path, mode='w', header=True, index=False, encoding='utf-8')
-            
-            self.logger.info(f"Successfully saved {len(data)} records to {self.csv_path}")
-            return True
-            
+            with self.metrics.time('save_data'):
+                success = self._write_frame(rows_to_frame(data), mode)
+            self.metrics.increment('rows_saved', len(data))
+            return success
         except Exception as e:
             self.logger.error(f"Error saving data: {e}")
             return False
     
-    def append_new_data(self, new_data: List[Dict[str, Any]]) -> bool:
-        """Append new data to existing CSV, avoiding duplicates."""
+    def _write_frame(self, df: pd.DataFrame, mode: str = 'w') -> bool:
+        """Write a frame in CSV column order to the dataset files."""
+        # Reorder columns according to mapping
+        column_order = list(COLUMN_MAPPING.values())
+        df = df.reindex(columns=column_order)
+        
+        # Save to CSV
+        with self.lock:
+            if mode == 'a' and os.path.exists(self.csv_path):
+                # Appending in place could leave half a row behind; copy the file and replace it instead
+                lines = df.to_csv(header=False, index=False).encode('utf-8')
+                with open(self.csv_path, 'rb') as source, atomic_write(self.csv_path, 'wb') as target:
+                    shutil.copyfileobj(source, target, 1024 * 1024)
+                    target.write(lines)
+                self._invalidate_cache()
+            else:
+                with atomic_write(self.csv_path) as f:
+                    df.to_csv(f, header=True, index=False)
+                self._set_cache(df)
+            self._write_columnar()
+            self._rebuild_indicator_state()
+            self._rebuild_artifact()
+            self._rebuild_rollups()
+            self._rebuild_row_index()
+        
+        self.logger.info(f"Successfully saved {len(df)} records to {self.csv_path}")
+        return True
+    
+    def _cache_is_current(self) -> bool:
+        """Check whether the cached frame still matches the file on disk."""
+        return self._cache_df is not None and self._file_signature() == self._cache_signature
+    
+    def _read_stored_header_and_latest(self) -> tuple:
+        """
+        Return the CSV header and the newest stored date.
+        
+        The file is kept newest first, so only the first data row is read.
+        """
+        try:
+            with open(self.csv_path, encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                first_row = next(reader, None)
+        except OSError:
+            return None, None
+        
+        if not header or 'Gregorian Date' not in header:
+            return header, None
+        if self._cache_is_current():
+            return header, self._cache_bounds[1]
+        if not first_row:
+            return header, None
+        return header, first_row[header.index('Gregorian Date')]
+    
+    def _prepend_to_cache(self, new_df: pd.DataFrame):
+        """Update the cached frame in place after rows were spliced onto the top of the file."""
+        new_dates = pd.to_datetime(new_df['Gregorian Date'], format='%Y/%m/%d', errors='coerce')
+        self._cache_df = pd.concat([new_df, self._cache_df], ignore_index=True)
+        self._cache_dates = pd.concat([new_dates, self._cache_dates], ignore_index=True)
+        self._cache_index = None
+        self._cache_bounds = (
+            self._cache_bounds[0] or new_df['Gregorian Date'].min(),
+            new_df['Gregorian Date'].max()
+        )
+        self._cache_signature = self._file_signature()
+    
+    def _splice_newest(self, new_df: pd.DataFrame, previous_latest: Optional[str] = None) -> bool:
+        """
+        Insert rows that are newer than everything stored at the top of the CSV.
+        
+        Existing rows are copied byte for byte rather than parsed and
+        re-serialized, and the result replaces the old file atomically.
+        `previous_latest` is the newest date stored before the splice.
+        """
+        new_df = new_df.reindex(columns=list(COLUMN_MAPPING.values()))
+        cache_was_current = self._cache_is_current()
+        previous_signature = self._content_signature()
+        
+        lines = new_df.to_csv(header=False, index=False).encode('utf-8')
+        with open(self.csv_path, 'rb') as source, atomic_write(self.csv_path, 'wb') as target:
+            target.write(source.readline())
+            target.write(lines)
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        
+        if cache_was_current:
+            self._prepend_to_cache(new_df)
+        else:
+            self._invalidate_cache()
+        self._write_columnar(new_df, previous_signature)
+        state_values = self._advance_indicator_state(new_df, previous_latest)
+        self._extend_artifact(new_df, previous_signature, state_values)
+        self._extend_rollups(new_df, previous_signature)
+        self._extend_row_index(new_df, lines, previous_signature)
+        
+        self.metrics.increment('rows_added', len(new_df))
+        self.logger.info(f"Successfully added {len(new_df)} new records")
+        return True
+    
+    def append_new_data(self, new_data: List[Union[PriceRow, Dict[str, Any]]]) -> bool:
+        """
+        Add new rows to the CSV, avoiding duplicates.
+        
+        Rows newer than the latest stored date are spliced onto the top of
+        the file without touching the rest of it. The whole dataset is only
+        re-sorted and rewritten when rows arrive out of order.
+        """
         if not new_data:
             return True
         
-        existing_df = self.load_existing_data()
+        with self.lock, self.metrics.time('append_new_data'):
+            return self._append_locked(new_data)
+    
+    def _append_locked(self, new_data: List[Union[PriceRow, Dict[str, Any]]]) -> bool:
+        """Body of append_new_data; the caller holds the dataset lock."""
+        if self._file_signature() is None:
+            return self.save_data(new_data, mode='w')
+        
+        try:
+            header, latest_date = self._read_stored_header_and_latest()
+            
+            if header == list(COLUMN_MAPPING.values()) and latest_date:
+                new_df = rows_to_frame(new_data).drop_duplicates(subset=['Gregorian Date'])
+                is_newer = new_df['Gregorian Date'] > latest_date
+                older_df = new_df[~is_newer]
+                
+                if not older_df.empty:
+                    existing_df = self._load_cached()
+                    older_df = older_df[~older_df['Gregorian Date'].isin(existing_df['Gregorian Date'])]
+                
+                if older_df.empty:
+                    newer_df = new_df[is_newer]
+                    if newer_df.empty:
+                        self.logger.info("No new data to add (all records already exist)")
+                        return True
+                    
+                    # Dates are zero-padded YYYY/MM/DD, so string order is date order
+                    return self._splice_newest(newer_df.sort_values('Gregorian Date', ascending=False), latest_date)
+                
+                self.logger.info(f"{len(older_df)} rows are older than {latest_date}. Rewriting the full dataset.")
+        except Exception as e:
+            self.logger.error(f"Error appending new data: {e}")
+            return False
+        
+        return self._merge_and_rewrite(new_data)
+    
+    def _merge_and_rewrite(self, new_data: List[Union[PriceRow, Dict[str, Any]]]) -> bool:
+        """Merge new rows into the full dataset, re-sort it and rewrite the CSV."""
+        existing_df = self._load_cached()
         
         if existing_df.empty:
             return self.save_data(new_data, mode='w')
         
         try:
             # Create DataFrame from new data
-            new_df = pd.DataFrame(new_data)
+            new_df = rows_to_frame(new_data)
             
             # Check for duplicates based on Gregorian Date
             if 'Gregorian Date' in existing_df.columns and 'Gregorian Date' in new_df.columns:
@@ -111,52 +382,622 @@ class DataManager:
             
             # Combine and sort by date (newest first)
             combined_df = pd.concat([new_df, existing_df], ignore_index=True)
-            combined_df['date_parsed'] = pd.to_datetime(combined_df['Gregorian Date'])
-            combined_df = combined_df.sort_values('date_parsed', ascending=False)
-            combined_df = combined_df.drop('date_parsed', axis=1)
+            # Dates are zero-padded YYYY/MM/DD, so string order is date order
+            combined_df = combined_df.sort_values('Gregorian Date', ascending=False, kind='stable')
             
             # Remove actual duplicates
             combined_df = combined_df.drop_duplicates(subset=['Gregorian Date'])
             
             # Save the combined data
-            combined_data = combined_df.to_dict('records')
-            success = self.save_data(combined_data, mode='w')
+            success = self._write_frame(combined_df, mode='w')
             
             if success:
+                self.metrics.increment('rows_added', len(new_df))
                 self.logger.info(f"Successfully added {len(new_df)} new records")
             
             return success
-            
+        
         except Exception as e:
             self.logger.error(f"Error appending new data: {e}")
             return False
     
-    def get_data_summary(self) -> Dict[str, Any]:
-        """Get summary information about the current dataset."""
-        df = self.load_existing_data()
+    def replace_rows(self, revised_data: List[Union[PriceRow, Dict[str, Any]]]) -> bool:
+        """
+        Overwrite stored rows with revised values from the site, matched by Gregorian date.
         
-        if df.empty:
-            return {
-                'total_records': 0,
-                'date_range': None,
-                'latest_date': None,
-                'oldest_date': None
-            }
+        Rows whose dates are not stored are ignored; append_new_data adds
+        those. The dataset is rewritten and its derived files rebuilt.
+        """
+        if not revised_data:
+            return True
+        
+        with self.lock, self.metrics.time('replace_rows'):
+            try:
+                existing_df = self._load_cached()
+                revised_df = rows_to_frame(revised_data).drop_duplicates(subset=['Gregorian Date'], keep='last')
+                revised_df = revised_df[revised_df['Gregorian Date'].isin(existing_df['Gregorian Date'])]
+                if revised_df.empty:
+                    self.logger.info("No stored rows to replace")
+                    return True
+                
+                kept_df = existing_df[~existing_df['Gregorian Date'].isin(revised_df['Gregorian Date'])]
+                combined_df = pd.concat([revised_df, kept_df], ignore_index=True)
+                # Dates are zero-padded YYYY/MM/DD, so string order is date order
+                combined_df = combined_df.sort_values('Gregorian Date', ascending=False, kind='stable')
+                
+                success = self._write_frame(combined_df, mode='w')
+                if success:
+                    self.metrics.increment('rows_replaced', len(revised_df))
+                    self.logger.info(f"Replaced {len(revised_df)} revised records")
+                return success
+            
+            except Exception as e:
+                self.logger.error(f"Error replacing revised rows: {e}")
+                return False
+    
+    def start_staging(self, **identity) -> int:
+        """
+        Begin or resume a streamed full scrape into the staging file.
+        
+        Returns the site offset to continue from (0 for a fresh scrape).
+        """
+        return self.staging.start(rows_to_frame([]).to_csv(index=False), **identity)
+    
+    def stage_rows(self, rows: List[Union[PriceRow, Dict[str, Any]]], next_offset: int):
+        """Durably append rows to the staging file and checkpoint the next site offset."""
+        self.staging.append(rows_to_frame(rows).to_csv(header=False, index=False), next_offset)
+    
+    def commit_staged(self) -> bool:
+        """
+        Replace the dataset with the completed staging file.
+        
+        The columnar copy is built from the staged rows chunk by chunk before
+        the rename, so committing a large scrape never loads it whole.
+        """
+        try:
+            with self.lock:
+                self._dedupe_staged()
+                self._write_columnar_chunked(self.staging.path)
+                self.staging.commit(self.csv_path)
+                self._invalidate_cache()
+                self._discard_derived_state()
+        except Exception as e:
+            self.logger.error(f"Error committing staged data: {e}")
+            return False
+        
+        self.logger.info(f"Successfully saved staged records to {self.csv_path}")
+        return True
+    
+    def _dedupe_staged(self) -> int:
+        """
+        Drop staged rows whose date was already staged, keeping the first copy.
+        
+        A day added on the site mid-scrape shifts the listing down, so the
+        last row of one page comes back at the top of the next. The file is
+        only rewritten when there are duplicates; returns how many were dropped.
+        """
+        with open(self.staging.path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            date_column = next(reader).index(COLUMN_MAPPING["gregorian_date"])
+            seen = set()
+            duplicates = set()
+            for line, row in enumerate(reader, start=1):
+                if row[date_column] in seen:
+                    duplicates.add(line)
+                else:
+                    seen.add(row[date_column])
+        
+        if duplicates:
+            with open(self.staging.path, newline='', encoding='utf-8') as source, \
+                    atomic_write(self.staging.path) as f:
+                f.writelines(line for number, line in enumerate(source) if number not in duplicates)
+            self.logger.warning(f"Dropped {len(duplicates)} rows staged twice after the listing shifted")
+        return len(duplicates)
+    
+    def _content_signature(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Identify the CSV contents by size and newest row.
+        
+        Unlike mtime this survives a git checkout, so a committed columnar
+        copy is recognised as up to date.
+        """
+        path = path or self.csv_path
+        try:
+            size = os.path.getsize(path)
+            with open(path, 'rb') as f:
+                head = f.readline() + f.readline()
+        except OSError:
+            return None
+        return f"{size}:{hashlib.sha1(head).hexdigest()}"
+    
+    def _read_columnar_table(self, expected_signature: Optional[str]):
+        """Memory-map the columnar copy if it was written from the expected CSV contents."""
+        if pa is None or expected_signature is None or not os.path.exists(self.columnar_path):
+            return None
         
         try:
-            df['date_parsed'] = pd.to_datetime(df['Gregorian Date'])
+            table = feather.read_table(self.columnar_path, memory_map=True)
+        except Exception as e:
+            self.logger.warning(f"Unreadable columnar copy {self.columnar_path}: {e}")
+            return None
+        
+        metadata = table.schema.metadata or {}
+        if metadata.get(b'csv_signature', b'').decode() != expected_signature:
+            return None
+        if not set(DERIVED_COLUMNS.values()) <= set(table.column_names):
+            return None  # Written before the derived columns existed
+        return table
+    
+    def _write_columnar(self, new_df: Optional[pd.DataFrame] = None, previous_signature: Optional[str] = None):
+        """
+        Write the typed columnar copy that mirrors the CSV.
+        
+        When `new_df` holds rows just spliced onto a CSV whose previous
+        contents match the existing columnar copy, only those rows are
+        converted and get derived columns; otherwise the copy is rebuilt
+        from the full dataset.
+        """
+        if pa is None:
+            return
+        
+        try:
+            existing = self._read_columnar_table(previous_signature) if new_df is not None else None
+            if existing is not None:
+                previous_close = existing.column(COLUMN_MAPPING["close_price"])[0].as_py() if existing.num_rows else None
+                new_typed = to_typed_frame(new_df, previous_close)
+                self._log_change_mismatches(new_typed)
+                typed = pd.concat([new_typed, existing.to_pandas()], ignore_index=True)
+            else:
+                typed = to_typed_frame(self._load_cached())
             
-            return {
-                'total_records': len(df),
-                'latest_date': df['date_parsed'].max().strftime('%Y/%m/%d'),
-                'oldest_date': df['date_parsed'].min().strftime('%Y/%m/%d'),
-                'date_range': f"{df['date_parsed'].min().strftime('%Y/%m/%d')} to {df['date_parsed'].max().strftime('%Y/%m/%d')}"
-            }
+            table = pa.Table.from_pandas(typed, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[b'csv_signature'] = self._content_signature().encode()
+            table = table.replace_schema_metadata(metadata)
+            
+            with atomic_write(self.columnar_path, 'wb') as f:
+                feather.write_feather(table, f, compression=COLUMNAR_COMPRESSION)
+        except Exception as e:
+            self.logger.error(f"Error writing columnar copy: {e}")
+    
+    def _write_columnar_chunked(self, source_path: str, chunk_rows: int = 50000):
+        """
+        Write the columnar copy for the CSV at `source_path`, converting `chunk_rows` rows at a time.
+        
+        Each chunk is converted once the next one is read, since the oldest
+        row of a chunk takes its previous close from the next chunk.
+        """
+        if pa is None:
+            return
+        
+        try:
+            metadata = {b'csv_signature': self._content_signature(source_path).encode()}
+            options = pa.ipc.IpcWriteOptions(compression=COLUMNAR_COMPRESSION)
+            
+            with atomic_write(self.columnar_path, 'wb') as f:
+                writer = None
+                chunks = pd.read_csv(source_path, chunksize=chunk_rows)
+                chunk = next(chunks, None)
+                while chunk is not None:
+                    next_chunk = next(chunks, None)
+                    previous_close = None if next_chunk is None else int(next_chunk[COLUMN_MAPPING["close_price"]].iloc[0])
+                    typed = to_typed_frame(chunk, previous_close)
+                    if writer is None:
+                        table = pa.Table.from_pandas(typed, preserve_index=False)
+                        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+                        schema = table.schema
+                        # Feather V2 is the Arrow IPC file format
+                        writer = pa.ipc.new_file(f, schema, options=options)
+                    else:
+                        table = pa.Table.from_pandas(typed, schema=schema, preserve_index=False)
+                    writer.write_table(table)
+                    chunk = next_chunk
+                if writer is None:
+                    raise ValueError(f"No rows in {source_path}")
+                writer.close()
+        except Exception as e:
+            self.logger.error(f"Error writing columnar copy: {e}")
+    
+    def _rebuild_indicator_state(self) -> Optional[IndicatorState]:
+        """Compute the indicator state over the whole dataset (vectorized) and save it."""
+        try:
+            state = IndicatorState.from_frame(self._load_cached())
+            state.save(self.indicator_state_path)
+            return state
+        except Exception as e:
+            self.logger.error(f"Error writing indicator state: {e}")
+            return None
+    
+    def _discard_derived_state(self):
+        """Remove the indicator state, dashboard artifact, rollups and row index, which no longer match the dataset."""
+        self._rollups = None
+        self._row_index = None
+        for path in (self.indicator_state_path, self.artifact_path, self.rollup_path, self.row_index_path):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def _advance_indicator_state(self, new_df: pd.DataFrame, previous_latest: Optional[str]) -> Optional[pd.DataFrame]:
+        """
+        Feed rows spliced onto the top of the dataset to the saved indicator state.
+        
+        Only the new rows are processed when the state ends at the previous
+        newest row, and their indicator values are returned; otherwise the
+        state is rebuilt from the whole dataset and None is returned.
+        """
+        state = IndicatorState.load(self.indicator_state_path)
+        if state is None or previous_latest is None or state.last_date != previous_latest:
+            self._rebuild_indicator_state()
+            return None
+        
+        try:
+            values = state.advance_frame(new_df)
+            state.save(self.indicator_state_path)
+            return values
+        except Exception as e:
+            self.logger.error(f"Error updating indicator state: {e}")
+            return None
+    
+    def get_indicator_state(self) -> Optional[IndicatorState]:
+        """EMA, MACD and RSI state as of the newest stored day, rebuilt only if it is out of date."""
+        state = IndicatorState.load(self.indicator_state_path)
+        if state is not None and state.last_date == self._read_stored_header_and_latest()[1]:
+            return state
+        if self.read_only:
+            return IndicatorState.from_frame(self._load_cached())
+        
+        with self.lock:
+            return self._rebuild_indicator_state()
+    
+    def _rebuild_artifact(self) -> bool:
+        """Build the dashboard artifact from the whole dataset and save it."""
+        try:
+            # The memory-mapped columnar copy spares parsing the CSV after a splice
+            df = self._load_cached() if self._cache_is_current() else self.load_fast()
+            artifact = build_artifact(df, self._content_signature())
+            if artifact is not None:
+                save_artifact(artifact, self.artifact_path)
+            return True
         except Exception as e:
-            self.logger.error(f"Error getting data summary: {e}")
+            self.logger.error(f"Error writing dashboard artifact: {e}")
+            return False
+    
+    def _extend_artifact(self, new_df: pd.DataFrame, previous_signature: Optional[str],
+                         state_values: Optional[pd.DataFrame]) -> bool:
+        """
+        Add rows spliced onto the top of the dataset to the dashboard artifact.
+        
+        Only the new rows are encoded when the artifact was written from the
+        previous CSV contents and the indicator state advanced over them;
+        otherwise it is rebuilt.
+        """
+        artifact = load_artifact(self.artifact_path)
+        if artifact is None or state_values is None or artifact.get('csv_signature') != previous_signature:
+            return self._rebuild_artifact()
+        
+        try:
+            save_artifact(extend_artifact(artifact, new_df, state_values, self._content_signature()), self.artifact_path)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error updating dashboard artifact: {e}")
+            return self._rebuild_artifact()
+    
+    def update_artifact(self) -> bool:
+        """Make sure the dashboard artifact matches the CSV, rebuilding it only if it is missing or out of date."""
+        signature = self._content_signature()
+        if signature is None:
+            return False
+        
+        artifact = load_artifact(self.artifact_path)
+        if artifact is not None and artifact.get('csv_signature') == signature:
+            return True
+        
+        with self.lock:
+            return self._rebuild_artifact()
+    
+    def _rebuild_rollups(self) -> Optional[Rollups]:
+        """Group the whole dataset into OHLC rollups and save them."""
+        try:
+            rollups = Rollups.from_frame(self._load_cached(), self._content_signature())
+            rollups.save(self.rollup_path)
+            self._rollups = rollups
+            return rollups
+        except Exception as e:
+            self.logger.error(f"Error writing rollups: {e}")
+            self._rollups = None
+            return None
+    
+    def _extend_rollups(self, new_df: pd.DataFrame, previous_signature: Optional[str]) -> Optional[Rollups]:
+        """
+        Fold rows spliced onto the top of the dataset into the rollups.
+        
+        Only the trailing bar of each period is touched when the rollups were
+        written from the previous CSV contents; otherwise they are rebuilt.
+        """
+        rollups = self._rollups
+        if rollups is None or rollups.csv_signature != previous_signature:
+            rollups = Rollups.load(self.rollup_path)
+        if rollups is None or rollups.csv_signature != previous_signature:
+            return self._rebuild_rollups()
+        
+        try:
+            rollups.extend(new_df, self._content_signature())
+            rollups.save(self.rollup_path)
+            self._rollups = rollups
+            return rollups
+        except Exception as e:
+            self.logger.error(f"Error updating rollups: {e}")
+            return self._rebuild_rollups()
+    
+    def get_rollups(self) -> Optional[Rollups]:
+        """OHLC rollups of the current dataset, from memory or disk, rebuilt only if they are out of date."""
+        signature = self._content_signature()
+        if signature is None:
+            return None
+        if self._rollups is not None and self._rollups.csv_signature == signature:
+            return self._rollups
+        
+        rollups = Rollups.load(self.rollup_path)
+        if rollups is not None and rollups.csv_signature == signature:
+            self._rollups = rollups
+            return rollups
+        if self.read_only:
+            self._rollups = Rollups.from_frame(self._load_cached(), signature)
+            return self._rollups
+        
+        with self.lock:
+            return self._rebuild_rollups()
+    
+    def get_rollup(self, period: str, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """
+        OHLC bars of one of ROLLUP_PERIODS overlapping the Gregorian dates start..end (YYYY/MM/DD).
+        
+        Served from the materialized rollups in time proportional to the bars returned.
+        """
+        rollups = self.get_rollups()
+        if rollups is None:
+            return Rollups().query(period)
+        return rollups.query(period, start, end)
+    
+    def _rebuild_row_index(self) -> Optional[RowIndex]:
+        """Index the rows of the whole CSV by date and save the index."""
+        self._row_index = None
+        try:
+            index = RowIndex.from_csv(self.csv_path, self._load_cached(), self._content_signature())
+            if index is None:
+                # Queries fall back to filtering the loaded dataset
+                self.logger.info("Rows are not strictly newest first; not writing a row index")
+                if os.path.exists(self.row_index_path):
+                    os.remove(self.row_index_path)
+                return None
+            index.save(self.row_index_path)
+            self._row_index = index
+            return index
+        except Exception as e:
+            self.logger.error(f"Error writing row index: {e}")
+            return None
+    
+    def _extend_row_index(self, new_df: pd.DataFrame, lines: bytes, previous_signature: Optional[str]) -> Optional[RowIndex]:
+        """
+        Add rows spliced onto the top of the CSV (written as `lines`) to the row index.
+        
+        Offsets are kept from the end of the file, so the existing entries
+        stay valid and only the new rows are indexed; the index is rebuilt
+        if it was not written from the previous CSV contents.
+        """
+        index = self._row_index
+        if index is None or index.csv_signature != previous_signature:
+            index = RowIndex.load(self.row_index_path)
+        if index is None or index.csv_signature != previous_signature:
+            return self._rebuild_row_index()
+        
+        try:
+            index.extend(new_df, lines, self._content_signature())
+            index.save(self.row_index_path)
+            self._row_index = index
+            return index
+        except Exception as e:
+            self.logger.error(f"Error updating row index: {e}")
+            return self._rebuild_row_index()
+    
+    def get_row_index(self) -> Optional[RowIndex]:
+        """
+        Date index of the CSV rows, from memory or disk, rebuilt only if it is out of date.
+        
+        None if there is no dataset or its rows are not strictly newest first.
+        """
+        signature = self._content_signature()
+        if signature is None:
+            return None
+        if self._row_index is not None and self._row_index.csv_signature == signature:
+            return self._row_index
+        
+        index = RowIndex.load(self.row_index_path)
+        if index is not None and index.csv_signature == signature:
+            self._row_index = index
+            return index
+        if self.read_only:
+            self._row_index = RowIndex.from_csv(self.csv_path, self._load_cached(), signature)
+            return self._row_index
+        
+        with self.lock:
+            return self._rebuild_row_index()
+    
+    def _date_bound(self, date_text: Optional[str], calendar: str) -> Optional[int]:
+        """A query bound as a Gregorian day number or a Persian YYYYMMDD number."""
+        if calendar not in ('gregorian', 'persian'):
+            raise ValueError(f"Unknown calendar: {calendar}. Use 'gregorian' or 'persian'")
+        if date_text is None:
+            return None
+        if not DATE_PATTERN.fullmatch(date_text):
+            raise ValueError(f"Invalid date: {date_text}. Expected YYYY/MM/DD")
+        if calendar == 'persian':
+            return int(date_text.replace('/', ''))
+        day = date_to_ordinal(date_text)
+        if day is None:
+            raise ValueError(f"Invalid date: {date_text}")
+        return day
+    
+    def get_range(self, start: Optional[str] = None, end: Optional[str] = None,
+                  calendar: str = 'gregorian') -> pd.DataFrame:
+        """
+        Rows dated start..end (YYYY/MM/DD, inclusive, either may be omitted), newest first.
+        
+        With calendar='persian' the bounds are Persian dates. Rows are found
+        by binary search in the row index and read with a single seek, so the
+        time depends on the rows returned, not on the size of the dataset.
+        """
+        bounds = (self._date_bound(start, calendar), self._date_bound(end, calendar))
+        index = self.get_row_index()
+        if index is None:
+            return self._filter_loaded(start, end, calendar)
+        if calendar == 'persian':
+            return index.read_positions(self.csv_path, index.persian_positions(*bounds))
+        return index.read(self.csv_path, *index.gregorian_span(*bounds))
+    
+    def get_on(self, date: str, calendar: str = 'gregorian') -> Optional[Dict[str, Any]]:
+        """The row stored for a Gregorian (or, with calendar='persian', Persian) date, or None."""
+        rows = self.get_range(date, date, calendar)
+        return rows.to_dict('records')[0] if not rows.empty else None
+    
+    def latest(self, n: int = 1) -> pd.DataFrame:
+        """The newest `n` rows, newest first, read from the top of the CSV."""
+        index = self.get_row_index()
+        if index is None:
+            df = self._load_cached()
+            if df.empty:
+                return df.copy()
+            return df.sort_values('Gregorian Date', ascending=False, kind='stable').head(n).reset_index(drop=True)
+        return index.read(self.csv_path, max(len(index) - n, 0), len(index))
+    
+    def _filter_loaded(self, start: Optional[str], end: Optional[str], calendar: str) -> pd.DataFrame:
+        """get_range() over the loaded dataset, for CSVs the row index cannot cover."""
+        df = self._load_cached()
+        if df.empty:
+            return df.copy()
+        
+        # Dates are zero-padded YYYY/MM/DD, so string order is date order
+        dates = df[COLUMN_MAPPING[f"{calendar}_date"]].astype(str)
+        keep = dates.str.fullmatch(DATE_PATTERN.pattern)
+        if start is not None:
+            keep &= dates >= start
+        if end is not None:
+            keep &= dates <= end
+        return df[keep].sort_values('Gregorian Date', ascending=False, kind='stable').reset_index(drop=True)
+    
+    def _log_change_mismatches(self, typed: pd.DataFrame):
+        """Warn about new rows whose scraped change disagrees with their close prices."""
+        mismatched = typed[typed[DERIVED_COLUMNS["change_mismatch"]]]
+        if not mismatched.empty:
+            self.logger.warning(
+                f"{len(mismatched)} new rows have a scraped change that disagrees with the close prices: "
+                f"{mismatched[COLUMN_MAPPING['gregorian_date']].dt.strftime('%Y/%m/%d').tolist()}"
+            )
+    
+    def load_fast(self) -> pd.DataFrame:
+        """
+        Load the dataset with typed columns from the memory-mapped columnar copy.
+        
+        Besides the CSV columns the frame holds the numeric DERIVED_COLUMNS.
+        The copy is rebuilt if it is missing or out of date. Without pyarrow,
+        or read-only without a current copy, this falls back to converting the CSV.
+        """
+        signature = self._content_signature()
+        if signature is None:
+            return pd.DataFrame()
+        
+        if pa is not None:
+            table = self._read_columnar_table(signature)
+            if table is None and not self.read_only:
+                with self.lock:
+                    self._write_columnar()
+                table = self._read_columnar_table(self._content_signature())
+            if table is not None:
+                return table.to_pandas()
+        
+        return to_typed_frame(self._load_cached())
+    
+    def get_data_summary(self) -> Dict[str, Any]:
+        """Get summary information about the current dataset, from the row index unless the CSV is loaded."""
+        if not self._cache_is_current():
+            index = self.get_row_index()
+            if index is not None and len(index):
+                oldest_date, latest_date = map(ordinal_to_date, index.date_bounds())
+                return {
+                    'total_records': len(index),
+                    'latest_date': latest_date,
+                    'oldest_date': oldest_date,
+                    'date_range': f"{oldest_date} to {latest_date}"
+                }
+        
+        df = self._load_cached()
+        
+        if df.empty:
             return {
-                'total_records': len(df),
+                'total_records': 0,
                 'date_range': None,
                 'latest_date': None,
                 'oldest_date': None
             }
+        
+        oldest_date, latest_date = self._cache_bounds
+        
+        return {
+            'total_records': len(df),
+            'latest_date': latest_date,
+            'oldest_date': oldest_date,
+            'date_range': f"{oldest_date} to {latest_date}" if latest_date else None
+        }
+    
+    def verify(self, max_gap_days: int = SYNC_MAX_GAP_DAYS) -> Dict[str, Any]:
+        """
+        Check the stored dataset for integrity problems and scan it for gaps.
+        
+        Problems are things that should never be in the file: a wrong header,
+        Gregorian dates that do not parse, duplicate days, rows out of
+        newest-first order, and missing prices. Warnings are rows the site
+        itself published that way: Persian dates that are not YYYY/MM/DD and
+        lows or highs that do not contain the open and close. Gaps are stored
+        neighbours more than `max_gap_days` apart; holidays cause some.
+        """
+        report = {'path': self.csv_path, 'total_records': 0, 'problems': [], 'warnings': [], 'gaps': []}
+        if self._file_signature() is None:
+            report['problems'].append("dataset file is missing")
+            return report
+        
+        df = self._load_cached()
+        if list(df.columns) != list(COLUMN_MAPPING.values()):
+            report['problems'].append(f"unexpected columns: {list(df.columns)}")
+            return report
+        report['total_records'] = len(df)
+        if df.empty:
+            return report
+        
+        def flag(mask, message: str, kind: str = 'problems'):
+            if mask.any():
+                dates = df.loc[mask, COLUMN_MAPPING['gregorian_date']].astype(str).head(5).tolist()
+                report[kind].append(f"{int(mask.sum())} rows {message}: {dates}")
+        
+        days = dates_to_ordinals(df[COLUMN_MAPPING['gregorian_date']])
+        flag(days < 0, "have an invalid Gregorian date")
+        flag(~df[COLUMN_MAPPING['persian_date']].astype(str).str.fullmatch(DATE_PATTERN.pattern),
+             "have an invalid Persian date", 'warnings')
+        flag(df.duplicated(COLUMN_MAPPING['gregorian_date'], keep='first').to_numpy(), "repeat a stored date")
+        
+        # Newest first: every valid day is older than the valid day above it
+        valid_days = days[days >= 0]
+        out_of_order = (valid_days[1:] >= valid_days[:-1]).sum()
+        if out_of_order:
+            report['problems'].append(f"{int(out_of_order)} rows are not in newest-first order")
+        
+        prices = df[PRICE_COLUMNS].apply(pd.to_numeric, errors='coerce')
+        flag((prices.isna() | (prices <= 0)).any(axis=1).to_numpy(), "have a missing or non-positive price")
+        low, high = prices[COLUMN_MAPPING['low_price']], prices[COLUMN_MAPPING['high_price']]
+        body = prices[[COLUMN_MAPPING['open_price'], COLUMN_MAPPING['close_price']]]
+        flag(((low > body.min(axis=1)) | (high < body.max(axis=1))).to_numpy(),
+             "have a low above or a high below the open/close", 'warnings')
+        
+        report['gaps'] = [
+            {'after': ordinal_to_date(start), 'before': ordinal_to_date(end), 'days': end - start}
+            for start, end in DateIndex(valid_days).gaps(max_gap_days)
+        ]
+        return report
@@ -0,0 +1,278 @@
+"""Chrome driver lifecycle: cached ChromeDriver resolution and a pool of warm drivers."""
+
+import json
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+
+from .config import (
+    CHROME_OPTIONS, CHROME_BINARIES, DRIVER_MANIFEST_PATH, DRIVER_POOL_SIZE, DRIVER_BORROW_TIMEOUT
+)
+from .utils import setup_logging
+from .storage import atomic_write
+
+
+def detect_chrome_version() -> Optional[str]:
+    """Return the installed Chrome version (e.g. "126.0.6478.126"), or None if not found."""
+    for binary in CHROME_BINARIES:
+        path = shutil.which(binary)
+        if not path:
+            continue
+        try:
+            output = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r'\d+\.\d+\.\d+\.\d+', output)
+        if match:
+            return match.group(0)
+    
+    return None
+
+
+class DriverManifest:
+    """
+    JSON file mapping a Chrome version to the ChromeDriver path resolved for it.
+    
+    ChromeDriverManager().install() checks the network for a matching driver
+    on every call; once a path is known for the installed Chrome version it
+    is reused until Chrome is upgraded or the file disappears.
+    """
+    
+    def __init__(self, path: str = DRIVER_MANIFEST_PATH):
+        self.path = os.path.expanduser(path)
+    
+    def _read(self) -> Dict[str, str]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def lookup(self, chrome_version: str) -> Optional[str]:
+        """Return the cached driver path for this Chrome version if it still exists."""
+        driver_path = self._read().get(chrome_version)
+        if driver_path and os.path.isfile(driver_path) and os.access(driver_path, os.X_OK):
+            return driver_path
+        return None
+    
+    def store(self, chrome_version: str, driver_path: str):
+        """Remember the driver path resolved for this Chrome version."""
+        entries = self._read()
+        entries[chrome_version] = driver_path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with atomic_write(self.path) as f:
+            json.dump(entries, f, indent=2)
+
+
+def resolve_driver_path(manifest: Optional[DriverManifest] = None) -> tuple:
+    """
+    Find the ChromeDriver binary for the installed Chrome.
+    
+    Returns (driver path, "cached" or "resolved"). Only a cache miss, or an
+    undetectable Chrome version, goes through ChromeDriverManager.
+    """
+    manifest = manifest or DriverManifest()
+    chrome_version = detect_chrome_version()
+    
+    if chrome_version:
+        driver_path = manifest.lookup(chrome_version)
+        if driver_path:
+            return driver_path, "cached"
+    
+    driver_path = ChromeDriverManager().install()
+    if chrome_version:
+        manifest.store(chrome_version, driver_path)
+    return driver_path, "resolved"
+
+
+def _chrome_options() -> Options:
+    chrome_options = Options()
+    for option in CHROME_OPTIONS:
+        chrome_options.add_argument(option)
+    return chrome_options
+
+
+def create_driver(logger=None) -> webdriver.Chrome:
+    """
+    Start a headless Chrome, logging how long driver resolution and browser startup took.
+    
+    Falls back to the system ChromeDriver if the resolved one cannot be used.
+    """
+    logger = logger or setup_logging()
+    chrome_options = _chrome_options()
+    start = time.perf_counter()
+    
+    try:
+        driver_path, source = resolve_driver_path()
+        resolved = time.perf_counter()
+        logger.info(f"Using ChromeDriver at: {driver_path} ({source} in {resolved - start:.2f}s)")
+        
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+        logger.info(f"Chrome driver initialized successfully in {time.perf_counter() - resolved:.2f}s")
+        return driver
+    
+    except Exception as e:
+        logger.error(f"Failed to initialize Chrome driver: {str(e)}")
+        # Try fallback without service (system chromedriver)
+        try:
+            logger.info("Attempting fallback to system ChromeDriver")
+            fallback_start = time.perf_counter()
+            driver = webdriver.Chrome(options=chrome_options)
+            logger.info(f"Fallback Chrome driver initialized successfully in {time.perf_counter() - fallback_start:.2f}s")
+            return driver
+        except Exception as fallback_error:
+            logger.error(f"Fallback also failed: {str(fallback_error)}")
+            raise RuntimeError(f"Failed to initialize Chrome driver: {str(e)}")
+
+
+class DriverPool:
+    """
+    Thread-safe pool of warm Chrome drivers shared by several scrapes.
+    
+    Drivers are started lazily up to `size` and handed back after each
+    scrape, so only the first borrow per slot pays the browser startup.
+    A driver that no longer responds is replaced on the next borrow.
+    Startup and borrow times are recorded to compare cold and warm cost.
+    """
+    
+    def __init__(self, size: int = DRIVER_POOL_SIZE, timeout: float = DRIVER_BORROW_TIMEOUT):
+        self.logger = setup_logging()
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.cold_starts: List[float] = []
+        self.warm_borrows: List[float] = []
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._drivers: List[webdriver.Chrome] = []
+        self._closed = False
+    
+    def _is_alive(self, driver: webdriver.Chrome) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def _discard(self, driver: webdriver.Chrome):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+                self._created -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass  # Browser already gone
+    
+    def _start_driver(self) -> webdriver.Chrome:
+        start = time.perf_counter()
+        try:
+            driver = create_driver(self.logger)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._drivers.append(driver)
+            self.cold_starts.append(elapsed)
+        self.logger.info(f"Driver pool: cold start {elapsed:.2f}s ({self._created}/{self.size} drivers)")
+        return driver
+    
+    def acquire(self) -> webdriver.Chrome:
+        """Borrow a driver, starting one if the pool is not full yet."""
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+        
+        start = time.perf_counter()
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_start = self._created < self.size
+                    if can_start:
+                        self._created += 1
+                if can_start:
+                    return self._start_driver()
+                
+                remaining = self.timeout - (time.perf_counter() - start)
+                try:
+                    driver = self._idle.get(timeout=max(0, remaining))
+                except queue.Empty:
+                    raise TimeoutError(f"No pooled driver became free within {self.timeout}s")
+            
+            if self._is_alive(driver):
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.warm_borrows.append(elapsed)
+                self.logger.info(f"Driver pool: reused warm driver in {elapsed:.3f}s")
+                return driver
+            
+            self.logger.warning("Driver pool: discarding unresponsive driver")
+            self._discard(driver)
+    
+    def release(self, driver: webdriver.Chrome):
+        """Return a borrowed driver to the pool."""
+        if self._closed:
+            self._discard(driver)
+            return
+        
+        try:
+            driver.delete_all_cookies()
+        except WebDriverException:
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+    
+    @contextmanager
+    def borrow(self):
+        """Context manager around acquire/release."""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Startup timing summary: cold starts versus warm borrows."""
+        def average(values):
+            return round(sum(values) / len(values), 3) if values else None
+        
+        return {
+            'drivers': self._created,
+            'cold_starts': len(self.cold_starts),
+            'avg_cold_start': average(self.cold_starts),
+            'warm_borrows': len(self.warm_borrows),
+            'avg_warm_borrow': average(self.warm_borrows)
+        }
+    
+    def close(self):
+        """Quit every driver started by the pool."""
+        self._closed = True
+        if not self._drivers:
+            return
+        
+        stats = self.stats()
+        for driver in list(self._drivers):
+            self._discard(driver)
+        self.logger.info(f"Driver pool closed: {stats}")
+    
+    def __enter__(self) -> 'DriverPool':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
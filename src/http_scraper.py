@@ -0,0 +1,432 @@
+"""Browser-free scraper backend that reads the DataTables JSON source directly."""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import (
+    API_URL_TEMPLATE, DEFAULT_INSTRUMENT, CHROME_OPTIONS, API_PAGE_SIZE, REQUEST_TIMEOUT,
+    HTTP_POOL_SIZE, MAX_RETRIES, RETRY_DELAY, BACKFILL_WORKERS,
+    MAX_REQUESTS_PER_SECOND, STREAM_FULL_SCRAPES, UPDATE_CHECK_RECORDS
+)
+from .utils import strip_html, format_progress, RateLimiter
+from .scraper import BaseScraper, DollarScraper
+from .drivers import DriverPool
+from .models import PriceRow
+from .sync import DateIndex, compare_page, plan_gap_offsets
+from .pipeline import ScrapePipeline
+
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def default_headers() -> Dict[str, str]:
+    """Browser-like headers the history table sends with its API requests."""
+    user_agent = next(
+        (option.split("=", 1)[1] for option in CHROME_OPTIONS if option.startswith("--user-agent=")),
+        "Mozilla/5.0"
+    )
+    return {
+        "User-Agent": user_agent,
+        "Accept": "application/json, text/javascript, */*; q=0.01",
+        "X-Requested-With": "XMLHttpRequest"
+    }
+
+
+def create_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """Create a pooled HTTP session with retries for the TGJU API."""
+    session = requests.Session()
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_DELAY / 2,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=("GET",)
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(default_headers())
+    return session
+
+
+class ApiScraperBase(BaseScraper):
+    """
+    Request building and payload parsing for the DataTables JSON source
+    behind the history table, shared by the threaded and asyncio backends.
+    """
+    
+    def __init__(self, instrument: str = DEFAULT_INSTRUMENT, api_url: Optional[str] = None,
+                 page_size: int = API_PAGE_SIZE, workers: int = BACKFILL_WORKERS, **kwargs):
+        super().__init__(instrument, **kwargs)
+        self.api_url = api_url or API_URL_TEMPLATE.format(slug=instrument)
+        self.page_size = page_size
+        self.workers = max(1, workers)
+    
+    def _page_params(self, start: int, length: int) -> Dict[str, Any]:
+        """Query parameters the history table uses to request one page, newest first."""
+        return {
+            "lang": "fa",
+            "order_dir": "desc",
+            "draw": 1,
+            "start": start,
+            "length": length,
+            "from": "",
+            "to": "",
+            "convert_to_ad": 1
+        }
+    
+    def _parse_payload(self, payload: Dict[str, Any]) -> List[PriceRow]:
+        """Map raw API rows to validated rows."""
+        return self._build_rows([[strip_html(cell) for cell in raw_row] for raw_row in payload.get("data", [])])
+    
+    def _start_journal(self, **identity) -> Dict[int, List[PriceRow]]:
+        """Open the scrape journal for pages of `page_size` rows (the Selenium fallback passes its own)."""
+        identity.setdefault('page_size', self.page_size)
+        return super()._start_journal(**identity)
+
+
+class HttpScraper(ApiScraperBase, DollarScraper):
+    """
+    Scraper backend that requests large pages from the JSON source behind the
+    history table instead of driving a browser.
+    
+    Falls back to the Selenium implementation if the API cannot be used.
+    """
+    
+    def __init__(self, instrument: str = DEFAULT_INSTRUMENT, api_url: Optional[str] = None,
+                 page_size: int = API_PAGE_SIZE, session: Optional[requests.Session] = None,
+                 fallback: bool = True, workers: int = BACKFILL_WORKERS,
+                 rate_limit: float = MAX_REQUESTS_PER_SECOND, rate_limiter: Optional[RateLimiter] = None,
+                 driver_pool: Optional[DriverPool] = None, stream: bool = STREAM_FULL_SCRAPES):
+        super().__init__(instrument, api_url=api_url, page_size=page_size, workers=workers, driver_pool=driver_pool)
+        # Session and rate limiter may be shared by scrapers of several instruments
+        self.session = session or create_session(max(HTTP_POOL_SIZE, self.workers))
+        self.rate_limiter = rate_limiter or RateLimiter(rate_limit)
+        self.fallback = fallback
+        self.stream = stream
+    
+    def _fetch_page(self, start: int, length: int) -> Dict[str, Any]:
+        """Fetch one page of raw DataTables rows starting at the given offset."""
+        self.rate_limiter.wait()
+        with self.metrics.time('fetch_page'):
+            try:
+                response = self.session.get(
+                    self.api_url, params=self._page_params(start, length),
+                    headers={"Referer": self.base_url}, timeout=REQUEST_TIMEOUT
+                )
+                response.raise_for_status()
+                payload = response.json()
+            except (requests.RequestException, ValueError):
+                self.metrics.increment('fetch_errors')
+                raise
+        
+        # urllib3 retries transient failures inside the adapter and records them on the response
+        retries = getattr(response.raw, 'retries', None)
+        if retries is not None:
+            self.metrics.increment('retries', len(retries.history))
+        return payload
+    
+    def _fetch_rows(self, start: int, length: int) -> List[PriceRow]:
+        """Fetch and parse one page of rows."""
+        return self._parse_payload(self._fetch_page(start, length))
+    
+    def _backfill(self) -> List[PriceRow]:
+        """
+        Fetch the full history with a bounded pool of concurrent page requests.
+        
+        The first page tells us the total record count; the remaining page
+        offsets are fetched in parallel and merged back in page order. Every
+        page is journaled as it arrives, so an interrupted backfill resumes
+        with only the missing pages.
+        """
+        first_page = self._fetch_page(0, self.page_size)
+        total_records = int(first_page.get("recordsFiltered", first_page.get("recordsTotal", 0)))
+        offsets = list(range(0, total_records, self.page_size))
+        
+        pages = self._start_journal(mode="full", total=total_records)
+        if pages:
+            self.logger.info(f"Resuming backfill: {len(pages)} pages already journaled")
+        
+        if 0 not in pages:
+            pages[0] = self._parse_payload(first_page)
+            self._record_page(0, pages[0])
+        
+        pending = [offset for offset in offsets if offset not in pages]
+        self.logger.info(
+            f"Backfilling {total_records} records in {len(offsets)} pages "
+            f"({len(pending)} to fetch) with {self.workers} workers"
+        )
+        
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as executor:
+            futures = {executor.submit(self._fetch_rows, offset, self.page_size): offset for offset in pending}
+            failures = []
+            for future in as_completed(futures):
+                offset = futures[future]
+                try:
+                    pages[offset] = future.result()
+                except requests.RequestException as e:
+                    # Keep journaling the other pages so a rerun only fetches the failures
+                    failures.append(e)
+                    continue
+                self._record_page(offset, pages[offset])
+                self.logger.info(format_progress(len(pages), len(offsets), self.start_time))
+        
+        if failures:
+            self.logger.error(f"{len(failures)} pages failed; rerun to resume from the journal")
+            raise failures[0]
+        
+        # Merge in offset order so rows stay newest first
+        return [row for offset in offsets for row in pages.get(offset, [])]
+    
+    def _fetch_offsets(self, offsets: List[int], pages: Dict[int, List[PriceRow]]):
+        """Fetch the given page offsets in parallel into `pages`; raise the first failure."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as executor:
+            futures = {executor.submit(self._fetch_rows, offset, self.page_size): offset for offset in offsets}
+            failures = []
+            for future in as_completed(futures):
+                try:
+                    pages[futures[future]] = future.result()
+                except requests.RequestException as e:
+                    failures.append(e)
+        
+        if failures:
+            raise failures[0]
+    
+    def fetch_range(self, start_day: int, end_day: int) -> List[PriceRow]:
+        """
+        Fetch the site's rows dated start_day..end_day (day numbers, inclusive), newest first.
+        
+        The first page gives the record count and how many rows the site
+        has per calendar day; from that the pages covering the range are
+        estimated and fetched in parallel. Pages are added one at a time at
+        either end until the rows just outside the range are seen, so a bad
+        estimate costs extra requests, not missing rows.
+        """
+        first_page = self._fetch_page(0, self.page_size)
+        total_records = int(first_page.get("recordsFiltered", first_page.get("recordsTotal", 0)))
+        pages = {0: self._parse_payload(first_page)}
+        if not pages[0] or not total_records:
+            return []
+        
+        newest, oldest = pages[0][0].day, pages[0][-1].day
+        rows_per_day = len(pages[0]) / max(1, newest - oldest)
+        last_offset = (total_records - 1) // self.page_size * self.page_size
+        
+        def page_of(day: int) -> int:
+            position = int(max(0, newest - day) * rows_per_day)
+            return min(position // self.page_size * self.page_size, last_offset)
+        
+        wanted = set(range(page_of(end_day), page_of(start_day) + self.page_size, self.page_size))
+        while True:
+            self._fetch_offsets(sorted(wanted - pages.keys()), pages)
+            first, last = min(wanted), max(wanted)
+            more = set()
+            # Rows newer than the first fetched one may still be in range, and so may rows older than the last
+            if first > 0 and (not pages[first] or pages[first][0].day < end_day):
+                more.add(first - self.page_size)
+            if last < last_offset and (not pages[last] or pages[last][-1].day > start_day):
+                more.add(last + self.page_size)
+            if not more:
+                break
+            wanted |= more
+        
+        self.logger.info(f"Fetched {len(wanted)} pages of {self.page_size} rows to cover the range")
+        rows = [row for offset in sorted(wanted) for row in pages[offset] if start_day <= row.day <= end_day]
+        # Rows can shift between pages if the site adds a day mid-fetch
+        return list({row.day: row for row in rows}.values())
+    
+    def check_newest(self, records: int = UPDATE_CHECK_RECORDS) -> Dict[str, Any]:
+        """
+        Compare the newest `records` rows on the site with the newest stored rows only.
+        
+        Returns the new and changed rows like compare_page(), the number of
+        rows the site returned ('checked') and whether they reached stored
+        data ('complete'). If they did not, there are more new rows than were
+        checked (or nothing is stored yet).
+        """
+        stored = DateIndex.from_frame(self.data_manager.latest(records))
+        page_data = self._fetch_rows(0, records)
+        comparison = compare_page(stored, page_data)
+        if stored.oldest is not None:
+            # Rows older than the stored window are unknown here, not new
+            comparison['new'] = [row for row in comparison['new'] if row.day > stored.oldest]
+        comparison['complete'] = comparison.pop('reached_stored')
+        comparison['checked'] = len(page_data)
+        return comparison
+    
+    def quick_update(self, records: int = UPDATE_CHECK_RECORDS, fill_gaps: bool = False) -> bool:
+        """
+        Update the dataset from the newest `records` rows on the site.
+        
+        Only a small page is requested and only the newest stored rows are
+        read, so a daily update never loads the whole dataset. Falls back to
+        a regular run when every checked row is new. With `fill_gaps` the
+        whole dataset is indexed to re-check the pages that cover its gaps.
+        """
+        self.start_time = datetime.now()
+        self.scraped_data = []
+        self.revised_data = []
+        
+        try:
+            with self.data_manager.lock:
+                with self.metrics.time('run'):
+                    comparison = self.check_newest(records)
+                    if comparison['complete']:
+                        self._note_revisions(comparison['changed'])
+                        self.scraped_data = comparison['new']
+                        self.logger.info(f"Checked the newest {records} rows: {len(self.scraped_data)} new")
+                        if fill_gaps:
+                            self.scraped_data.extend(self._fill_gaps(self.data_manager.get_date_index()))
+                        return self._save_scraped_data(incremental=True)
+                
+                self.logger.info(f"All {records} checked rows are new. Running a regular update...")
+                return self.run(fill_gaps=fill_gaps)
+        
+        except TimeoutError as e:
+            self.logger.error(f"Another run is still updating the dataset: {e}")
+            return False
+        except (requests.RequestException, ValueError) as e:
+            self.logger.error(f"Quick update failed: {e}")
+            return False
+    
+    def _fill_gaps(self, date_index: DateIndex) -> List[PriceRow]:
+        """Fetch only the pages that cover suspicious holes in the stored dates."""
+        offsets = plan_gap_offsets(date_index, len(self.scraped_data), self.page_size)
+        if not offsets:
+            return []
+        
+        self.logger.info(f"Checking {len(offsets)} pages that cover gaps in the stored dates")
+        found = []
+        seen_days = {row.day for row in self.scraped_data}
+        
+        for offset in offsets:
+            comparison = compare_page(date_index, self._fetch_rows(offset, self.page_size))
+            self._note_revisions(comparison['changed'])
+            for row in comparison['new']:
+                if row.day not in seen_days:
+                    seen_days.add(row.day)
+                    found.append(row)
+        
+        self.logger.info(f"Recovered {len(found)} missing records from gap pages")
+        return found
+    
+    def _stream_scrape(self, incremental: bool = False, date_index: Optional[DateIndex] = None) -> bool:
+        """
+        Scrape through the streaming pipeline, persisting rows batch by batch.
+        
+        When a stage fails, a network or payload error falls back to the
+        Selenium scraper if enabled, after discarding the staged rows; any
+        other failure returns False and keeps them so the next run resumes.
+        """
+        pipeline = ScrapePipeline(self, incremental=incremental, date_index=date_index)
+        report = pipeline.run()
+        
+        if report['failed_stage'] is None:
+            self.logger.info(f"\nScraping completed! Total records scraped: {report['stages']['sink']['rows_out']}")
+            return True
+        
+        self.logger.error(f"Streaming scrape failed in the {report['failed_stage']} stage: {pipeline.error}")
+        if not (self.fallback and isinstance(pipeline.error, (requests.RequestException, ValueError))):
+            return False
+        
+        if not incremental:
+            self.data_manager.staging.discard()
+        self.logger.info("Falling back to the Selenium scraper")
+        return super().scrape_all_data(incremental=incremental)
+    
+    def scrape_all_data(self, incremental: bool = True, fill_gaps: bool = False) -> bool:
+        """
+        Scrape all historical data from the API.
+        
+        Args:
+            incremental: If True, only scrape new data since last run
+            fill_gaps: If True (incremental only), also re-check pages that
+                cover holes of more than SYNC_MAX_GAP_DAYS in the stored dates
+        """
+        self.start_time = datetime.now()
+        self.scraped_data = []
+        self.revised_data = []
+        
+        try:
+            self.logger.info(f"Starting {self.instrument_name} scraper (HTTP backend)...")
+            
+            if not incremental and self.stream:
+                return self._stream_scrape()
+            
+            if not incremental and self.workers > 1:
+                self.scraped_data = self._backfill()
+                self.logger.info(f"\nScraping completed! Total records scraped: {len(self.scraped_data)}")
+                return self._save_scraped_data(incremental)
+            
+            date_index = None
+            if incremental:
+                summary = self.data_manager.get_data_summary()
+                self.logger.info(f"Existing data summary: {summary}")
+                date_index = self.data_manager.get_date_index()
+                if not len(date_index):
+                    date_index = None
+            
+            journaled_pages = {}
+            start = 0
+            total_records = None
+            
+            while total_records is None or start < total_records:
+                if start in journaled_pages:
+                    page_data = journaled_pages[start]
+                    self.logger.info(f"Using journaled rows {start + 1} to {start + self.page_size}")
+                else:
+                    self.logger.info(f"Fetching rows {start + 1} to {start + self.page_size} from {self.api_url}")
+                    payload = self._fetch_page(start, self.page_size)
+                    
+                    if total_records is None:
+                        total_records = int(payload.get("recordsFiltered", payload.get("recordsTotal", 0)))
+                        journaled_pages = self._start_journal(
+                            mode="incremental" if incremental else "full",
+                            total=total_records
+                        )
+                    
+                    page_data = self._parse_payload(payload)
+                    self._record_page(start, page_data)
+                
+                if not page_data:
+                    self.logger.warning("No data returned for this page. Stopping.")
+                    break
+                
+                start += self.page_size
+                
+                if date_index is not None:
+                    # Compare the whole page against the stored dates in one step
+                    comparison = compare_page(date_index, page_data)
+                    self.scraped_data.extend(comparison['new'])
+                    self._note_revisions(comparison['changed'])
+                    
+                    if comparison['reached_stored']:
+                        self.logger.info(f"Reached existing data. Added {len(comparison['new'])} new records from this page")
+                        break
+                else:
+                    self.scraped_data.extend(page_data)
+                
+                self.logger.info(format_progress(len(self.scraped_data), total_records, self.start_time))
+            
+            if fill_gaps and date_index is not None:
+                self.scraped_data.extend(self._fill_gaps(date_index))
+            
+            self.logger.info(f"\nScraping completed! Total records scraped: {len(self.scraped_data)}")
+            
+            return self._save_scraped_data(incremental)
+        
+        except KeyboardInterrupt:
+            self.logger.info("Scraping interrupted by user")
+            return False
+        except (requests.RequestException, ValueError) as e:
+            self.logger.error(f"HTTP backend failed: {e}")
+            if not self.fallback:
+                return False
+            
+            self.logger.info("Falling back to the Selenium scraper")
+            return super().scrape_all_data(incremental=incremental, fill_gaps=fill_gaps)
@@ -0,0 +1,296 @@
+"""Technical indicators of the dashboard (docs/script.js), vectorized with NumPy and pandas."""
+
+import json
+import os
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .config import (
+    COLUMN_MAPPING, RSI_PERIOD, STOCHASTIC_PERIODS, MOMENTUM_PERIOD,
+    MACD_PERIODS, EMA_PERIODS, ICHIMOKU_PERIODS
+)
+from .storage import atomic_write
+
+
+def _floats(values) -> np.ndarray:
+    return pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Move values `periods` rows later (earlier if negative), filling with NaN."""
+    return pd.Series(values).shift(periods).to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _date_strings(dates: pd.Series) -> pd.Series:
+    """Dates as zero-padded YYYY/MM/DD text, from either the CSV or the typed layout."""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.dt.strftime('%Y/%m/%d')
+    return dates.astype(str)
+
+
+def ema(values, period: int) -> np.ndarray:
+    """calculateEMA: seeded with the first value and smoothed by 2 / (period + 1)."""
+    return pd.Series(_floats(values)).ewm(span=period, adjust=False).mean().to_numpy()
+
+
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        # JavaScript divides to Infinity (RSI 100), or NaN when nothing moved
+        return 100.0 if avg_gain > 0 else float('nan')
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _wilder_averages(close: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Average gain and loss as calculateRSI smooths them, NaN before day `period`."""
+    change = np.diff(close)
+    gains = np.where(change > 0, change, 0.0)
+    losses = np.where(change < 0, -change, 0.0)
+    avg_gain = np.full(len(close), np.nan)
+    avg_loss = np.full(len(close), np.nan)
+    if len(change) < period:
+        return avg_gain, avg_loss
+    
+    # The first average is a plain mean of `period` changes; later ones smooth by 1 / period
+    for averages, moves in ((avg_gain, gains), (avg_loss, losses)):
+        seeded = np.concatenate(([moves[:period].sum() / period], moves[period:]))
+        averages[period:] = pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    return avg_gain, avg_loss
+
+
+def rsi(close, period: int = RSI_PERIOD) -> np.ndarray:
+    """calculateRSI with Wilder smoothing; NaN for the first `period` days."""
+    avg_gain, avg_loss = _wilder_averages(_floats(close), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def stochastic(high, low, close, periods: Tuple[int, int] = STOCHASTIC_PERIODS) -> Tuple[np.ndarray, np.ndarray]:
+    """calculateStochastic %K and calculateStochasticSlow %D (a simple average of %K)."""
+    k_period, d_period = periods
+    highest = pd.Series(_floats(high)).rolling(k_period).max().to_numpy()
+    lowest = pd.Series(_floats(low)).rolling(k_period).min().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = ((_floats(close) - lowest) / (highest - lowest)) * 100
+    
+    # Summed window by window like the JavaScript, rather than with a running sum
+    d = np.full(len(k), np.nan)
+    if len(k) >= d_period:
+        d[d_period - 1:] = sliding_window_view(k, d_period).sum(axis=1) / d_period
+    return k, d
+
+
+def momentum(close, period: int = MOMENTUM_PERIOD) -> np.ndarray:
+    """calculateMomentum: percent change over `period` days."""
+    close = _floats(close)
+    values = np.full(len(close), np.nan)
+    if len(close) > period:
+        values[period:] = ((close[period:] - close[:-period]) / close[:-period]) * 100
+    return values
+
+
+def macd(close, periods: Tuple[int, int, int] = MACD_PERIODS) -> Tuple[np.ndarray, np.ndarray]:
+    """calculateMACD line and signal; both start on day `slow`."""
+    fast, slow, signal_period = periods
+    line = ema(close, fast) - ema(close, slow)
+    line[:slow - 1] = np.nan
+    signal = np.full(len(line), np.nan)
+    if len(line) >= slow:
+        signal[slow - 1:] = ema(line[slow - 1:], signal_period)
+    return line, signal
+
+
+def ichimoku(high, low, close, periods: Tuple[int, int, int] = ICHIMOKU_PERIODS) -> Dict[str, np.ndarray]:
+    """calculateIchimoku lines; the leading spans are shifted forward and the lagging span back by the base period."""
+    conversion, base, span_b = periods
+    high, low = pd.Series(_floats(high)), pd.Series(_floats(low))
+    
+    def midpoint(period: int) -> np.ndarray:
+        return ((high.rolling(period).max() + low.rolling(period).min()) / 2).to_numpy()
+    
+    tenkan, kijun = midpoint(conversion), midpoint(base)
+    return {
+        'Tenkan-sen': tenkan,
+        'Kijun-sen': kijun,
+        'Senkou Span A': _shift((tenkan + kijun) / 2, base),
+        'Senkou Span B': _shift(midpoint(span_b), base),
+        'Chikou Span': _shift(_floats(close), -base)
+    }
+
+
+def compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute every dashboard indicator over a dataset frame, oldest day first.
+    
+    Accepts the CSV layout or DataManager.load_fast(); days where the
+    dashboard draws no point are NaN.
+    """
+    date_column = COLUMN_MAPPING["gregorian_date"]
+    if df.empty:
+        return pd.DataFrame(columns=[date_column])
+    
+    df = df.sort_values(date_column, kind='stable')
+    high, low, close = (df[COLUMN_MAPPING[column]] for column in ('high_price', 'low_price', 'close_price'))
+    
+    result = {date_column: _date_strings(df[date_column]).to_numpy()}
+    result['RSI'] = rsi(close)
+    result['Stochastic %K'], result['Stochastic %D'] = stochastic(high, low, close)
+    result['Momentum'] = momentum(close)
+    result['MACD'], result['MACD Signal'] = macd(close)
+    for period in EMA_PERIODS:
+        result[f'EMA {period}'] = ema(close, period)
+    result.update(ichimoku(high, low, close))
+    return pd.DataFrame(result)
+
+
+class IndicatorState:
+    """
+    Running EMA, MACD and RSI state as of the last processed day.
+    
+    advance() applies the recurrences of calculateEMA, calculateMACD and
+    calculateRSI to one new close in constant time, so a daily update never
+    recomputes the history. RSI sums are kept the way the JavaScript keeps
+    them: plain sums until `RSI_PERIOD` changes are seen, then average * period.
+    """
+    
+    def __init__(self, last_date: Optional[str] = None, last_close: Optional[float] = None, rows: int = 0,
+                 emas: Optional[Dict[int, float]] = None, macd_signal: Optional[float] = None,
+                 gains: float = 0.0, losses: float = 0.0):
+        self.last_date = last_date
+        self.last_close = last_close
+        self.rows = rows
+        self.emas = emas or {}
+        self.macd_signal = macd_signal
+        self.gains = gains
+        self.losses = losses
+    
+    @staticmethod
+    def ema_periods() -> Tuple[int, ...]:
+        return tuple(sorted(set(EMA_PERIODS) | set(MACD_PERIODS[:2])))
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'IndicatorState':
+        """Build the state for the newest day of a dataset frame with the vectorized functions."""
+        state = cls()
+        if df.empty:
+            return state
+        
+        df = df.sort_values(COLUMN_MAPPING["gregorian_date"], kind='stable')
+        close = _floats(df[COLUMN_MAPPING["close_price"]])
+        state.rows = len(close)
+        state.last_date = _date_strings(df[COLUMN_MAPPING["gregorian_date"]]).iloc[-1]
+        state.last_close = float(close[-1])
+        state.emas = {period: float(ema(close, period)[-1]) for period in cls.ema_periods()}
+        
+        signal = macd(close)[1][-1]
+        state.macd_signal = None if np.isnan(signal) else float(signal)
+        
+        if len(close) - 1 <= RSI_PERIOD:
+            change = np.diff(close)
+            state.gains = float(change[change > 0].sum())
+            state.losses = float(-change[change < 0].sum())
+        else:
+            avg_gain, avg_loss = _wilder_averages(close, RSI_PERIOD)
+            state.gains = float(avg_gain[-1] * RSI_PERIOD)
+            state.losses = float(avg_loss[-1] * RSI_PERIOD)
+        return state
+    
+    def values(self) -> Dict[str, Optional[float]]:
+        """Indicator values of the last processed day (None where the dashboard draws no point yet)."""
+        fast, slow, _ = MACD_PERIODS
+        values = {f'EMA {period}': self.emas.get(period) for period in EMA_PERIODS}
+        values['MACD'] = self.emas[fast] - self.emas[slow] if self.rows >= slow else None
+        values['MACD Signal'] = self.macd_signal
+        values['RSI'] = _rsi_value(self.gains / RSI_PERIOD, self.losses / RSI_PERIOD) if self.rows > RSI_PERIOD else None
+        return values
+    
+    def advance(self, date: str, close: float) -> Dict[str, Optional[float]]:
+        """Add the close of the next day and return that day's values."""
+        close = float(close)
+        if self.rows == 0:
+            self.emas = {period: close for period in self.ema_periods()}
+        else:
+            for period, value in self.emas.items():
+                multiplier = 2 / (period + 1)
+                self.emas[period] = (close * multiplier) + (value * (1 - multiplier))
+            
+            change = close - self.last_close
+            if self.rows <= RSI_PERIOD:
+                if change > 0:
+                    self.gains += change
+                else:
+                    self.losses += abs(change)
+            else:
+                avg_gain = ((self.gains / RSI_PERIOD) * (RSI_PERIOD - 1) + max(change, 0.0)) / RSI_PERIOD
+                avg_loss = ((self.losses / RSI_PERIOD) * (RSI_PERIOD - 1) + max(-change, 0.0)) / RSI_PERIOD
+                self.gains = avg_gain * RSI_PERIOD
+                self.losses = avg_loss * RSI_PERIOD
+        
+        self.rows += 1
+        self.last_date = date
+        self.last_close = close
+        
+        fast, slow, signal_period = MACD_PERIODS
+        if self.rows >= slow:
+            line = self.emas[fast] - self.emas[slow]
+            if self.rows == slow:
+                self.macd_signal = line
+            else:
+                multiplier = 2 / (signal_period + 1)
+                self.macd_signal = (line * multiplier) + (self.macd_signal * (1 - multiplier))
+        
+        return self.values()
+    
+    def advance_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Advance through the rows of a frame newer than the state, oldest first; return their values."""
+        dates = _date_strings(df[COLUMN_MAPPING["gregorian_date"]])
+        order = np.argsort(dates.to_numpy(), kind='stable')
+        closes = _floats(df[COLUMN_MAPPING["close_price"]])
+        
+        rows = []
+        for i in order:
+            values = self.advance(dates.iloc[i], closes[i])
+            rows.append({COLUMN_MAPPING["gregorian_date"]: dates.iloc[i], **values})
+        return pd.DataFrame(rows)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'last_date': self.last_date,
+            'last_close': self.last_close,
+            'rows': self.rows,
+            'emas': {str(period): value for period, value in self.emas.items()},
+            'macd_signal': self.macd_signal,
+            'gains': self.gains,
+            'losses': self.losses
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IndicatorState':
+        return cls(
+            last_date=data.get('last_date'),
+            last_close=data.get('last_close'),
+            rows=data.get('rows', 0),
+            emas={int(period): value for period, value in data.get('emas', {}).items()},
+            macd_signal=data.get('macd_signal'),
+            gains=data.get('gains', 0.0),
+            losses=data.get('losses', 0.0)
+        )
+    
+    def save(self, path: str):
+        """Atomically write the state as JSON."""
+        with atomic_write(path) as f:
+            json.dump(self.to_dict(), f, indent=2)
+    
+    @classmethod
+    def load(cls, path: str) -> Optional['IndicatorState']:
+        """Read a saved state; None if it is missing, unreadable or for other parameters."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = cls.from_dict(json.load(f))
+        except (OSError, ValueError, AttributeError):
+            return None
+        return state if set(state.emas) == set(cls.ema_periods()) or state.rows == 0 else None
@@ -0,0 +1,104 @@
+"""Run the scrapers of several registered instruments in one process."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+from .config import (
+    INSTRUMENTS, INSTRUMENT_WORKERS, SCRAPER_BACKEND,
+    API_URL_TEMPLATE, BACKFILL_WORKERS, HTTP_POOL_SIZE, MAX_REQUESTS_PER_SECOND, DRIVER_POOL_SIZE
+)
+from .utils import setup_logging, RateLimiter
+from .registry import resolve_instruments
+from .backends import create_scraper
+from .http_scraper import create_session
+from .drivers import DriverPool
+
+
+def _run_http(instruments: List[str], workers: int, driver_pool: DriverPool, api_url_template: str,
+              rate_limit: float, check: Optional[int] = None, fill_gaps: bool = False,
+              **scraper_kwargs) -> Dict[str, bool]:
+    """Run HTTP scrapers concurrently over one connection pool and rate limiter."""
+    page_workers = scraper_kwargs.get("workers", BACKFILL_WORKERS)
+    session = create_session(max(HTTP_POOL_SIZE, workers * page_workers))
+    rate_limiter = RateLimiter(rate_limit)
+    
+    def run_one(instrument: str) -> bool:
+        scraper = create_scraper(
+            "http", instrument=instrument, api_url=api_url_template.format(slug=instrument),
+            session=session, rate_limiter=rate_limiter, driver_pool=driver_pool, **scraper_kwargs
+        )
+        return scraper.quick_update(check, fill_gaps=fill_gaps) if check else scraper.run(fill_gaps=fill_gaps)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="instrument") as executor:
+            return dict(zip(instruments, executor.map(run_one, instruments)))
+    finally:
+        session.close()
+
+
+def _run_selenium(instruments: List[str], workers: int, driver_pool: DriverPool, fill_gaps: bool = False,
+                  **scraper_kwargs) -> Dict[str, bool]:
+    """Run Selenium scrapers over a pool of warm Chrome drivers."""
+    def run_one(instrument: str) -> bool:
+        scraper = create_scraper("selenium", instrument=instrument, driver_pool=driver_pool, **scraper_kwargs)
+        return scraper.run(fill_gaps=fill_gaps)
+    
+    with ThreadPoolExecutor(max_workers=min(workers, driver_pool.size), thread_name_prefix="instrument") as executor:
+        return dict(zip(instruments, executor.map(run_one, instruments)))
+
+
+def scrape_instruments(instruments: Optional[List[str]] = None, backend: Optional[str] = None,
+                       workers: int = INSTRUMENT_WORKERS, api_url_template: Optional[str] = None,
+                       rate_limit: float = MAX_REQUESTS_PER_SECOND, driver_pool: Optional[DriverPool] = None,
+                       check: Optional[int] = None, fill_gaps: bool = False, **scraper_kwargs) -> Dict[str, bool]:
+    """
+    Update the datasets of several instruments in one process.
+    
+    Every instrument keeps its own dataset, lock, journal and incremental
+    state. Up to `workers` instruments run at once: with the HTTP backend
+    they share one connection pool and one rate limit towards the site;
+    with the Selenium backend (or the HTTP backend's browser fallback) they
+    borrow warm Chrome instances from a DriverPool. Drivers are only started
+    when needed; pass a long-lived `driver_pool` to keep them warm between calls.
+    
+    Args:
+        instruments: Registry slugs, "all", or None for the default instrument
+        backend: Scraper backend name (defaults to SCRAPER_BACKEND)
+        workers: Instruments scraped concurrently
+        api_url_template: API URL with a {slug} placeholder (defaults to API_URL_TEMPLATE; HTTP backend only)
+        rate_limit: Requests per second shared by all instruments (HTTP backend only)
+        driver_pool: Pool to borrow drivers from; by default a temporary one is used
+        check: Only compare this many of the newest rows on the site, falling
+            back to a regular update when they are all new (HTTP backend only)
+        fill_gaps: Also re-check the site pages that cover gaps of more than
+            SYNC_MAX_GAP_DAYS in the stored dates and add the rows found there
+    
+    Returns:
+        Mapping of instrument slug to whether its run succeeded
+    """
+    logger = setup_logging()
+    instruments = resolve_instruments(instruments)
+    backend = backend or SCRAPER_BACKEND
+    api_url_template = api_url_template or API_URL_TEMPLATE
+    
+    logger.info(f"Scraping {len(instruments)} instruments with the {backend} backend: {instruments}")
+    
+    workers = max(1, workers)
+    pool = driver_pool or DriverPool(min(workers, DRIVER_POOL_SIZE))
+    
+    try:
+        if backend == "http":
+            results = _run_http(instruments, workers, pool, api_url_template, rate_limit, check, fill_gaps,
+                                **scraper_kwargs)
+        else:
+            if check:
+                logger.info("The selenium backend has no quick check; running a regular update")
+            results = _run_selenium(instruments, workers, pool, fill_gaps, **scraper_kwargs)
+    finally:
+        if driver_pool is None:
+            pool.close()
+    
+    for instrument, success in results.items():
+        logger.info(f"{INSTRUMENTS[instrument]['name']}: {'updated' if success else 'FAILED'}")
+    
+    return results
@@ -0,0 +1,226 @@
+"""Run instrumentation: per-stage timers and counters, exported as a JSON run report and a Prometheus textfile."""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional
+
+from .config import METRICS_DIR, METRICS_REPORT_FILENAME, METRICS_TEXTFILE_FILENAME, METRICS_PREFIX
+from .storage import atomic_write
+from .utils import setup_logging
+
+
+# Callables subscribed to every timer, counter and run event
+_hooks: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def subscribe(hook: Callable[[Dict[str, Any]], None]) -> Callable[[Dict[str, Any]], None]:
+    """
+    Call `hook` with every metrics event; usable as a decorator.
+    
+    Events are dicts: {'type': 'timer', 'name', 'seconds', 'labels'} when a
+    timed stage finishes, {'type': 'counter', 'name', 'amount', 'labels'}
+    when a counter moves, and {'type': 'run', 'report'} when a run's
+    metrics are exported. Hooks run on the thread that recorded the event
+    and must be quick; an exception in one is logged and ignored.
+    """
+    _hooks.append(hook)
+    return hook
+
+
+def unsubscribe(hook: Callable[[Dict[str, Any]], None]):
+    """Stop calling a subscribed hook."""
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def _emit(event: Dict[str, Any]):
+    for hook in list(_hooks):
+        try:
+            hook(event)
+        except Exception as e:
+            setup_logging().warning(f"Metrics hook {hook!r} failed: {e}")
+
+
+class TimerStats:
+    """Calls and seconds of one timed stage."""
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_seconds': round(self.total, 6),
+            'max_seconds': round(self.max, 6),
+            'mean_seconds': round(self.total / self.count, 6) if self.count else None
+        }
+
+
+class Metrics:
+    """
+    Timers and counters of one scraper or dataset, identified by labels (e.g. instrument=...).
+    
+    Thread-safe: pipeline stages and backfill workers record into the same
+    object. Timers of concurrent calls add up, so a stage's total can
+    exceed the wall time of the run.
+    """
+    
+    def __init__(self, **labels: str):
+        self.labels = labels
+        self.timers: Dict[str, TimerStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def time(self, name: str):
+        """Time the body of a with block as one call of stage `name`, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+    
+    def observe(self, name: str, seconds: float):
+        """Record one call of stage `name` that took `seconds`."""
+        with self._lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                stats = self.timers[name] = TimerStats()
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+        if _hooks:
+            _emit({'type': 'timer', 'name': name, 'seconds': seconds, 'labels': self.labels})
+    
+    def increment(self, name: str, amount: int = 1):
+        """Add `amount` to counter `name`."""
+        if not amount:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+        if _hooks:
+            _emit({'type': 'counter', 'name': name, 'amount': amount, 'labels': self.labels})
+    
+    def reset(self):
+        with self._lock:
+            self.timers = {}
+            self.counters = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'labels': dict(self.labels),
+                'timers': {name: stats.to_dict() for name, stats in sorted(self.timers.items())},
+                'counters': dict(sorted(self.counters.items()))
+            }
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _sample(name: str, labels: Dict[str, str], value) -> str:
+    label_text = ','.join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+    return f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}"
+
+
+class MetricsRegistry:
+    """The Metrics of every scraper and dataset in the process, keyed by their labels."""
+    
+    def __init__(self):
+        self._metrics: Dict[tuple, Metrics] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, **labels: str) -> Metrics:
+        """The Metrics for a set of labels, created on first use."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                metrics = self._metrics[key] = Metrics(**labels)
+            return metrics
+    
+    def reset(self):
+        """Zero every timer and counter, e.g. at the start of a run."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for item in metrics:
+            item.reset()
+    
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Timers and counters of every labelled Metrics that recorded anything."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshot = [item.to_dict() for item in metrics]
+        return [item for item in snapshot if item['timers'] or item['counters']]
+    
+    def report(self, started: datetime, success: Optional[bool] = None, **info) -> Dict[str, Any]:
+        """The JSON run report: when the run started and ended, whether it succeeded, and every metric."""
+        finished = datetime.now()
+        return {
+            'started': started.isoformat(timespec='seconds'),
+            'finished': finished.isoformat(timespec='seconds'),
+            'duration_seconds': round((finished - started).total_seconds(), 3),
+            'success': success,
+            **info,
+            'metrics': self.snapshot()
+        }
+    
+    def prometheus_text(self, report: Dict[str, Any]) -> str:
+        """A run report in the Prometheus text exposition format, as gauges describing the last run."""
+        families: Dict[str, tuple] = {}
+        
+        def add(name: str, help_text: str, labels: Dict[str, str], value):
+            families.setdefault(f"{METRICS_PREFIX}_{name}", (help_text, []))[1].append(_sample(
+                f"{METRICS_PREFIX}_{name}", labels, value
+            ))
+        
+        for item in report['metrics']:
+            for stage, stats in item['timers'].items():
+                labels = {**item['labels'], 'stage': stage}
+                add('stage_seconds', "Seconds spent in each instrumented stage during the last run.",
+                    labels, stats['total_seconds'])
+                add('stage_calls', "Calls of each instrumented stage during the last run.", labels, stats['count'])
+                add('stage_max_seconds', "Slowest call of each instrumented stage during the last run.",
+                    labels, stats['max_seconds'])
+            for counter, value in item['counters'].items():
+                add(counter, f"{counter.replace('_', ' ').capitalize()} during the last run.", item['labels'], value)
+        
+        finished = datetime.fromisoformat(report['finished'])
+        add('last_run_timestamp_seconds', "When the last run finished (Unix time).", {}, round(finished.timestamp()))
+        add('last_run_duration_seconds', "Wall time of the last run.", {}, report['duration_seconds'])
+        if report['success'] is not None:
+            add('last_run_success', "1 if the last run succeeded, 0 if it failed.", {}, int(report['success']))
+        
+        lines = []
+        for name, (help_text, samples) in families.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", *samples]
+        return '\n'.join(lines) + '\n'
+    
+    def export(self, started: datetime, success: Optional[bool] = None, directory: str = METRICS_DIR,
+               **info) -> Dict[str, Any]:
+        """
+        Write the run report (JSON) and the Prometheus textfile into `directory` and notify hooks.
+        
+        Both files are replaced atomically, so a collector never reads a
+        half-written one. Returns the report.
+        """
+        report = self.report(started, success, **info)
+        os.makedirs(directory, exist_ok=True)
+        with atomic_write(os.path.join(directory, METRICS_REPORT_FILENAME)) as f:
+            f.write(json.dumps(report, indent=2))
+        with atomic_write(os.path.join(directory, METRICS_TEXTFILE_FILENAME)) as f:
+            f.write(self.prometheus_text(report))
+        if _hooks:
+            _emit({'type': 'run', 'report': report})
+        return report
+
+
+# Shared by every scraper and DataManager in the process
+REGISTRY = MetricsRegistry()
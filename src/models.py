@@ -0,0 +1,145 @@
+"""Compact in-memory representation of scraped price rows."""
+
+from datetime import date
+from typing import List, Dict, Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .config import COLUMN_MAPPING
+
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def date_to_ordinal(date_text: Optional[str]) -> Optional[int]:
+    """Convert a YYYY/MM/DD date string to its proleptic Gregorian day number."""
+    if not date_text:
+        return None
+    
+    try:
+        year, month, day = date_text.split('/')
+        return date(int(year), int(month), int(day)).toordinal()
+    except ValueError:
+        return None
+
+
+def ordinal_to_date(day: Optional[int]) -> Optional[str]:
+    """Convert a day number back to a YYYY/MM/DD date string."""
+    if day is None:
+        return None
+    
+    value = date.fromordinal(day)
+    return f"{value.year:04d}/{value.month:02d}/{value.day:02d}"
+
+
+def ordinals_to_dates(days: List[int]) -> List[str]:
+    """Vectorized ordinal_to_date for a whole column of day numbers."""
+    offsets = np.asarray(days, dtype='int64') - EPOCH_ORDINAL
+    iso_dates = np.datetime_as_string(offsets.astype('datetime64[D]'))
+    return [iso_date.replace('-', '/') for iso_date in iso_dates.tolist()]
+
+
+def dates_to_ordinals(dates: pd.Series) -> np.ndarray:
+    """
+    Vectorized date_to_ordinal for a column of YYYY/MM/DD strings.
+    
+    Invalid or missing dates become -1.
+    """
+    iso_dates = dates.astype(str).str.replace('/', '-', regex=False)
+    try:
+        return np.asarray(iso_dates, dtype='datetime64[D]').astype('int64') + EPOCH_ORDINAL
+    except ValueError:
+        return np.array([date_to_ordinal(value) or -1 for value in dates.astype(str)], dtype='int64')
+
+
+class PriceRow:
+    """
+    One day of OHLC data.
+    
+    Uses ``__slots__`` and keeps the Gregorian date as an ordinal day number,
+    so large scrapes need a fraction of the memory of per-row dictionaries
+    and dates can be compared without parsing.
+    """
+    
+    __slots__ = ('open_price', 'low_price', 'high_price', 'close_price',
+                 'change_amount', 'change_percent', 'day', 'persian_date')
+    
+    def __init__(self, open_price: Optional[int], low_price: Optional[int], high_price: Optional[int],
+                 close_price: Optional[int], change_amount: Optional[str], change_percent: Optional[str],
+                 day: Optional[int], persian_date: Optional[str]):
+        self.open_price = open_price
+        self.low_price = low_price
+        self.high_price = high_price
+        self.close_price = close_price
+        self.change_amount = change_amount
+        self.change_percent = change_percent
+        self.day = day
+        self.persian_date = persian_date
+    
+    @property
+    def gregorian_date(self) -> Optional[str]:
+        return ordinal_to_date(self.day)
+    
+    def is_valid(self) -> bool:
+        """Same rule as utils.validate_row_data: a date and a close price are required."""
+        return self.day is not None and self.close_price is not None
+    
+    @classmethod
+    def from_dict(cls, row_data: Dict[str, Any]) -> 'PriceRow':
+        """Build a row from a dictionary keyed by the CSV column names."""
+        return cls(
+            row_data.get(COLUMN_MAPPING["open_price"]),
+            row_data.get(COLUMN_MAPPING["low_price"]),
+            row_data.get(COLUMN_MAPPING["high_price"]),
+            row_data.get(COLUMN_MAPPING["close_price"]),
+            row_data.get(COLUMN_MAPPING["change_amount"]),
+            row_data.get(COLUMN_MAPPING["change_percent"]),
+            date_to_ordinal(row_data.get(COLUMN_MAPPING["gregorian_date"])),
+            row_data.get(COLUMN_MAPPING["persian_date"])
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the row as a dictionary keyed by the CSV column names."""
+        return {
+            COLUMN_MAPPING["open_price"]: self.open_price,
+            COLUMN_MAPPING["low_price"]: self.low_price,
+            COLUMN_MAPPING["high_price"]: self.high_price,
+            COLUMN_MAPPING["close_price"]: self.close_price,
+            COLUMN_MAPPING["change_amount"]: self.change_amount,
+            COLUMN_MAPPING["change_percent"]: self.change_percent,
+            COLUMN_MAPPING["gregorian_date"]: self.gregorian_date,
+            COLUMN_MAPPING["persian_date"]: self.persian_date
+        }
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PriceRow):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    def __repr__(self) -> str:
+        return f"PriceRow({self.gregorian_date}, close={self.close_price})"
+
+
+def rows_to_frame(rows: List[Union[PriceRow, Dict[str, Any]]]) -> pd.DataFrame:
+    """
+    Build a DataFrame in CSV column order from scraped rows.
+    
+    This is the boundary where compact rows become a DataFrame; plain
+    dictionaries are accepted too.
+    """
+    column_order = list(COLUMN_MAPPING.values())
+    
+    if not rows or not isinstance(rows[0], PriceRow):
+        return pd.DataFrame(rows).reindex(columns=column_order)
+    
+    return pd.DataFrame({
+        COLUMN_MAPPING["open_price"]: [row.open_price for row in rows],
+        COLUMN_MAPPING["low_price"]: [row.low_price for row in rows],
+        COLUMN_MAPPING["high_price"]: [row.high_price for row in rows],
+        COLUMN_MAPPING["close_price"]: [row.close_price for row in rows],
+        COLUMN_MAPPING["change_amount"]: [row.change_amount for row in rows],
+        COLUMN_MAPPING["change_percent"]: [row.change_percent for row in rows],
+        COLUMN_MAPPING["gregorian_date"]: ordinals_to_dates([row.day for row in rows]),
+        COLUMN_MAPPING["persian_date"]: [row.persian_date for row in rows]
+    }, columns=column_order)
@@ -0,0 +1,331 @@
+"""Streaming scrape pipeline: fetch, parse, validate and persist pages in bounded stages."""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from .config import PIPELINE_QUEUE_SIZE, PIPELINE_BATCH_SIZE
+from .utils import strip_html, format_progress
+from .models import PriceRow
+from .sync import DateIndex, compare_page
+
+
+# Marks the end of the stream on a stage queue
+_END = object()
+
+
+class _Aborted(Exception):
+    """Raised inside a stage when another stage failed."""
+
+
+class StageStats:
+    """Throughput counters of one pipeline stage."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.pages = 0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.busy = 0.0  # seconds spent working
+        self.blocked = 0.0  # seconds waiting for room in the next queue (backpressure)
+        self.error: Optional[str] = None  # why the stage failed, if it did
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pages': self.pages,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'busy_seconds': round(self.busy, 3),
+            'blocked_seconds': round(self.blocked, 3),
+            'rows_per_second': round(self.rows_out / self.busy) if self.busy else None,
+            'error': self.error
+        }
+
+
+class ScrapePipeline:
+    """
+    Producer/consumer pipeline for one HTTP scrape, one thread per stage.
+    
+    fetch -> parse -> validate -> sink are connected by bounded queues: when a
+    stage falls behind, the queue in front of it fills up and the earlier
+    stages block, so only a handful of pages are in memory at any time. The
+    sink flushes every `batch_size` rows. A full scrape is staged next to the
+    dataset with a checkpoint and resumes from it after a failure; an
+    incremental one is appended to the dataset and stops fetching once a
+    page reaches the stored dates.
+    """
+    
+    def __init__(self, scraper, incremental: bool = False, date_index: Optional[DateIndex] = None,
+                 batch_size: int = PIPELINE_BATCH_SIZE, queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.scraper = scraper
+        self.data_manager = scraper.data_manager
+        self.logger = scraper.logger
+        self.incremental = incremental
+        self.date_index = date_index if date_index is not None and len(date_index) else None
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self.stats = {name: StageStats(name) for name in ('fetch', 'parse', 'validate', 'sink')}
+        self.total_records = None
+        self.resumed_from = 0
+        self._abort = threading.Event()
+        self._stop_fetching = threading.Event()
+        self.error: Optional[BaseException] = None  # first error of any stage
+    
+    def _put(self, outbox: queue.Queue, item, stats: StageStats):
+        """Hand an item to the next stage, blocking while its queue is full."""
+        start = time.perf_counter()
+        while True:
+            if self._abort.is_set():
+                raise _Aborted()
+            try:
+                outbox.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        stats.blocked += time.perf_counter() - start
+    
+    def _get(self, inbox: queue.Queue):
+        """Take the next item from the previous stage."""
+        while True:
+            if self._abort.is_set():
+                raise _Aborted()
+            try:
+                return inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+    
+    def _fetch_stage(self, outbox: queue.Queue):
+        """
+        Fetch pages newest first, keeping up to `workers` requests in flight, in site order.
+        
+        A failed request ends the stream instead of aborting it, so the pages
+        already fetched are still parsed and flushed before the run reports it.
+        """
+        stats = self.stats['fetch']
+        try:
+            self._fetch_pages(outbox, stats)
+        except _Aborted:
+            raise
+        except Exception as e:
+            self._fail(stats, e)
+            self.logger.error(f"Fetching stopped: {e}")
+        
+        self._put(outbox, _END, stats)
+    
+    def _fetch_pages(self, outbox: queue.Queue, stats: StageStats):
+        """Body of the fetch stage."""
+        page_size = self.scraper.page_size
+        
+        start = time.perf_counter()
+        first_page = self.scraper._fetch_page(0, page_size)
+        stats.busy += time.perf_counter() - start
+        self.total_records = int(first_page.get("recordsFiltered", first_page.get("recordsTotal", 0)))
+        
+        if not self.incremental:
+            self.resumed_from = self.data_manager.start_staging(total=self.total_records, page_size=page_size)
+            if self.resumed_from:
+                self.logger.info(f"Resuming staged scrape at row {self.resumed_from + 1} of {self.total_records}")
+        
+        offsets = deque(range(self.resumed_from, self.total_records, page_size))
+        if offsets and offsets[0] == 0:
+            offsets.popleft()
+            stats.pages += 1
+            stats.rows_out += len(first_page.get("data", []))
+            self._put(outbox, (0, first_page.get("data", [])), stats)
+        
+        executor = ThreadPoolExecutor(max_workers=self.scraper.workers, thread_name_prefix="pipeline-fetch")
+        in_flight = deque()
+        try:
+            while not self._stop_fetching.is_set():
+                while offsets and len(in_flight) < self.scraper.workers:
+                    offset = offsets.popleft()
+                    in_flight.append((offset, executor.submit(self.scraper._fetch_page, offset, page_size)))
+                if not in_flight:
+                    break
+                
+                offset, future = in_flight.popleft()
+                start = time.perf_counter()
+                raw_rows = future.result().get("data", [])
+                stats.busy += time.perf_counter() - start
+                
+                if not raw_rows:
+                    self.logger.warning("No data returned for this page. Stopping.")
+                    break
+                
+                stats.pages += 1
+                stats.rows_out += len(raw_rows)
+                self._put(outbox, (offset, raw_rows), stats)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _parse_stage(self, inbox: queue.Queue, outbox: queue.Queue):
+        """Clean raw cells into rows, a page at a time with the batch cleaners."""
+        stats = self.stats['parse']
+        
+        while True:
+            item = self._get(inbox)
+            if item is _END:
+                break
+            
+            offset, raw_rows = item
+            start = time.perf_counter()
+            rows = self.scraper._parse_rows([[strip_html(cell) for cell in raw_row] for raw_row in raw_rows])
+            rows = [row for row in rows if row is not None]
+            stats.busy += time.perf_counter() - start
+            stats.pages += 1
+            stats.rows_in += len(raw_rows)
+            stats.rows_out += len(rows)
+            self._put(outbox, (offset, rows), stats)
+        
+        self._put(outbox, _END, stats)
+    
+    def _validate_stage(self, inbox: queue.Queue, outbox: queue.Queue):
+        """Drop invalid rows and, when updating, rows that are already stored."""
+        stats = self.stats['validate']
+        reached_stored = False
+        
+        while True:
+            item = self._get(inbox)
+            if item is _END:
+                break
+            if reached_stored:
+                continue  # Pages fetched ahead of the stop signal
+            
+            offset, rows = item
+            start = time.perf_counter()
+            valid_rows = [row for row in rows if row.is_valid()]
+            if len(valid_rows) < len(rows):
+                self.logger.warning(f"Dropped {len(rows) - len(valid_rows)} invalid rows from rows {offset + 1}+")
+            self.scraper.metrics.increment('rows_scraped', len(valid_rows))
+            self.scraper.metrics.increment('rows_invalid', len(rows) - len(valid_rows))
+            
+            if self.date_index is not None:
+                comparison = compare_page(self.date_index, valid_rows)
+                valid_rows = comparison['new']
+                self.scraper._note_revisions(comparison['changed'])
+                if comparison['reached_stored']:
+                    self.logger.info(f"Reached existing data. Added {len(valid_rows)} new records from this page")
+                    reached_stored = True
+                    self._stop_fetching.set()
+            
+            stats.busy += time.perf_counter() - start
+            stats.pages += 1
+            stats.rows_in += len(rows)
+            stats.rows_out += len(valid_rows)
+            self._put(outbox, (offset, valid_rows), stats)
+        
+        self._put(outbox, _END, stats)
+    
+    def _flush(self, rows: List[PriceRow], next_offset: int):
+        """Persist one batch: staged for a full scrape, appended for an update."""
+        if self.incremental:
+            if not self.data_manager.append_new_data(rows):
+                raise IOError(f"Failed to append rows to {self.data_manager.csv_path}")
+        else:
+            self.data_manager.stage_rows(rows, next_offset)
+    
+    def _sink_stage(self, inbox: queue.Queue):
+        """Collect rows and flush them every `batch_size` rows."""
+        stats = self.stats['sink']
+        batch = []
+        next_offset = self.resumed_from
+        
+        while True:
+            item = self._get(inbox)
+            if item is not _END:
+                offset, rows = item
+                batch.extend(rows)
+                next_offset = offset + self.scraper.page_size
+                stats.pages += 1
+                stats.rows_in += len(rows)
+            
+            # Flush at page boundaries only, so the checkpoint offset is exact
+            if batch and (len(batch) >= self.batch_size or item is _END):
+                start = time.perf_counter()
+                self._flush(batch, next_offset)
+                stats.busy += time.perf_counter() - start
+                stats.rows_out += len(batch)
+                batch = []
+                self.logger.info(format_progress(next_offset, self.total_records or 0, self.scraper.start_time))
+            
+            if item is _END:
+                break
+    
+    def _fail(self, stats: StageStats, error: BaseException):
+        """Record a stage failure; the first one is the error of the run."""
+        stats.error = f"{type(error).__name__}: {error}"
+        if self.error is None:
+            self.error = error
+    
+    def _run_stage(self, name: str, target, *queues):
+        try:
+            target(*queues)
+        except _Aborted:
+            pass
+        except BaseException as e:
+            self._fail(self.stats[name], e)
+            self._abort.set()
+    
+    def run(self) -> Dict[str, Any]:
+        """
+        Run all stages to completion and return the per-stage counters.
+        
+        `failed_stage` names the first stage that failed, or is None; the
+        error itself is kept in `self.error`. A failed full scrape is not
+        committed and keeps its staged rows and checkpoint, so the next run
+        resumes.
+        """
+        fetched, parsed, validated = (queue.Queue(maxsize=self.queue_size) for _ in range(3))
+        stages = [
+            ('fetch', self._fetch_stage, (fetched,)),
+            ('parse', self._parse_stage, (fetched, parsed)),
+            ('validate', self._validate_stage, (parsed, validated)),
+            ('sink', self._sink_stage, (validated,)),
+        ]
+        threads = [
+            threading.Thread(target=self._run_stage, args=(name, target, *queues), name=f"pipeline-{name}")
+            for name, target, queues in stages
+        ]
+        
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except BaseException:
+            # Interrupted: stop the stages before handing the interrupt on
+            self._abort.set()
+            for thread in threads:
+                thread.join()
+            raise
+        elapsed = time.perf_counter() - start
+        
+        if self.error is None and not self.incremental:
+            try:
+                if not (self.stats['sink'].rows_out or self.resumed_from):
+                    self.logger.info("No new data to save")
+                    self.data_manager.staging.discard()
+                elif not self.data_manager.commit_staged():
+                    raise IOError(f"Failed to commit staged rows to {self.data_manager.csv_path}")
+            except Exception as e:
+                self._fail(self.stats['sink'], e)
+        
+        if self.error is None and self.incremental and not self.data_manager.replace_rows(self.scraper.revised_data):
+            self._fail(self.stats['sink'], IOError(f"Failed to replace revised rows in {self.data_manager.csv_path}"))
+        
+        report = {name: stage.to_dict() for name, stage in self.stats.items()}
+        for name, counters in report.items():
+            self.logger.info(
+                f"Pipeline {name:<8} {counters['pages']:>5} pages  {counters['rows_out']:>8} rows out  "
+                f"busy {counters['busy_seconds']:7.2f}s  blocked {counters['blocked_seconds']:7.2f}s"
+                + (f"  failed: {counters['error']}" if counters['error'] else "")
+            )
+        self.logger.info(f"Pipeline finished in {elapsed:.2f}s")
+        
+        failed_stage = next((name for name, counters in report.items() if counters['error']), None)
+        return {'elapsed_seconds': round(elapsed, 3), 'resumed_from': self.resumed_from,
+                'failed_stage': failed_stage, 'stages': report}
@@ -0,0 +1,297 @@
+"""
+Opt-in profiling of a whole run, switched on from main.py.
+
+Nothing here is imported or installed unless a profiling option is given,
+so normal runs pay nothing for it.
+"""
+
+import cProfile
+import functools
+import inspect
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+from .config import (
+    PROFILE_DIR, PROFILE_SAMPLE_INTERVAL, PROFILE_TOP_N, PROFILE_STATS_FILENAME, PROFILE_REPORT_FILENAME,
+    PROFILE_STACKS_FILENAME, PROFILE_MEMORY_FILENAME
+)
+from .utils import setup_logging
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+class ThreadProfiler:
+    """
+    cProfile over the calling thread and every thread started while it runs.
+    
+    cProfile only sees the thread that enabled it, so each new thread gets
+    its own profiler (via threading.setprofile) and the results are merged.
+    Threads still running when profiling stops are left out: a profiler can
+    only be stopped from its own thread.
+    """
+    
+    def __init__(self):
+        self._profiles = []
+        self._lock = threading.Lock()
+    
+    def _profile_thread(self, frame, event, arg):
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append((threading.current_thread(), profile))
+        profile.enable()
+    
+    def start(self):
+        self._profiles = [(threading.current_thread(), cProfile.Profile())]
+        threading.setprofile(self._profile_thread)
+        self._profiles[0][1].enable()
+    
+    def stop(self) -> pstats.Stats:
+        self._profiles[0][1].disable()
+        threading.setprofile(None)
+        with self._lock:
+            main, *others = [profile for thread, profile in self._profiles]
+            threads = [thread for thread, profile in self._profiles[1:]]
+        stats = pstats.Stats(main)
+        for thread, profile in zip(threads, others):
+            if not thread.is_alive():
+                stats.add(profile)
+        return stats
+    
+    def write(self, stats: pstats.Stats, directory: str) -> List[str]:
+        """Dump the raw stats (for snakeviz, gprof2dot, ...) and a text summary of the top functions."""
+        stats_path = os.path.join(directory, PROFILE_STATS_FILENAME)
+        report_path = os.path.join(directory, PROFILE_REPORT_FILENAME)
+        stats.dump_stats(stats_path)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            stats.stream = f
+            for order in ('cumulative', 'tottime'):
+                f.write(f"Top {PROFILE_TOP_N} functions by {order} time\n")
+                stats.sort_stats(order).print_stats(PROFILE_TOP_N)
+        return [stats_path, report_path]
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of every thread at a fixed interval from a background thread.
+    
+    Cheaper than cProfile and does not distort fast functions; the output is
+    collapsed stacks ("thread;outer;inner count" per line), the input of
+    flamegraph.pl, speedscope and inferno.
+    """
+    
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    
+    def _sample(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            # Worker numbers would split one pool into many towers of the flamegraph
+            names = {thread.ident: re.sub(r'[-_]\d+$', '', thread.name) for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_name(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, 'thread'))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+    
+    def write(self, stacks: Counter, directory: str) -> List[str]:
+        path = os.path.join(directory, PROFILE_STACKS_FILENAME)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return [path]
+
+
+def _mib(size: int) -> str:
+    return f"{size / 2 ** 20:+.2f} MiB"
+
+
+class MemoryTracer:
+    """
+    tracemalloc snapshots around every scrape_all_data() and append_new_data() call.
+    
+    The methods are wrapped on their classes only while tracing and
+    restored afterwards. Each outermost call records what it left allocated
+    (the difference between the snapshots before and after it) by source
+    line, and the peak of traced memory during the call. Snapshots cover
+    every thread, so calls running concurrently see each other's allocations.
+    """
+    
+    def __init__(self, top: int = PROFILE_TOP_N):
+        self.top = top
+        self.calls: List[Dict[str, Any]] = []
+        self._patched = []
+        self._active = threading.local()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _targets() -> list:
+        from .data_manager import DataManager
+        from .scraper import DollarScraper
+        from .http_scraper import HttpScraper
+        classes = [DollarScraper, HttpScraper]
+        try:
+            from .async_scraper import AsyncHttpScraper
+            classes.append(AsyncHttpScraper)
+        except ImportError:  # aiohttp is only needed by the asyncio backend
+            pass
+        targets = [(cls, 'scrape_all_data') for cls in classes]
+        return targets + [(DataManager, 'append_new_data')]
+    
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>')
+        ))
+    
+    def _begin(self, name: str) -> Optional[tuple]:
+        active = self._active.__dict__.setdefault('names', Counter())
+        active[name] += 1
+        if active[name] > 1:
+            return None  # Inside a call of the same method, e.g. a backend falling back to its parent class
+        tracemalloc.reset_peak()
+        return self._snapshot(), time.perf_counter()
+    
+    def _end(self, name: str, label: str, started: Optional[tuple]):
+        self._active.names[name] -= 1
+        if started is None:
+            return
+        before, start = started
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        after = self._snapshot()
+        differences = after.compare_to(before, 'lineno')
+        with self._lock:
+            self.calls.append({
+                'label': label,
+                'seconds': seconds,
+                'retained': sum(difference.size_diff for difference in differences),
+                'peak': peak,
+                'top': differences[:self.top]
+            })
+    
+    def _wrap(self, cls, name: str):
+        function = cls.__dict__[name]
+        label = f"{cls.__name__}.{name}"
+        
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def traced(*args, **kwargs):
+                started = self._begin(name)
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    self._end(name, label, started)
+        else:
+            @functools.wraps(function)
+            def traced(*args, **kwargs):
+                started = self._begin(name)
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self._end(name, label, started)
+        
+        setattr(cls, name, traced)
+        self._patched.append((cls, name, function))
+    
+    def start(self):
+        tracemalloc.start()
+        for cls, name in self._targets():
+            if name in cls.__dict__:
+                self._wrap(cls, name)
+    
+    def stop(self) -> tracemalloc.Snapshot:
+        for cls, name, function in reversed(self._patched):
+            setattr(cls, name, function)
+        self._patched = []
+        snapshot = self._snapshot()
+        tracemalloc.stop()
+        return snapshot
+    
+    def write(self, snapshot: tracemalloc.Snapshot, directory: str) -> List[str]:
+        """Write the calls' top allocators and what was still allocated when tracing stopped."""
+        path = os.path.join(directory, PROFILE_MEMORY_FILENAME)
+        with open(path, 'w', encoding='utf-8') as f:
+            for number, call in enumerate(self.calls, 1):
+                f.write(f"#{number} {call['label']}: {call['seconds']:.2f}s, {_mib(call['retained'])} retained, "
+                        f"peak {call['peak'] / 2 ** 20:.2f} MiB traced\n")
+                for difference in call['top']:
+                    f.write(f"    {_mib(difference.size_diff):>14} {difference.count_diff:+9d} blocks  "
+                            f"{difference.traceback}\n")
+                f.write("\n")
+            f.write(f"Top {self.top} allocators still live at the end of the run\n")
+            for statistic in snapshot.statistics('lineno')[:self.top]:
+                f.write(f"    {statistic.size / 2 ** 20:12.2f} MiB {statistic.count:9d} blocks  "
+                        f"{statistic.traceback}\n")
+        return [path]
+
+
+@contextmanager
+def profile_run(directory: str = PROFILE_DIR, mode: Optional[str] = None, trace_memory: bool = False):
+    """
+    Profile the body of a with block and write the results into `directory`.
+    
+    Args:
+        directory: Where the output files go (created if missing)
+        mode: "cprofile" for deterministic per-function stats (pstats and a
+            text summary) or "sample" for collapsed stacks; None for neither
+        trace_memory: Also snapshot memory around scrapes and appends
+    """
+    if mode is not None and mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profiling mode {mode!r}; choose from {', '.join(PROFILE_MODES)}")
+    logger = setup_logging()
+    profilers = []
+    if trace_memory:
+        profilers.append(MemoryTracer())
+    if mode == "cprofile":
+        profilers.append(ThreadProfiler())
+    elif mode == "sample":
+        profilers.append(SamplingProfiler())
+    
+    for profiler in profilers:
+        profiler.start()
+    try:
+        yield
+    finally:
+        results = [(profiler, profiler.stop()) for profiler in reversed(profilers)]
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for profiler, result in results:
+            try:
+                paths += profiler.write(result, directory)
+            except OSError as e:
+                logger.error(f"Could not write the {type(profiler).__name__} output: {e}")
+        if paths:
+            logger.info(f"Profiling output written to {', '.join(paths)}")
@@ -0,0 +1,24 @@
+"""Look up instruments in the registry without importing any scraper backend."""
+
+from typing import List, Optional
+
+from .config import INSTRUMENTS, DEFAULT_INSTRUMENT
+
+
+def resolve_instruments(names: Optional[List[str]] = None) -> List[str]:
+    """
+    Validate instrument slugs against the registry.
+    
+    None selects the default instrument and "all" selects every registered one.
+    """
+    if not names:
+        return [DEFAULT_INSTRUMENT]
+    if "all" in names:
+        return list(INSTRUMENTS)
+    
+    unknown = [name for name in names if name not in INSTRUMENTS]
+    if unknown:
+        raise ValueError(f"Unknown instruments: {unknown}. Choose from {sorted(INSTRUMENTS)}")
+    
+    # Drop duplicates, keep the requested order
+    return list(dict.fromkeys(names))
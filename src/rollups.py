@@ -0,0 +1,171 @@
+"""OHLC rollups: weekly, monthly, Persian month and Persian year bars, materialized and extended incrementally."""
+
+import bisect
+import json
+import os
+from typing import Dict, Any, Optional, List
+
+import pandas as pd
+
+from .config import COLUMN_MAPPING, ROLLUP_PERIODS, WEEK_END
+from .indicators import _date_strings
+from .storage import atomic_write
+from .utils import DATE_PATTERN
+
+DATE = COLUMN_MAPPING["gregorian_date"]
+PERSIAN_DATE = COLUMN_MAPPING["persian_date"]
+OHLC = {name: COLUMN_MAPPING[f"{name}_price"] for name in ('open', 'high', 'low', 'close')}
+
+PERIOD, FIRST_DATE, LAST_DATE, DAYS = 'Period', 'First Date', 'Last Date', 'Days'
+ROLLUP_COLUMNS = [PERIOD, FIRST_DATE, LAST_DATE, *OHLC.values(), DAYS]
+
+
+def _daily_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Dates, Persian dates and OHLC of a dataset frame (CSV or typed layout), oldest first."""
+    daily = pd.DataFrame({
+        DATE: pd.to_datetime(_date_strings(df[DATE]), format='%Y/%m/%d').to_numpy(),
+        PERSIAN_DATE: df[PERSIAN_DATE].astype(str).to_numpy()
+    })
+    for column in OHLC.values():
+        daily[column] = pd.to_numeric(df[column]).astype('int64').to_numpy()
+    return daily.sort_values(DATE, kind='stable').reset_index(drop=True)
+
+
+def period_keys(daily: pd.DataFrame, period: str) -> pd.Series:
+    """
+    Label of the period each day of a daily frame falls in.
+    
+    Persian periods come from the Persian Date column (1405/05 or 1405);
+    a day whose Persian date does not parse is put in the period of the
+    day before it.
+    """
+    if period == 'weekly':
+        return daily[DATE].dt.to_period(f'W-{WEEK_END}').astype(str)
+    if period == 'monthly':
+        return daily[DATE].dt.to_period('M').astype(str)
+    if period in ('persian_month', 'persian_year'):
+        persian = daily[PERSIAN_DATE]
+        persian = persian.where(persian.str.fullmatch(DATE_PATTERN.pattern).fillna(False))
+        return persian.str[:7 if period == 'persian_month' else 4].ffill()
+    raise ValueError(f"Unknown rollup period: {period}")
+
+
+def _aggregate(daily: pd.DataFrame, keys: pd.Series) -> pd.DataFrame:
+    bars = daily.groupby(keys.to_numpy(), sort=False).agg(**{
+        FIRST_DATE: (DATE, 'first'), LAST_DATE: (DATE, 'last'),
+        OHLC['open']: (OHLC['open'], 'first'), OHLC['high']: (OHLC['high'], 'max'),
+        OHLC['low']: (OHLC['low'], 'min'), OHLC['close']: (OHLC['close'], 'last'),
+        DAYS: (DATE, 'size')
+    })
+    bars.insert(0, PERIOD, bars.index)
+    return bars.reset_index(drop=True)
+
+
+def aggregate(daily: pd.DataFrame, period: str) -> pd.DataFrame:
+    """OHLC bars of a daily frame for one of ROLLUP_PERIODS, oldest first, in ROLLUP_COLUMNS."""
+    return _aggregate(daily, period_keys(daily, period))
+
+
+def _to_columns(bars: pd.DataFrame) -> Dict[str, list]:
+    columns = {PERIOD: bars[PERIOD].tolist()}
+    for column in (FIRST_DATE, LAST_DATE):
+        columns[column] = bars[column].dt.strftime('%Y/%m/%d').tolist()
+    for column in (*OHLC.values(), DAYS):
+        columns[column] = bars[column].astype('int64').tolist()
+    return columns
+
+
+class Rollups:
+    """
+    Materialized OHLC bars for every ROLLUP_PERIODS period, oldest first.
+    
+    Bars are kept as plain column lists, so query() finds its range with a
+    binary search on the dates and copies out only the bars it returns.
+    extend() folds days newer than the last one into the trailing bar of
+    each period or starts new bars, so an append never regroups the history.
+    """
+    
+    def __init__(self, bars: Optional[Dict[str, Dict[str, list]]] = None, last_date: Optional[str] = None,
+                 csv_signature: Optional[str] = None):
+        self.bars = bars or {period: {column: [] for column in ROLLUP_COLUMNS} for period in ROLLUP_PERIODS}
+        self.last_date = last_date
+        self.csv_signature = csv_signature
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, csv_signature: Optional[str] = None) -> 'Rollups':
+        """Group a whole dataset frame into bars (vectorized)."""
+        rollups = cls(csv_signature=csv_signature)
+        if df.empty:
+            return rollups
+        
+        daily = _daily_frame(df)
+        rollups.bars = {period: _to_columns(aggregate(daily, period)) for period in ROLLUP_PERIODS}
+        rollups.last_date = daily[DATE].iloc[-1].strftime('%Y/%m/%d')
+        return rollups
+    
+    def extend(self, df: pd.DataFrame, csv_signature: Optional[str] = None):
+        """Add the rows of a frame newer than `last_date`; only the trailing bar of each period changes."""
+        self.csv_signature = csv_signature
+        if df.empty:
+            return
+        
+        # Appends bring a few days, which are cheaper to fold in one by one than to group
+        daily = _daily_frame(df)
+        dates = daily[DATE].dt.strftime('%Y/%m/%d').tolist()
+        prices = [daily[column].tolist() for column in OHLC.values()]
+        for period, bars in self.bars.items():
+            keys = period_keys(daily, period).tolist()
+            for key, date, open_price, high, low, close in zip(keys, dates, *prices):
+                # A day without a parsable Persian date stays in the period of the day before
+                if bars[PERIOD] and (key == bars[PERIOD][-1] or not isinstance(key, str)):
+                    bars[LAST_DATE][-1] = date
+                    bars[OHLC['high']][-1] = max(bars[OHLC['high']][-1], high)
+                    bars[OHLC['low']][-1] = min(bars[OHLC['low']][-1], low)
+                    bars[OHLC['close']][-1] = close
+                    bars[DAYS][-1] += 1
+                    continue
+                for column, value in zip(ROLLUP_COLUMNS, (key, date, date, open_price, high, low, close, 1)):
+                    bars[column].append(value)
+        self.last_date = daily[DATE].iloc[-1].strftime('%Y/%m/%d')
+    
+    def query(self, period: str, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Bars of `period` that overlap the Gregorian dates start..end (YYYY/MM/DD, inclusive).
+        
+        Takes time proportional to the number of bars returned.
+        """
+        if period not in self.bars:
+            raise ValueError(f"Unknown rollup period: {period}. Known: {', '.join(self.bars)}")
+        
+        bars = self.bars[period]
+        # Bars do not overlap, so first and last dates are both sorted
+        low = bisect.bisect_left(bars[LAST_DATE], start) if start else 0
+        high = bisect.bisect_right(bars[FIRST_DATE], end) if end else len(bars[PERIOD])
+        return pd.DataFrame({column: values[low:high] for column, values in bars.items()}, columns=ROLLUP_COLUMNS)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'last_date': self.last_date, 'csv_signature': self.csv_signature, 'bars': self.bars}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Rollups':
+        return cls(bars=data.get('bars'), last_date=data.get('last_date'), csv_signature=data.get('csv_signature'))
+    
+    def save(self, path: str):
+        """Atomically write the rollups as compact JSON."""
+        text = json.dumps(self.to_dict(), separators=(',', ':'))
+        with atomic_write(path) as f:
+            f.write(text)
+    
+    @classmethod
+    def load(cls, path: str) -> Optional['Rollups']:
+        """Read saved rollups; None if they are missing, unreadable or for other periods."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                rollups = cls.from_dict(json.load(f))
+        except (OSError, ValueError, AttributeError):
+            return None
+        if list(rollups.bars) != list(ROLLUP_PERIODS):
+            return None
+        return rollups
@@ -0,0 +1,179 @@
+"""Sorted on-disk index of the CSV rows by Gregorian and Persian date, for reads that seek instead of parsing the whole file."""
+
+import io
+import json
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import COLUMN_MAPPING, ROW_INDEX_VERSION
+from .models import dates_to_ordinals
+from .storage import atomic_write
+from .utils import DATE_PATTERN
+
+DATE = COLUMN_MAPPING["gregorian_date"]
+PERSIAN_DATE = COLUMN_MAPPING["persian_date"]
+
+# Rows of the int64 table that follows the JSON header line
+DAYS, TAILS, PERSIAN, PERSIAN_ROWS = range(4)
+
+
+def persian_numbers(dates: pd.Series) -> np.ndarray:
+    """Persian YYYY/MM/DD dates as YYYYMMDD numbers; -1 where the text is not such a date."""
+    dates = dates.astype(str)
+    is_date = dates.str.fullmatch(DATE_PATTERN.pattern).fillna(False)
+    numbers = pd.to_numeric(dates.where(is_date).str.replace('/', '', regex=False))
+    return numbers.fillna(-1).to_numpy(dtype='int64')
+
+
+def _line_starts(path: str) -> Tuple[np.ndarray, int]:
+    """Byte offsets of the non-empty lines of a file, and its size."""
+    data = np.fromfile(path, dtype='uint8')
+    breaks = np.flatnonzero(data == ord('\n'))
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [len(data)]))
+    return starts[ends > starts], len(data)
+
+
+class RowIndex:
+    """
+    Where each CSV row starts, sorted by date.
+    
+    The CSV is kept newest first, so the rows of any Gregorian date range
+    are one contiguous run of bytes: a binary search over the sorted days
+    finds it and a single seek reads just those rows. Offsets are counted
+    back from the end of the file (`tails`), which rows spliced onto the
+    top never change. Persian dates are searched in their own sorted copy
+    that points back at the rows.
+    
+    Positions are row numbers oldest first, i.e. into the sorted days.
+    """
+    
+    def __init__(self, table: np.ndarray, csv_signature: Optional[str] = None):
+        self.table = table
+        self.csv_signature = csv_signature
+    
+    def __len__(self) -> int:
+        return self.table.shape[1]
+    
+    @classmethod
+    def from_csv(cls, path: str, df: pd.DataFrame, csv_signature: Optional[str] = None) -> Optional['RowIndex']:
+        """
+        Index a CSV file given the frame read from it.
+        
+        None if the rows are not strictly newest first (no contiguous ranges)
+        or the lines do not match the frame.
+        """
+        starts, size = _line_starts(path)
+        starts = starts[1:]  # Header
+        if len(starts) != len(df):
+            return None
+        
+        days = dates_to_ordinals(df[DATE])
+        if len(days) and (days.min() < 0 or np.any(np.diff(days) >= 0)):
+            return None
+        
+        # Oldest first, like the index
+        persian = persian_numbers(df[PERSIAN_DATE])[::-1]
+        order = np.argsort(persian, kind='stable')
+        table = np.stack((days[::-1], size - starts[::-1], persian[order], order))
+        return cls(np.ascontiguousarray(table, dtype='int64'), csv_signature)
+    
+    def extend(self, new_df: pd.DataFrame, lines: bytes, csv_signature: Optional[str] = None):
+        """
+        Add rows spliced onto the top of the file, right after the header.
+        
+        `new_df` holds them newest first, as written in `lines`; all of them
+        are newer than the rows already indexed.
+        """
+        rows = len(self)
+        body_size = int(self.table[TAILS][-1]) if rows else 0  # The newest row started the old body
+        block = np.frombuffer(lines, dtype='uint8')
+        starts = np.concatenate(([0], np.flatnonzero(block == ord('\n'))[:-1] + 1))
+        days = dates_to_ordinals(new_df[DATE])[::-1]
+        tails = (len(block) - starts + body_size)[::-1]
+        
+        persian = persian_numbers(new_df[PERSIAN_DATE])[::-1]
+        order = np.argsort(persian, kind='stable')
+        at = np.searchsorted(self.table[PERSIAN], persian[order], side='right')
+        self.table = np.stack((
+            np.concatenate((self.table[DAYS], days)),
+            np.concatenate((self.table[TAILS], tails)),
+            np.insert(self.table[PERSIAN], at, persian[order]),
+            np.insert(self.table[PERSIAN_ROWS], at, rows + order)
+        ))
+        self.csv_signature = csv_signature
+    
+    def date_bounds(self) -> Tuple[Optional[int], Optional[int]]:
+        """Day numbers of the oldest and newest rows, or (None, None) for an empty index."""
+        if not len(self):
+            return None, None
+        return int(self.table[DAYS][0]), int(self.table[DAYS][-1])
+    
+    def gregorian_span(self, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+        """Positions [first, stop) of the rows whose day number is within start..end."""
+        days = self.table[DAYS]
+        first = int(np.searchsorted(days, start, side='left')) if start is not None else 0
+        stop = int(np.searchsorted(days, end, side='right')) if end is not None else len(days)
+        return first, max(first, stop)
+    
+    def persian_positions(self, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """Sorted positions of the rows whose Persian YYYYMMDD number is within start..end."""
+        persian = self.table[PERSIAN]
+        first = int(np.searchsorted(persian, max(start or 0, 0), side='left'))
+        stop = int(np.searchsorted(persian, end, side='right')) if end is not None else len(persian)
+        return np.sort(self.table[PERSIAN_ROWS][first:max(first, stop)])
+    
+    def read(self, path: str, first: int, stop: int) -> pd.DataFrame:
+        """Read the rows at positions [first, stop) with one seek, newest first like the file."""
+        tails = self.table[TAILS]
+        with open(path, 'rb') as f:
+            header = f.readline()
+            if stop <= first:
+                return pd.read_csv(io.BytesIO(header))
+            size = os.fstat(f.fileno()).st_size
+            begin = size - int(tails[stop - 1])
+            f.seek(begin)
+            block = f.read((size - int(tails[first - 1]) if first else size) - begin)
+        return pd.read_csv(io.BytesIO(header + block))
+    
+    def read_positions(self, path: str, positions: np.ndarray) -> pd.DataFrame:
+        """Read the rows at sorted positions, seeking once over the run that spans them."""
+        if not len(positions):
+            return self.read(path, 0, 0)
+        first, last = int(positions[0]), int(positions[-1])
+        rows = self.read(path, first, last + 1)
+        if last - first + 1 == len(positions):
+            return rows
+        keep = np.isin(last - np.arange(len(rows)), positions)
+        return rows[keep].reset_index(drop=True)
+    
+    def save(self, path: str):
+        """Atomically write a JSON header line followed by the int64 table."""
+        header = json.dumps({'version': ROW_INDEX_VERSION, 'csv_signature': self.csv_signature, 'rows': len(self)})
+        # Pad so the table starts 8-byte aligned for the memory map
+        header = header.encode() + b' ' * (-(len(header) + 1) % 8) + b'\n'
+        with atomic_write(path, 'wb') as f:
+            f.write(header)
+            f.write(self.table.astype('<i8').tobytes())
+    
+    @classmethod
+    def load(cls, path: str) -> Optional['RowIndex']:
+        """Memory-map a saved index; None if it is missing, unreadable or of another layout version."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                header_line = f.readline()
+            header = json.loads(header_line)
+            if header.get('version') != ROW_INDEX_VERSION:
+                return None
+            rows = header['rows']
+            if not rows:
+                return cls(np.empty((4, 0), dtype='int64'), header.get('csv_signature'))
+            table = np.memmap(path, dtype='<i8', mode='r', offset=len(header_line), shape=(4, rows))
+        except (OSError, ValueError, KeyError):
+            return None
+        return cls(table, header.get('csv_signature'))
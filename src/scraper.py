@@ -6,65 +6,233 @@ from typing import List, Dict, Any, Optional
 import logging
 
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
 
 from .config import (
-    BASE_URL, CHROME_OPTIONS, TABLE_SELECTOR, NEXT_BUTTON_SELECTOR, 
-    PAGINATION_INFO_SELECTOR, MAX_RETRIES, RETRY_DELAY, COLUMN_MAPPING
+    PROFILE_URL_TEMPLATE, INSTRUMENTS, DEFAULT_INSTRUMENT, TABLE_SELECTOR, NEXT_BUTTON_SELECTOR, 
+    DATATABLE_SELECTOR, PAGINATION_INFO_SELECTOR, PROCESSING_SELECTOR, MAX_RETRIES, RETRY_DELAY,
+    PAGE_LOAD_TIMEOUT, MIN_PAGE_TIMEOUT, PAGE_TIMEOUT_FACTOR, PAGE_DELAY
 )
 from .utils import (
-    setup_logging, clean_price_text, clean_change_text, parse_date,
-    extract_pagination_info, validate_row_data, format_progress
+    setup_logging, clean_prices, clean_changes, parse_dates, DIGIT_TRANSLATION,
+    extract_pagination_info, validate_row_data, format_progress, parse_table_html
 )
 from .data_manager import DataManager
+from .drivers import DriverPool, create_driver
+from .models import PriceRow, date_to_ordinal
+from .sync import DateIndex, compare_page, plan_gap_offsets
+from .metrics import REGISTRY
 
 
-class DollarScraper:
-    """Main scraper class for extracting USD/IRR exchange rate data."""
+# Returns the trimmed text of every cell, row by row, for the rows matched by arguments[0]
+EXTRACT_TABLE_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).map(
+    row => Array.from(row.querySelectorAll('td')).map(cell => cell.textContent.trim())
+);
+"""
+
+
+# Returns [first row text, pagination info text, processing indicator visible]
+TABLE_STATE_SCRIPT = """
+const row = document.querySelector(arguments[0]);
+const info = document.querySelector(arguments[1]);
+const processing = document.querySelector(arguments[2]);
+return [
+    row ? row.textContent.trim() : null,
+    info ? info.textContent.trim() : null,
+    !!processing && window.getComputedStyle(processing).display !== 'none'
+];
+"""
+
+# Shows page arguments[1] (0-based) of the DataTables table arguments[0]; false if the API is not available
+JUMP_TO_PAGE_SCRIPT = """
+const $ = window.jQuery;
+if (!$ || !$.fn.dataTable || !$.fn.dataTable.isDataTable(arguments[0])) {
+    return false;
+}
+$(arguments[0]).DataTable().page(arguments[1]).draw('page');
+return true;
+"""
+
+
+class BaseScraper:
+    """
+    What every scraper backend shares: the instrument's dataset, row parsing,
+    the scrape journal and saving the scraped rows.
+    
+    Backends add how pages are fetched and their own scrape_all_data() and run().
+    """
     
-    def __init__(self):
+    def __init__(self, instrument: str = DEFAULT_INSTRUMENT):
+        if instrument not in INSTRUMENTS:
+            raise ValueError(f"Unknown instrument: {instrument}. Choose from {sorted(INSTRUMENTS)}")
+        
         self.logger = setup_logging()
-        self.driver = None
-        self.data_manager = DataManager()
-        self.scraped_data = []
+        self.instrument = instrument
+        self.instrument_name = INSTRUMENTS[instrument]["name"]
+        self.base_url = PROFILE_URL_TEMPLATE.format(slug=instrument)
+        self.metrics = REGISTRY.get(instrument=instrument)
+        self.data_manager = DataManager(INSTRUMENTS[instrument]["csv_filename"], metrics=self.metrics)
+        self.scraped_data: List[PriceRow] = []
+        # Stored rows the site now shows with other values; rewritten when the scraped rows are saved
+        self.revised_data: List[PriceRow] = []
         self.start_time = None
+    
+    def _parse_rows(self, page_cells: List[List[str]]) -> List[Optional[PriceRow]]:
+        """
+        Clean the raw cell texts of a page into rows, without validating them.
+        
+        Cells are cleaned column by column with the batch cleaners in utils;
+        rows with too few cells come back as None in their place.
+        """
+        complete = []
+        for cell_texts in page_cells:
+            if len(cell_texts) < 8:
+                self.logger.warning(f"Row has insufficient cells: {len(cell_texts)}")
+            else:
+                complete.append(cell_texts)
+        
+        if not complete:
+            return [None] * len(page_cells)
+        
+        # Transpose to the table's columns: four prices, two changes, two dates
+        columns = list(zip(*(cell_texts[:8] for cell_texts in complete)))
+        open_prices, low_prices, high_prices, close_prices = (clean_prices(column) for column in columns[:4])
+        change_amounts, change_percents = (clean_changes(column) for column in columns[4:6])
+        
+        parsed = iter([
+            PriceRow(
+                open_price=open_price,
+                low_price=low_price,
+                high_price=high_price,
+                close_price=close_price,
+                change_amount=change_amount,
+                change_percent=change_percent,
+                day=date_to_ordinal(gregorian_date),
+                persian_date=persian_date.strip().translate(DIGIT_TRANSLATION)
+            )
+            for open_price, low_price, high_price, close_price, change_amount, change_percent, gregorian_date, persian_date
+            in zip(open_prices, low_prices, high_prices, close_prices, change_amounts, change_percents,
+                   parse_dates(columns[6]), columns[7])
+        ])
+        return [next(parsed) if len(cell_texts) >= 8 else None for cell_texts in page_cells]
+    
+    def _parse_row(self, cell_texts: List[str]) -> Optional[PriceRow]:
+        """Clean the raw text of a row's cells into a row, without validating it."""
+        return self._parse_rows([cell_texts])[0]
+    
+    def _build_rows(self, page_cells: List[List[str]]) -> List[PriceRow]:
+        """Build the valid rows of a page from the raw text of its cells."""
+        rows = []
+        for cell_texts, row_data in zip(page_cells, self._parse_rows(page_cells)):
+            if row_data is None:
+                continue
+            if row_data.is_valid():
+                rows.append(row_data)
+            else:
+                self.logger.warning(f"Invalid row data: {cell_texts}")
+        self.metrics.increment('rows_scraped', len(rows))
+        self.metrics.increment('rows_invalid', len(page_cells) - len(rows))
+        return rows
+    
+    def _build_row_data(self, cell_texts: List[str]) -> Optional[PriceRow]:
+        """Build a validated row from the raw text of a row's cells."""
+        rows = self._build_rows([cell_texts])
+        return rows[0] if rows else None
+    
+    def _start_journal(self, **identity) -> Dict[int, List[PriceRow]]:
+        """Open the scrape journal and return already journaled pages as rows."""
+        pages = self.data_manager.journal.start(**identity)
+        return {offset: [PriceRow.from_dict(row) for row in rows] for offset, rows in pages.items()}
+    
+    def _record_page(self, offset: int, page_data: List[PriceRow]):
+        """Journal one page of rows."""
+        self.data_manager.journal.record(offset, [row.to_dict() for row in page_data])
+    
+    def _note_revisions(self, changed: List[PriceRow]):
+        """Queue stored rows that the site now shows with other values to be replaced on save."""
+        if changed:
+            self.logger.warning(
+                f"{len(changed)} stored rows differ from the site and will be replaced: "
+                f"{[row.gregorian_date for row in changed]}"
+            )
+            self.revised_data.extend(changed)
+    
+    def _save_scraped_data(self, incremental: bool) -> bool:
+        """Persist the rows collected in ``self.scraped_data`` and replace those in ``self.revised_data``."""
+        if not self.scraped_data and not self.revised_data:
+            self.data_manager.journal.clear()
+            self.logger.info("No new data to save")
+            return True
+        
+        success = True
+        if self.scraped_data:
+            if incremental:
+                success = self.data_manager.append_new_data(self.scraped_data)
+            else:
+                success = self.data_manager.save_data(self.scraped_data)
+        if success and self.revised_data:
+            success = self.data_manager.replace_rows(self.revised_data)
+        
+        if not success:
+            self.logger.error("Failed to save data")
+            return False
+        
+        self.data_manager.journal.clear()
+        self.logger.info("Data saved successfully!")
         
+        # Show final summary
+        final_summary = self.data_manager.get_data_summary()
+        self.logger.info(f"Final dataset summary: {final_summary}")
+        return True
+
+
+class DollarScraper(BaseScraper):
+    """Main scraper class for extracting USD/IRR exchange rate data."""
+    
+    def __init__(self, instrument: str = DEFAULT_INSTRUMENT, driver: Optional[webdriver.Chrome] = None,
+                 driver_pool: Optional[DriverPool] = None):
+        super().__init__(instrument)
+        # A driver passed in is shared with other scrapers and is not quit here;
+        # otherwise one is borrowed from driver_pool or started per scrape
+        self.driver = driver
+        self.driver_pool = driver_pool
+        self._driver_owner = None
+        self.page_latencies = []
+    
     def _setup_driver(self) -> webdriver.Chrome:
         """Setup Chrome driver with options"""
-        chrome_options = Options()
-        for option in CHROME_OPTIONS:
-            chrome_options.add_argument(option)
+        self.logger.info("====== WebDriver manager ======")
+        with self.metrics.time('setup_driver'):
+            return create_driver(self.logger)
+    
+    def _acquire_driver(self):
+        """Borrow a driver from the pool, or start a private one."""
+        if self.driver_pool is not None:
+            with self.metrics.time('acquire_driver'):
+                self.driver = self.driver_pool.acquire()
+            self._driver_owner = "pool"
+        else:
+            self.logger.info("Setting up Chrome driver...")
+            self.driver = self._setup_driver()
+            self._driver_owner = "self"
+    
+    def _release_driver(self):
+        """Return a pooled driver or quit a private one; shared drivers are left alone."""
+        if self.driver is None or self._driver_owner is None:
+            return
         
-        try:
-            # Use ChromeDriverManager to ensure we get the correct version
-            self.logger.info("====== WebDriver manager ======")
-            driver_path = ChromeDriverManager().install()
-            self.logger.info(f"Using ChromeDriver at: {driver_path}")
-            
-            service = Service(driver_path)
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # Log successful initialization
-            self.logger.info("Chrome driver initialized successfully")
-            return driver
-            
-        except Exception as e:
-            self.logger.error(f"Failed to initialize Chrome driver: {str(e)}")
-            # Try fallback without service (system chromedriver)
-            try:
-                self.logger.info("Attempting fallback to system ChromeDriver")
-                driver = webdriver.Chrome(options=chrome_options)
-                self.logger.info("Fallback Chrome driver initialized successfully")
-                return driver
-            except Exception as fallback_error:
-                self.logger.error(f"Fallback also failed: {str(fallback_error)}")
-                raise RuntimeError(f"Failed to initialize Chrome driver: {str(e)}")
+        if self._driver_owner == "pool":
+            self.driver_pool.release(self.driver)
+            self.logger.info("Chrome driver returned to the pool")
+        else:
+            self.driver.quit()
+            self.logger.info("Chrome driver closed")
+        self.driver = None
+        self._driver_owner = None
     
     def _wait_for_element(self, selector: str, timeout: int = 10):
         """Wait for element to be present and return it."""
@@ -75,70 +243,69 @@ class DollarScraper:
             self.logger.error(f"Timeout waiting for element: {selector}")
             return None
     
-    def _extract_row_data(self, row_element) -> Optional[Dict[str, Any]]:
-        """Extract data from a table row element."""
+    def _extract_row_data(self, row_element) -> Optional[PriceRow]:
+        """Extract data from a table row element (one WebDriver call per cell)."""
         try:
             cells = row_element.find_elements(By.TAG_NAME, "td")
-            
-            if len(cells) < 8:
-                self.logger.warning(f"Row has insufficient cells: {len(cells)}")
-                return None
-            
-            # Extract data according to the table structure
-            open_price = clean_price_text(cells[0].text)
-            low_price = clean_price_text(cells[1].text)
-            high_price = clean_price_text(cells[2].text)
-            close_price = clean_price_text(cells[3].text)
-            change_amount = clean_change_text(cells[4].text)
-            change_percent = clean_change_text(cells[5].text)
-            gregorian_date = parse_date(cells[6].text)
-            persian_date = cells[7].text.strip()
-            
-            row_data = {
-                COLUMN_MAPPING["open_price"]: open_price,
-                COLUMN_MAPPING["low_price"]: low_price,
-                COLUMN_MAPPING["high_price"]: high_price,
-                COLUMN_MAPPING["close_price"]: close_price,
-                COLUMN_MAPPING["change_amount"]: change_amount,
-                COLUMN_MAPPING["change_percent"]: change_percent,
-                COLUMN_MAPPING["gregorian_date"]: gregorian_date,
-                COLUMN_MAPPING["persian_date"]: persian_date
-            }
-            
-            if validate_row_data(row_data):
-                return row_data
-            else:
-                self.logger.warning(f"Invalid row data: {row_data}")
-                return None
-                
+            return self._build_row_data([cell.text for cell in cells])
         except Exception as e:
             self.logger.error(f"Error extracting row data: {e}")
             return None
     
-    def _scrape_current_page(self) -> List[Dict[str, Any]]:
-        """Scrape data from the current page."""
+    def _extract_page_cells(self) -> List[List[str]]:
+        """
+        Read the text of every cell on the current page in a single round trip.
+        
+        Falls back to parsing ``driver.page_source`` once with lxml if the
+        script cannot be executed.
+        """
+        try:
+            cells = self.driver.execute_script(EXTRACT_TABLE_SCRIPT, TABLE_SELECTOR)
+            if cells is not None:
+                return cells
+        except WebDriverException as e:
+            self.logger.warning(f"Bulk script extraction failed, parsing page source: {e}")
+        
+        return parse_table_html(self.driver.page_source)
+    
+    def _scrape_current_page(self, bulk: bool = True) -> List[PriceRow]:
+        """
+        Scrape data from the current page.
+        
+        Args:
+            bulk: If True, read the whole table in one WebDriver call instead
+                of querying each cell separately
+        """
         page_data = []
+        started = time.perf_counter()
         
         try:
-            # Wait for table to load
-            table_rows = self.driver.find_elements(By.CSS_SELECTOR, TABLE_SELECTOR)
+            if bulk:
+                rows = self._extract_page_cells()
+            else:
+                rows = self.driver.find_elements(By.CSS_SELECTOR, TABLE_SELECTOR)
             
-            if not table_rows:
+            if not rows:
                 self.logger.warning("No table rows found on current page")
                 return page_data
             
-            self.logger.info(f"Found {len(table_rows)} rows on current page")
+            self.logger.info(f"Found {len(rows)} rows on current page")
             
-            for i, row in enumerate(table_rows):
-                row_data = self._extract_row_data(row)
-                if row_data:
-                    page_data.append(row_data)
-                    self.logger.debug(f"Extracted row {i+1}: {row_data[COLUMN_MAPPING['gregorian_date']]}")
+            if bulk:
+                page_data = self._build_rows(rows)
+            else:
+                for i, row in enumerate(rows):
+                    row_data = self._extract_row_data(row)
+                    if row_data:
+                        page_data.append(row_data)
+                        self.logger.debug(f"Extracted row {i+1}: {row_data.gregorian_date}")
             
             self.logger.info(f"Successfully extracted {len(page_data)} valid rows from current page")
-            
+        
         except Exception as e:
             self.logger.error(f"Error scraping current page: {e}")
+        finally:
+            self.metrics.observe('scrape_page', time.perf_counter() - started)
         
         return page_data
     
@@ -167,77 +334,167 @@ class DollarScraper:
             self.logger.error(f"Error checking next page: {e}")
             return False
     
+    def _get_table_state(self) -> Optional[List]:
+        """Return the first row text, pagination text and processing flag of the table."""
+        try:
+            return self.driver.execute_script(
+                TABLE_STATE_SCRIPT, TABLE_SELECTOR, PAGINATION_INFO_SELECTOR, PROCESSING_SELECTOR
+            )
+        except WebDriverException:
+            return None
+    
+    def _page_timeout(self) -> float:
+        """Adaptive redraw timeout based on the average of recent page loads."""
+        recent = self.page_latencies[-5:]
+        if not recent:
+            return PAGE_LOAD_TIMEOUT
+        
+        average = sum(recent) / len(recent)
+        return min(PAGE_LOAD_TIMEOUT, max(MIN_PAGE_TIMEOUT, average * PAGE_TIMEOUT_FACTOR))
+    
+    def _wait_for_table_change(self, previous_state: Optional[List]) -> bool:
+        """
+        Wait until the table shows a different page than ``previous_state``.
+        
+        The table counts as redrawn once the first row or the pagination
+        text has changed and the DataTables processing indicator is hidden.
+        """
+        def table_redrawn(_driver):
+            state = self._get_table_state()
+            if not state or state[0] is None or state[2]:
+                return False
+            if previous_state is None:
+                return True
+            return state[0] != previous_state[0] or state[1] != previous_state[1]
+        
+        timeout = self._page_timeout()
+        started = time.monotonic()
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(table_redrawn)
+        except TimeoutException:
+            self.logger.error(f"Table did not redraw within {timeout:.1f}s")
+            return False
+        
+        latency = time.monotonic() - started
+        self.page_latencies.append(latency)
+        self.logger.info(f"Table redrawn in {latency:.2f}s (timeout {timeout:.1f}s)")
+        return True
+    
     def _click_next_page(self) -> bool:
-        """Click the next page button."""
+        """Click the next page button and wait for the table to redraw."""
         try:
             next_button = self._wait_for_element(NEXT_BUTTON_SELECTOR, timeout=10)
             if next_button and "disabled" not in next_button.get_attribute("class").lower():
+                previous_state = self._get_table_state()
                 self.driver.execute_script("arguments[0].click();", next_button)
                 
-                # Wait for page to load
-                time.sleep(RETRY_DELAY)
-                
-                # Wait for table to update
-                self._wait_for_element(TABLE_SELECTOR, timeout=10)
-                
-                return True
+                return self._wait_for_table_change(previous_state)
             else:
                 self.logger.info("Next button is disabled or not found")
                 return False
-                
+        
         except Exception as e:
             self.logger.error(f"Error clicking next page: {e}")
             return False
     
-    def _should_stop_scraping(self, current_date: str) -> bool:
-        """Check if we should stop scraping based on existing data."""
-        latest_existing_date = self.data_manager.get_latest_date()
-        
-        if not latest_existing_date:
+    def _jump_to_page(self, page: int) -> bool:
+        """Show table page `page` (0-based) in one redraw through the DataTables API."""
+        try:
+            previous_state = self._get_table_state()
+            if not self.driver.execute_script(JUMP_TO_PAGE_SCRIPT, DATATABLE_SELECTOR, page):
+                return False
+        except WebDriverException as e:
+            self.logger.warning(f"Could not jump to page {page + 1}: {e}")
             return False
         
-        try:
-            current_dt = datetime.strptime(current_date, '%Y/%m/%d')
-            latest_dt = datetime.strptime(latest_existing_date, '%Y/%m/%d')
+        with self.metrics.time('fetch_page'):
+            return self._wait_for_table_change(previous_state)
+    
+    def _show_page(self, current: int, target: int) -> bool:
+        """Move the table from page `current` to page `target`, jumping over pages that need not be read."""
+        if target - current > 1 and self._jump_to_page(target):
+            return True
+        
+        for _ in range(target - current):
+            with self.metrics.time('fetch_page'):
+                clicked = self._click_next_page()
+            if not clicked:
+                return False
             
-            # Stop if we've reached data that already exists
-            if current_dt <= latest_dt:
-                self.logger.info(f"Reached existing data. Stopping at {current_date}")
-                return True
-                
-        except ValueError as e:
-            self.logger.error(f"Error comparing dates: {e}")
+            # Optional rate limiting
+            if PAGE_DELAY:
+                time.sleep(PAGE_DELAY)
+        return True
+    
+    def _scrape_gap_pages(self, date_index: DateIndex, page_size: int, shown_page: int) -> List[PriceRow]:
+        """
+        Show the table pages that cover suspicious holes in the stored dates and return their missing rows.
+        
+        The table only moves forward, so pages up to `shown_page`, which the
+        update already compared, are skipped.
+        """
+        offsets = plan_gap_offsets(date_index, len(self.scraped_data), page_size)
+        # A page_size window at any offset spans at most two table pages
+        pages = sorted({
+            page for offset in offsets for page in (offset // page_size, (offset + page_size - 1) // page_size)
+            if page > shown_page
+        })
+        if not pages:
+            return []
+        
+        self.logger.info(f"Checking {len(pages)} table pages that cover gaps in the stored dates")
+        found = []
+        seen_days = {row.day for row in self.scraped_data}
+        
+        for page in pages:
+            if not self._show_page(shown_page, page):
+                self.logger.warning(f"Failed to navigate to page {page + 1}")
+                break
+            shown_page = page
+            
+            comparison = compare_page(date_index, self._scrape_current_page())
+            self._note_revisions(comparison['changed'])
+            for row in comparison['new']:
+                if row.day not in seen_days:
+                    seen_days.add(row.day)
+                    found.append(row)
         
-        return False
+        self.logger.info(f"Recovered {len(found)} missing records from gap pages")
+        return found
     
-    def scrape_all_data(self, incremental: bool = True) -> bool:
+    def scrape_all_data(self, incremental: bool = True, fill_gaps: bool = False) -> bool:
         """
         Scrape all historical data from the website.
         
         Args:
             incremental: If True, only scrape new data since last run
+            fill_gaps: If True (incremental only), also re-check pages that
+                cover holes of more than SYNC_MAX_GAP_DAYS in the stored dates
         """
         self.start_time = datetime.now()
         self.scraped_data = []
+        self.revised_data = []
         
         try:
-            self.logger.info("Starting dollar scraper...")
+            self.logger.info(f"Starting {self.instrument_name} scraper...")
             
             # Check existing data
             if incremental:
                 summary = self.data_manager.get_data_summary()
                 self.logger.info(f"Existing data summary: {summary}")
             
-            # Setup driver
-            self.logger.info("Setting up Chrome driver...")
-            self.driver = self._setup_driver()
+            # Setup driver unless a shared one was provided
+            if self.driver is None:
+                self._acquire_driver()
             
             # Navigate to the website
-            self.logger.info(f"Navigating to {BASE_URL}")
-            self.driver.get(BASE_URL)
-            
-            # Wait for page to load
-            time.sleep(3)
+            self.logger.info(f"Navigating to {self.base_url}")
+            with self.metrics.time('fetch_page'):
+                self.driver.get(self.base_url)
+                
+                # Wait for the first page of the table to render
+                self._wait_for_table_change(None)
             
             # Get initial pagination info
             pagination_info = self._get_pagination_info()
@@ -245,88 +502,86 @@ class DollarScraper:
             
             self.logger.info(f"Total records available: {total_records}")
             
+            # Sorted index of stored dates for incremental comparisons
+            date_index = self.data_manager.get_date_index() if incremental else None
+            if date_index is not None and not len(date_index):
+                date_index = None
+            
+            # Pages are journaled by row offset, like the HTTP backend, so an interrupted
+            # scrape resumes after the pages it already read
+            page_size = pagination_info.get('current_page_size', 0)
+            journaled_pages = {}
+            if page_size:
+                journaled_pages = self._start_journal(
+                    mode="incremental" if incremental else "full", total=total_records, page_size=page_size
+                )
+            
             page_count = 0
+            shown_page = 0
             total_scraped = 0
             
             while True:
                 page_count += 1
+                offset = (page_count - 1) * page_size
                 self.logger.info(f"\n--- Scraping Page {page_count} ---")
                 
-                # Scrape current page
-                page_data = self._scrape_current_page()
+                journaled = page_size and offset in journaled_pages
+                if journaled:
+                    page_data = journaled_pages[offset]
+                    self.logger.info(f"Using journaled rows {offset + 1} to {offset + len(page_data)}")
+                else:
+                    if not self._show_page(shown_page, page_count - 1):
+                        self.logger.warning("Failed to navigate to next page")
+                        break
+                    shown_page = page_count - 1
+                    
+                    # Scrape current page
+                    page_data = self._scrape_current_page()
+                    if page_data and page_size:
+                        self._record_page(offset, page_data)
                 
                 if not page_data:
                     self.logger.warning("No data found on current page. Stopping.")
                     break
                 
-                # Check if we should stop (for incremental updates)
-                if incremental and page_data:
-                    first_date = page_data[0].get(COLUMN_MAPPING["gregorian_date"])
-                    if first_date and self._should_stop_scraping(first_date):
-                        # Only add new data (dates newer than existing)
-                        latest_existing_date = self.data_manager.get_latest_date()
-                        if latest_existing_date:
-                            latest_dt = datetime.strptime(latest_existing_date, '%Y/%m/%d')
-                            new_data = []
-                            for row in page_data:
-                                row_date = row.get(COLUMN_MAPPING["gregorian_date"])
-                                if row_date:
-                                    row_dt = datetime.strptime(row_date, '%Y/%m/%d')
-                                    if row_dt > latest_dt:
-                                        new_data.append(row)
-                            
-                            if new_data:
-                                self.scraped_data.extend(new_data)
-                                total_scraped += len(new_data)
-                                self.logger.info(f"Added {len(new_data)} new records from this page")
-                        
+                if date_index is not None:
+                    # Compare the whole page against the stored dates in one step
+                    comparison = compare_page(date_index, page_data)
+                    self.scraped_data.extend(comparison['new'])
+                    total_scraped += len(comparison['new'])
+                    self._note_revisions(comparison['changed'])
+                    
+                    if comparison['reached_stored']:
+                        self.logger.info(f"Reached existing data. Added {len(comparison['new'])} new records from this page")
                         break
-                
-                # Add all page data
-                self.scraped_data.extend(page_data)
-                total_scraped += len(page_data)
+                else:
+                    # Add all page data
+                    self.scraped_data.extend(page_data)
+                    total_scraped += len(page_data)
                 
                 # Show progress
                 progress_msg = format_progress(total_scraped, total_records, self.start_time)
                 self.logger.info(progress_msg)
                 
                 # Check if there's a next page
-                if not self._has_next_page():
+                if not (offset + page_size < total_records if journaled else self._has_next_page()):
                     self.logger.info("Reached the last page")
                     break
-                
-                # Click next page
-                if not self._click_next_page():
-                    self.logger.warning("Failed to navigate to next page")
-                    break
-                
-                # Rate limiting
-                time.sleep(1)
+            
+            if fill_gaps and date_index is not None and page_size:
+                recovered = self._scrape_gap_pages(date_index, page_size, shown_page)
+                self.scraped_data.extend(recovered)
+                total_scraped += len(recovered)
             
             self.logger.info(f"\nScraping completed! Total records scraped: {total_scraped}")
+            if self.page_latencies:
+                self.logger.info(
+                    f"Page redraw latency: avg {sum(self.page_latencies) / len(self.page_latencies):.2f}s, "
+                    f"max {max(self.page_latencies):.2f}s over {len(self.page_latencies)} loads"
+                )
             
-            # Save data
-            if self.scraped_data:
-                if incremental:
-                    success = self.data_manager.append_new_data(self.scraped_data)
-                else:
-                    success = self.data_manager.save_data(self.scraped_data)
-                
-                if success:
-                    self.logger.info("Data saved successfully!")
-                    
-                    # Show final summary
-                    final_summary = self.data_manager.get_data_summary()
-                    self.logger.info(f"Final dataset summary: {final_summary}")
-                    
-                    return True
-                else:
-                    self.logger.error("Failed to save data")
-                    return False
-            else:
-                self.logger.info("No new data to save")
-                return True
-                
+            return self._save_scraped_data(incremental)
+        
         except KeyboardInterrupt:
             self.logger.info("Scraping interrupted by user")
             return False
@@ -334,23 +589,29 @@ class DollarScraper:
             self.logger.error(f"Error during scraping: {e}")
             return False
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.logger.info("Chrome driver closed")
+            self._release_driver()
     
-    def run(self) -> bool:
-        """Main entry point for the scraper."""
+    def run(self, fill_gaps: bool = False) -> bool:
+        """
+        Main entry point for the scraper.
+        
+        Args:
+            fill_gaps: Also re-check the pages that cover gaps in the stored dates
+        """
         try:
-            # Check if we have existing data
-            existing_summary = self.data_manager.get_data_summary()
-            
-            if existing_summary['total_records'] > 0:
-                self.logger.info("Existing data found. Running incremental update...")
-                return self.scrape_all_data(incremental=True)
-            else:
-                self.logger.info("No existing data found. Starting full scrape...")
-                return self.scrape_all_data(incremental=False)
-                
+            # Hold the dataset lock for the whole run so overlapping runs queue up
+            with self.data_manager.lock, self.metrics.time('run'):
+                # Only the top of the CSV is read to pick the mode; an incremental run loads the rest
+                if self.data_manager.get_latest_date() is not None:
+                    self.logger.info("Existing data found. Running incremental update...")
+                    return self.scrape_all_data(incremental=True, fill_gaps=fill_gaps)
+                else:
+                    self.logger.info("No existing data found. Starting full scrape...")
+                    return self.scrape_all_data(incremental=False)
+        
+        except TimeoutError as e:
+            self.logger.error(f"Another run is still updating the dataset: {e}")
+            return False
         except Exception as e:
             self.logger.error(f"Error in main run: {e}")
             return False
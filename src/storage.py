@@ -0,0 +1,285 @@
+"""Crash-safe file helpers: atomic writes, inter-process locks and the scrape journal."""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, IO
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _fsync_directory(path: str):
+    """Flush a directory entry so a rename inside it survives a power loss."""
+    try:
+        fd = os.open(path or '.', os.O_RDONLY)
+    except OSError:
+        return  # Not supported on this platform (e.g. Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', encoding: Optional[str] = 'utf-8'):
+    """
+    Open a temporary file next to `path` and move it into place on success.
+    
+    The data is fsynced before the rename, so readers only ever see the old
+    file or the complete new one. On error the temporary file is removed and
+    the original is left untouched.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=directory)
+    
+    try:
+        text_options = {} if 'b' in mode else {'encoding': encoding, 'newline': ''}
+        with os.fdopen(fd, mode, **text_options) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_directory(directory)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class FileLock:
+    """
+    Re-entrant inter-process lock backed by a lock file.
+    
+    Used so that a manual run and a scheduled run never write the same
+    dataset at the same time. The lock is held by the process: worker
+    threads of a run that holds it re-enter it. flock() locks are per open
+    file, so a second FileLock on the same path in one process would wait
+    for the first; use FileLock.shared() to get the process's one instance.
+    """
+    
+    _instances: Dict[str, 'FileLock'] = {}
+    _instances_lock = threading.Lock()
+    
+    def __init__(self, path: str, timeout: float = 300, poll_interval: float = 0.5):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file: Optional[IO] = None
+        self._depth = 0
+        self._guard = threading.RLock()
+    
+    @classmethod
+    def shared(cls, path: str, **kwargs) -> 'FileLock':
+        """The lock for `path` shared by everything in this process, created on first use."""
+        key = os.path.abspath(path)
+        with cls._instances_lock:
+            lock = cls._instances.get(key)
+            if lock is None:
+                lock = cls._instances[key] = cls(path, **kwargs)
+            return lock
+    
+    def _try_lock(self) -> bool:
+        try:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    
+    def acquire(self):
+        """Block until the lock is held, raising TimeoutError after `timeout` seconds."""
+        # Other threads of this process wait here while the lock file is being locked
+        with self._guard:
+            if self._depth:
+                self._depth += 1
+                return
+            
+            self._file = open(self.path, 'a+')
+            deadline = time.monotonic() + self.timeout
+            
+            while not self._try_lock():
+                if time.monotonic() >= deadline:
+                    self._file.close()
+                    self._file = None
+                    raise TimeoutError(f"Could not lock {self.path} within {self.timeout}s")
+                time.sleep(self.poll_interval)
+            
+            self._depth = 1
+    
+    def release(self):
+        """Release one level of the lock."""
+        with self._guard:
+            if not self._depth:
+                return
+            
+            self._depth -= 1
+            if self._depth:
+                return
+            
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class ScrapeJournal:
+    """
+    Append-only journal of scraped pages that have not been saved yet.
+    
+    The first line identifies the scrape (mode, total record count on the
+    site, page size); each following line holds one page of rows keyed by
+    its offset.
+    A journal is only reused by a scrape with the same identity, because the
+    page offsets shift once the site publishes a new day.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._header: Optional[Dict[str, Any]] = None
+        self._write_lock = threading.Lock()
+    
+    def _read(self) -> tuple:
+        header, pages = None, {}
+        
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn final line from a crash mid-write
+                    if header is None:
+                        header = entry
+                    else:
+                        pages[entry['offset']] = entry['rows']
+        except OSError:
+            pass
+        
+        return header, pages
+    
+    def start(self, **identity) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Begin or resume a scrape and return the pages already journaled for it.
+        
+        `identity` (e.g. mode, total records, page size) must match the
+        journal on disk for it to be resumed; otherwise it is discarded.
+        """
+        header = dict(identity)
+        existing_header, pages = self._read()
+        
+        if existing_header == header:
+            self._header = header
+            return pages
+        
+        with atomic_write(self.path) as f:
+            f.write(json.dumps(header) + '\n')
+        self._header = header
+        return {}
+    
+    def record(self, offset: int, rows: List[Dict[str, Any]]):
+        """Durably append one scraped page."""
+        if self._header is None:
+            return
+        
+        line = json.dumps({'offset': offset, 'rows': rows}, ensure_ascii=False) + '\n'
+        with self._write_lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def clear(self):
+        """Remove the journal once its rows are safely stored in the dataset."""
+        self._header = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class StagedFile:
+    """
+    Append-only staging file that replaces its target only once it is complete.
+    
+    A checkpoint next to it records the scrape identity, the offset to resume
+    from and the file size after the last durable flush. A restarted scrape
+    with the same identity truncates any torn tail and continues from there.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.checkpoint_path = f"{path}.checkpoint"
+        self._checkpoint: Optional[Dict[str, Any]] = None
+    
+    def _read_checkpoint(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_checkpoint(self):
+        with atomic_write(self.checkpoint_path) as f:
+            json.dump(self._checkpoint, f)
+    
+    def start(self, header: str, **identity) -> int:
+        """
+        Begin or resume staging and return the offset to continue from.
+        
+        `header` is written at the top of a fresh staging file.
+        """
+        checkpoint = self._read_checkpoint()
+        
+        if (checkpoint and checkpoint.get('identity') == identity
+                and os.path.exists(self.path) and os.path.getsize(self.path) >= checkpoint['size']):
+            with open(self.path, 'r+b') as f:
+                f.truncate(checkpoint['size'])
+            self._checkpoint = checkpoint
+            return checkpoint['next_offset']
+        
+        data = header.encode('utf-8')
+        with atomic_write(self.path, 'wb') as f:
+            f.write(data)
+        self._checkpoint = {'identity': identity, 'next_offset': 0, 'size': len(data)}
+        self._save_checkpoint()
+        return 0
+    
+    def append(self, text: str, next_offset: int):
+        """Durably append text, then record where a restarted scrape should resume."""
+        with open(self.path, 'ab') as f:
+            f.write(text.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        
+        self._checkpoint.update(next_offset=next_offset, size=size)
+        self._save_checkpoint()
+    
+    def commit(self, target: str):
+        """Atomically move the staged file over `target`."""
+        os.replace(self.path, target)
+        _fsync_directory(os.path.dirname(target) or '.')
+        self.discard()
+    
+    def discard(self):
+        """Remove the staging file and its checkpoint."""
+        self._checkpoint = None
+        for path in (self.path, self.checkpoint_path):
+            if os.path.exists(path):
+                os.remove(path)
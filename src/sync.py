@@ -0,0 +1,122 @@
+"""Incremental sync engine: compare scraped pages against a sorted index of stored dates."""
+
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import COLUMN_MAPPING, SYNC_MAX_GAP_DAYS
+from .models import PriceRow, dates_to_ordinals
+
+
+class DateIndex:
+    """
+    Sorted array of the stored days (ordinal numbers) with their close prices.
+    
+    Membership, range counts and gap scans are binary searches or single
+    vectorized passes over the arrays, so checking a scraped page never
+    re-reads or re-parses the dataset.
+    """
+    
+    def __init__(self, days: np.ndarray, closes: Optional[np.ndarray] = None):
+        order = np.argsort(days, kind='stable')
+        self.days = np.asarray(days, dtype='int64')[order]
+        self.closes = np.asarray(closes, dtype='float64')[order] if closes is not None else None
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'DateIndex':
+        """Build the index from a dataset frame in CSV layout."""
+        if df.empty or COLUMN_MAPPING["gregorian_date"] not in df.columns:
+            return cls(np.empty(0, dtype='int64'))
+        
+        days = dates_to_ordinals(df[COLUMN_MAPPING["gregorian_date"]])
+        closes = pd.to_numeric(df[COLUMN_MAPPING["close_price"]], errors='coerce').to_numpy(dtype='float64')
+        valid = days >= 0
+        return cls(days[valid], closes[valid])
+    
+    def __len__(self) -> int:
+        return len(self.days)
+    
+    @property
+    def latest(self) -> Optional[int]:
+        return int(self.days[-1]) if len(self.days) else None
+    
+    @property
+    def oldest(self) -> Optional[int]:
+        return int(self.days[0]) if len(self.days) else None
+    
+    def positions(self, days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (found mask, insertion positions) for each day."""
+        days = np.asarray(days, dtype='int64')
+        positions = np.searchsorted(self.days, days)
+        found = np.zeros(len(days), dtype=bool)
+        in_bounds = positions < len(self.days)
+        found[in_bounds] = self.days[positions[in_bounds]] == days[in_bounds]
+        return found, positions
+    
+    def contains(self, days: np.ndarray) -> np.ndarray:
+        """Vectorized membership test."""
+        return self.positions(days)[0]
+    
+    def count_newer(self, day: int) -> int:
+        """Number of stored days strictly after `day`."""
+        return int(len(self.days) - np.searchsorted(self.days, day, side='right'))
+    
+    def gaps(self, max_gap_days: int = SYNC_MAX_GAP_DAYS) -> List[Tuple[int, int]]:
+        """
+        Stored neighbours that are further apart than `max_gap_days`.
+        
+        The market closes on weekends and holidays, so short holes are
+        normal; longer ones may be days that were never scraped.
+        """
+        if len(self.days) < 2:
+            return []
+        
+        wide = np.nonzero(np.diff(self.days) > max_gap_days)[0]
+        return [(int(self.days[i]), int(self.days[i + 1])) for i in wide]
+
+
+def compare_page(index: DateIndex, page_data: List[PriceRow]) -> Dict[str, Any]:
+    """
+    Compare one scraped page against the stored dates in a single pass.
+    
+    Returns the rows whose dates are not stored yet ('new'), stored rows whose
+    close price differs from the page ('changed'), and whether the page
+    reaches back to the newest stored date ('reached_stored'), which means no
+    further pages are needed.
+    """
+    if not page_data:
+        return {'new': [], 'changed': [], 'reached_stored': False}
+    
+    days = np.fromiter((row.day for row in page_data), dtype='int64', count=len(page_data))
+    found, positions = index.positions(days)
+    
+    new_rows = [row for row, known in zip(page_data, found) if not known]
+    
+    changed_rows = []
+    if index.closes is not None and found.any():
+        closes = np.array([row.close_price for row in page_data], dtype='float64')
+        differs = found.copy()
+        differs[found] = index.closes[positions[found]] != closes[found]
+        changed_rows = [row for row, changed in zip(page_data, differs) if changed]
+    
+    reached_stored = index.latest is not None and int(days.min()) <= index.latest
+    return {'new': new_rows, 'changed': changed_rows, 'reached_stored': reached_stored}
+
+
+def plan_gap_offsets(index: DateIndex, new_count: int, page_size: int,
+                     max_gap_days: int = SYNC_MAX_GAP_DAYS) -> List[int]:
+    """
+    Estimate the page offsets on the site (newest first) that cover each gap.
+    
+    A gap's position is the number of stored days after it plus the rows
+    found to be new on the site; the page is centred on that estimate to
+    tolerate small drift.
+    """
+    offsets = set()
+    
+    for _, gap_end in index.gaps(max_gap_days):
+        estimated = index.count_newer(gap_end - 1) + new_count
+        offsets.add(max(0, estimated - page_size // 2))
+    
+    return sorted(offsets)
@@ -1,9 +1,37 @@
 """Utility functions for the dollar scraper."""
 
+import html
 import logging
 import re
+import sys
+import threading
+import time
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Union
+
+# pandas, lxml, pyarrow and asyncio are imported on first use: most callers of these helpers never need them
+pa = pc = None
+_arrow_checked = False
+
+# Persian and Arabic-Indic digits, separators and signs the site may use, as ASCII
+DIGIT_TRANSLATION = str.maketrans({
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},  # Persian ۰-۹
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},  # Arabic-Indic ٠-٩
+    '\u066C': ',',  # Arabic thousands separator
+    '\u066B': '.',  # Arabic decimal separator
+    '\u066A': '%',  # Arabic percent sign
+    '\u2212': '-',  # Minus sign
+    '\u2013': '-',  # En dash
+})
+PRICE_NOISE_PATTERN = re.compile(r'[,\s]')
+DATE_PATTERN = re.compile(r'[0-9]{4}/[0-9]{2}/[0-9]{2}')
+# RE2, which Arrow uses, only takes ASCII spaces for \s; this is everything Python's \s matches
+WHITESPACE_PATTERN = r'[\s\v\x1c-\x1f\x85\pZ]'
+# What float() accepts, bar inf, nan and the underscores of Python literals
+NUMBER_PATTERN = re.compile(r'[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?')
+
+# Below this many cells the per-cell loop beats converting to Arrow (see bench_cleaning.py)
+VECTORIZE_MIN_CELLS = 300
 
 
 def setup_logging(level: int = logging.INFO) -> logging.Logger:
@@ -19,43 +47,152 @@ def setup_logging(level: int = logging.INFO) -> logging.Logger:
     return logging.getLogger(__name__)
 
 
-def clean_price_text(price_text: str) -> Optional[int]:
-    """Clean and convert price text to integer."""
-    if not price_text or price_text.strip() == '':
+def _clean_price(text: Optional[str]) -> Optional[int]:
+    if not text:
         return None
     
     # Remove commas and extra spaces
-    cleaned = re.sub(r'[,\s]', '', price_text.strip())
+    cleaned = PRICE_NOISE_PATTERN.sub('', text.translate(DIGIT_TRANSLATION))
+    if not NUMBER_PATTERN.fullmatch(cleaned):
+        return None
     
     try:
         # Convert to float first, then to int to handle any decimal values
         return int(float(cleaned))
-    except ValueError:
+    except (ValueError, OverflowError):
         return None
 
 
-def clean_change_text(change_text: str) -> Optional[str]:
-    """Clean change amount/percent text."""
-    if not change_text or change_text.strip() == '':
+def _clean_price_int64(text: Optional[str]) -> Optional[int]:
+    price = _clean_price(text)
+    return price if price is not None and abs(price) < 2 ** 63 else None
+
+
+def _clean_change(text: Optional[str]) -> Optional[str]:
+    if not text:
         return None
     
     # Remove extra spaces but keep the sign and value
-    cleaned = change_text.strip()
-    return cleaned
+    return text.strip().translate(DIGIT_TRANSLATION) or None
 
 
-def parse_date(date_text: str) -> Optional[str]:
-    """Parse and validate date text."""
-    if not date_text or date_text.strip() == '':
+def _parse_date(text: Optional[str]) -> Optional[str]:
+    if not text:
         return None
     
-    date_text = date_text.strip()
+    text = text.strip().translate(DIGIT_TRANSLATION)
+    return text if DATE_PATTERN.fullmatch(text) else None
+
+
+def _load_arrow() -> bool:
+    """Import pyarrow for the vectorized cleaners on first use; False if it is not installed."""
+    global pa, pc, _arrow_checked
+    if not _arrow_checked:
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:  # Batches are then cleaned cell by cell
+            pa = pc = None
+        _arrow_checked = True
+    return pa is not None
+
+
+def _normalize_array(cells: 'pa.Array') -> 'pa.Array':
+    """Trim cells and map Persian digits to ASCII; only the non-ASCII cells go through Python."""
+    cells = pc.utf8_trim_whitespace(cells)
+    non_ascii = pc.fill_null(pc.invert(pc.string_is_ascii(cells)), False)
+    if pc.any(non_ascii).as_py():
+        translated = [text.translate(DIGIT_TRANSLATION) for text in pc.filter(cells, non_ascii).to_pylist()]
+        cells = pc.replace_with_mask(cells, non_ascii, pa.array(translated, pa.string()))
+    return cells
+
+
+def _clean_price_array(cells: 'pa.Array') -> 'pa.Array':
+    text = pc.replace_substring(cells, ',', '')
+    if pc.any(pc.match_substring_regex(text, WHITESPACE_PATTERN)).as_py():
+        text = pc.replace_substring_regex(text, WHITESPACE_PATTERN, '')
+    is_number = pc.match_substring_regex(text, f'^{NUMBER_PATTERN.pattern}$')
+    numbers = pc.cast(pc.if_else(is_number, text, None), pa.float64())
+    # Truncate towards zero like int(float(text)), dropping anything int64 cannot hold
+    in_range = pc.fill_null(pc.less(pc.abs(numbers), 2.0 ** 63), False)
+    return pc.cast(pc.if_else(in_range, pc.trunc(numbers), None), pa.int64())
+
+
+def _clean_change_array(cells: 'pa.Array') -> 'pa.Array':
+    return pc.if_else(pc.equal(cells, ''), None, cells)
+
+
+def _parse_date_array(cells: 'pa.Array') -> 'pa.Array':
+    return pc.if_else(pc.match_substring_regex(cells, f'^{DATE_PATTERN.pattern}$'), cells, None)
+
+
+def _batch(values: Union['pd.Series', Iterable[str]], clean_one, clean_array, dtype: str):
+    """
+    Apply a cleaner to a batch of cells, returning the same kind of container.
+    
+    Large batches are cleaned with Arrow compute kernels; small ones, or all
+    of them without pyarrow, with the per-cell cleaner. A Series comes back
+    as a Series of `dtype`, anything else as a list with None for missing.
+    """
+    # Without pandas imported nobody can have passed a Series, so lists never import it
+    pd = sys.modules.get('pandas')
+    is_series = pd is not None and isinstance(values, pd.Series)
+    cells = values if is_series or isinstance(values, list) else list(values)
+    
+    if len(cells) < VECTORIZE_MIN_CELLS or not _load_arrow():
+        if is_series:
+            cells = values.astype(object).where(values.notna(), None).tolist()
+        cleaned = [clean_one(cell) for cell in cells]
+        return pd.Series(cleaned, index=values.index, dtype=dtype) if is_series else cleaned
     
-    # Check if it's in YYYY/MM/DD format
-    if re.match(r'^\d{4}/\d{2}/\d{2}$', date_text):
-        return date_text
+    cleaned = clean_array(_normalize_array(pa.array(cells, type=pa.string(), from_pandas=True)))
+    if is_series:
+        return pd.Series(cleaned.to_pandas(), index=values.index).astype(dtype)
+    return cleaned.to_pylist()
+
+
+def clean_prices(values: Union['pd.Series', Iterable[str]]) -> Union['pd.Series', List[Optional[int]]]:
+    """
+    Clean a batch of price cells (a page column or a whole dump) to integers.
     
-    return None
+    Persian digits and thousands separators are normalized; a Series comes
+    back as a nullable Int64 Series, anything else as a list of Optional[int].
+    Unlike clean_price_text, prices int64 cannot hold come back missing.
+    """
+    return _batch(values, _clean_price_int64, _clean_price_array, 'Int64')
+
+
+def clean_changes(values: Union['pd.Series', Iterable[str]]) -> Union['pd.Series', List[Optional[str]]]:
+    """Clean a batch of change amount/percent cells, keeping the sign, value and `%`."""
+    return _batch(values, _clean_change, _clean_change_array, 'string')
+
+
+def parse_dates(values: Union['pd.Series', Iterable[str]]) -> Union['pd.Series', List[Optional[str]]]:
+    """Normalize a batch of YYYY/MM/DD date cells; anything else becomes missing."""
+    return _batch(values, _parse_date, _parse_date_array, 'string')
+
+
+def clean_price_text(price_text: str) -> Optional[int]:
+    """Clean and convert price text to integer."""
+    return _clean_price(price_text)
+
+
+def clean_change_text(change_text: str) -> Optional[str]:
+    """Clean change amount/percent text."""
+    return _clean_change(change_text)
+
+
+def parse_date(date_text: str) -> Optional[str]:
+    """Parse and validate date text."""
+    return _parse_date(date_text)
+
+
+def strip_html(text: str) -> str:
+    """Return the text content of an HTML fragment such as an API table cell."""
+    if not text:
+        return ''
+    
+    return html.unescape(re.sub(r'<[^>]+>', '', str(text))).strip()
 
 
 def extract_pagination_info(info_text: str) -> Dict[str, int]:
@@ -78,6 +215,17 @@ def extract_pagination_info(info_text: str) -> Dict[str, int]:
     return {'start': 0, 'end': 0, 'total': 0, 'current_page_size': 0}
 
 
+def parse_table_html(page_html: str, table_id: str = "DataTables_Table_0") -> List[List[str]]:
+    """Extract the trimmed text of every body cell of a table from raw page HTML."""
+    if not page_html:
+        return []
+    
+    from lxml import html as lxml_html
+    document = lxml_html.fromstring(page_html)
+    rows = document.xpath(f'//table[@id="{table_id}"]/tbody/tr')
+    return [[cell.text_content().strip() for cell in row.xpath('./td')] for row in rows]
+
+
 def validate_row_data(row_data: Dict[str, Any]) -> bool:
     """Validate if a row contains valid data."""
     required_fields = ['Gregorian Date', 'Close Price']
@@ -89,6 +237,46 @@ def validate_row_data(row_data: Dict[str, Any]) -> bool:
     return True
 
 
+class RateLimiter:
+    """Thread-safe limiter that spaces out calls to at most `rate` per second."""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        """Block until the caller may make its next request."""
+        if not self.interval:
+            return
+        
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class AsyncRateLimiter(RateLimiter):
+    """RateLimiter for coroutines on one event loop; waits without blocking the loop."""
+    
+    async def wait(self):
+        """Sleep until the caller may make its next request."""
+        if not self.interval:
+            return
+        
+        # No await between reading and reserving the slot, so no lock is needed
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        
+        if slot > now:
+            import asyncio  # Already loaded by the running event loop; not imported with this module
+            await asyncio.sleep(slot - now)
+
+
 def format_progress(current: int, total: int, start_time: datetime) -> str:
     """Format progress information for console output."""
     if total == 0:
@@ -120,7 +308,7 @@ def is_weekend_or_holiday(date_str: str) -> bool:
         # Note: In Iran, Thursday-Friday is weekend, but the market follows a different schedule
         if date_obj.weekday() == 4:  # Friday
             return True
-            
+        
         return False
     except ValueError:
         return False
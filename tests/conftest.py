@@ -0,0 +1,38 @@
+"""Shared fixtures: every test runs in its own directory, so data/ and scraper.log stay out of the repo."""
+
+import logging
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+sys.path.insert(0, ROOT_DIR)
+
+from src.config import CSV_FILENAME, DATA_DIR
+from src.data_manager import DataManager
+
+DATASET_PATH = os.path.join(ROOT_DIR, 'data', 'Dollar_Rial_Price_Dataset.csv')
+HISTORY_PAGE_PATH = os.path.join(ROOT_DIR, 'benchmarks', 'fixtures', 'history_page.html')
+# Written by benchmarks/bench_indicators.py --write-fixture from what docs/script.js computes
+INDICATOR_CSV_PATH = os.path.join(ROOT_DIR, 'benchmarks', 'fixtures', 'indicators.csv')
+INDICATOR_GOLDEN_PATH = os.path.join(ROOT_DIR, 'benchmarks', 'fixtures', 'indicators_golden.json')
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logging.disable(logging.WARNING)
+    yield tmp_path
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def store(workdir):
+    """Store a frame as the dataset of the test directory and return a DataManager for it."""
+    def store(df):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        df.to_csv(os.path.join(DATA_DIR, CSV_FILENAME), index=False)
+        return DataManager()
+    return store
@@ -0,0 +1,114 @@
+import pandas as pd
+import pytest
+
+from fake_tgju import FakeTGJUServer
+from src.artifacts import build_artifact, load_artifact
+from src.data_manager import DataManager
+from src.row_index import RowIndex
+from synthetic import make_frame
+
+
+def records(df: pd.DataFrame) -> list:
+    return df.to_dict('records')
+
+
+def stored(manager: DataManager) -> pd.DataFrame:
+    return pd.read_csv(manager.csv_path)
+
+
+def test_newer_rows_are_spliced_on_top(store):
+    df = make_frame(200)
+    manager = store(df.iloc[5:])
+    manager.get_row_index()
+    
+    # Unsorted, with a duplicate of an existing day
+    assert manager.append_new_data(records(df.iloc[[3, 0, 4, 1, 2, 5]]))
+    
+    pd.testing.assert_frame_equal(stored(manager), df)
+    assert manager.get_latest_date() == df['Gregorian Date'].iloc[0]
+
+
+def test_existing_rows_leave_the_file_alone(store):
+    df = make_frame(100)
+    manager = store(df)
+    with open(manager.csv_path, 'rb') as f:
+        before = f.read()
+    
+    assert manager.append_new_data(records(df.iloc[10:20]))
+    assert manager.append_new_data([])
+    
+    with open(manager.csv_path, 'rb') as f:
+        assert f.read() == before
+
+
+def test_older_rows_are_merged_in_date_order(store):
+    df = make_frame(100)
+    hole = df.iloc[40:50]
+    manager = store(df.drop(hole.index))
+    
+    assert manager.append_new_data(records(hole) + records(df.iloc[:2]))
+    
+    pd.testing.assert_frame_equal(stored(manager), df)
+
+
+def test_first_append_creates_the_dataset(store):
+    df = make_frame(10)
+    manager = DataManager()
+    
+    assert manager.append_new_data(records(df))
+    pd.testing.assert_frame_equal(stored(manager), df)
+
+
+def test_incremental_update_reads_the_csv_once(store):
+    df = make_frame(300)
+    manager = store(df.iloc[5:])
+    manager.get_row_index()
+    manager.get_rollups()
+    manager.update_artifact()
+    
+    with FakeTGJUServer.from_frame(df) as server:
+        scraper = server.scraper(page_size=50)
+        assert scraper.run()
+    
+    pd.testing.assert_frame_equal(stored(manager), df)
+    # The date index, the splice and every derived file share the one parsed dataset
+    assert scraper.data_manager.read_count == 1
+
+
+def test_splice_extends_the_derived_files(store):
+    df = make_frame(300)
+    manager = store(df.iloc[3:])
+    manager.get_row_index()
+    manager.get_rollups()
+    manager.update_artifact()
+    
+    for day in reversed(range(3)):
+        assert manager.append_new_data(records(df.iloc[day:day + 1]))
+    
+    signature = manager._content_signature()
+    extended = RowIndex.load(manager.row_index_path)
+    rebuilt = RowIndex.from_csv(manager.csv_path, stored(manager), signature)
+    assert extended.csv_signature == signature
+    assert (extended.table == rebuilt.table).all()
+    assert load_artifact(manager.artifact_path) == build_artifact(stored(manager), signature)
+    
+    # A fresh manager reads the rollups the appends saved
+    extended = DataManager().get_rollups()
+    rebuilt = manager._rebuild_rollups()
+    for period in ('weekly', 'monthly', 'persian_month', 'persian_year'):
+        pd.testing.assert_frame_equal(extended.query(period), rebuilt.query(period))
+
+
+def test_artifact_is_extended_while_the_indicators_start(store, monkeypatch):
+    df = make_frame(100)
+    # 20 stored days: RSI has started, MACD, EMA 50 and the leading spans have not
+    manager = store(df.iloc[80:])
+    manager.get_indicator_state()
+    manager.update_artifact()
+    monkeypatch.setattr(manager, '_rebuild_artifact', lambda: pytest.fail("the artifact was rebuilt"))
+    
+    assert manager.append_new_data(records(df.iloc[40:80]))
+    assert manager.append_new_data(records(df.iloc[:40]))
+    
+    signature = manager._content_signature()
+    assert load_artifact(manager.artifact_path) == build_artifact(stored(manager), signature)
@@ -0,0 +1,35 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from fake_tgju import FakeTGJUServer, render_rows
+from src.data_manager import DataManager
+from src.http_scraper import HttpScraper
+from synthetic import make_frame
+
+aiohttp = pytest.importorskip('aiohttp')
+from src.async_scraper import AsyncHttpScraper  # noqa: E402
+
+
+def test_async_scraper_has_no_sync_scrape_methods():
+    scraper = AsyncHttpScraper()
+    
+    assert not isinstance(scraper, HttpScraper)
+    for name in ('check_newest', 'quick_update', 'fetch_range', '_stream_scrape', '_scrape_current_page'):
+        assert not hasattr(scraper, name), name
+    for name in ('run', 'scrape_all_data', '_fill_gaps'):
+        assert asyncio.iscoroutinefunction(getattr(scraper, name)), name
+
+
+def test_full_scrape_then_update(workdir):
+    df = make_frame(400)
+    with FakeTGJUServer.from_frame(df.iloc[3:]) as server:
+        def scraper():
+            return AsyncHttpScraper(api_url=server.api_url(), page_size=50, rate_limit=0, retry_delay=0)
+        
+        assert asyncio.run(scraper().run())
+        server.rows = render_rows(df.itertuples(index=False))
+        assert asyncio.run(scraper().run())
+    
+    pd.testing.assert_frame_equal(pd.read_csv(DataManager().csv_path), df)
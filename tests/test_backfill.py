@@ -0,0 +1,31 @@
+import time
+
+import pandas as pd
+
+from fake_tgju import FakeTGJUServer
+from src.data_manager import DataManager
+from synthetic import make_frame
+
+# Seconds the fake server waits before answering each page
+PAGE_DELAY = 0.05
+
+
+def timed_full_scrape(server: FakeTGJUServer, workers: int) -> float:
+    scraper = server.scraper(page_size=25, workers=workers)
+    start = time.perf_counter()
+    assert scraper.scrape_all_data(incremental=False)
+    return time.perf_counter() - start
+
+
+def test_parallel_backfill_is_faster_and_keeps_the_row_order(workdir):
+    df = make_frame(300)
+    with FakeTGJUServer.from_frame(df, latency=PAGE_DELAY) as server:
+        sequential = timed_full_scrape(server, workers=1)
+        pd.testing.assert_frame_equal(pd.read_csv(DataManager().csv_path), df)
+        
+        parallel = timed_full_scrape(server, workers=6)
+        pd.testing.assert_frame_equal(pd.read_csv(DataManager().csv_path), df)
+    
+    # 12 pages one after another, against the first page and then two rounds of six
+    assert sequential >= 12 * PAGE_DELAY
+    assert sequential / parallel > 2, f"{sequential:.2f}s with one worker, {parallel:.2f}s with six"
@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import main as cli
+from fake_tgju import FakeTGJUServer
+from src.config import DATA_DIR, DEFAULT_INSTRUMENT
+from synthetic import make_frame
+
+from .conftest import ROOT_DIR
+
+
+def run(capsys, *argv) -> tuple:
+    """Run one command; return (exit code, parsed JSON output)."""
+    code = cli.main(['--metrics-dir', 'metrics', *argv, '--json'])
+    return code, json.loads(capsys.readouterr().out)[DEFAULT_INSTRUMENT]
+
+
+def test_read_commands_write_nothing(store, capsys):
+    df = make_frame(100)
+    store(df)
+    before = sorted(os.listdir(DATA_DIR))
+    
+    assert run(capsys, 'query', '--summary')[1]['total_records'] == 100
+    assert run(capsys, 'query', '--latest', '3')[1]['rows'] == df.head(3).to_dict('records')
+    first, last = df['Gregorian Date'].iloc[20], df['Gregorian Date'].iloc[10]
+    assert len(run(capsys, 'query', '--from', first, '--to', last)[1]['rows']) == 11
+    assert run(capsys, 'verify')[0] == 0
+    
+    assert sorted(os.listdir(DATA_DIR)) == before
+
+
+@pytest.mark.parametrize('latest', ['0', '-1'])
+def test_latest_needs_a_positive_count(store, latest):
+    store(make_frame(10))
+    with pytest.raises(SystemExit):
+        cli.main(['query', '--latest', latest])
+
+
+def test_rows_as_published_are_warnings(store, capsys):
+    df = make_frame(50)
+    df.loc[3, 'Persian Date'] = df.loc[3, 'Gregorian Date'].replace('/', '-')
+    df.loc[5, 'Low Price'] = df.loc[5, 'Open Price'] + 1
+    store(df)
+    
+    code, report = run(capsys, 'verify')
+    assert code == 0 and not report['problems'] and not report['gaps'] and len(report['warnings']) == 2
+    assert run(capsys, 'verify', '--strict')[0] == 1
+
+
+@pytest.mark.parametrize('command', [['query', '--summary'], ['verify']])
+def test_read_commands_skip_the_scraping_packages(store, command):
+    store(make_frame(50))
+    # A fresh interpreter, since other tests have imported the scrapers into this one
+    program = (f"import sys, main; main.main({command + ['--json']!r}); "
+               "print(sorted(name for name in ('selenium', 'requests') if name in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', program], capture_output=True, text=True,
+                            env={**os.environ, 'PYTHONPATH': ROOT_DIR})
+    
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[-1] == '[]'
+
+
+def test_update_fills_the_gaps_verify_reports(store, capsys, monkeypatch):
+    df = make_frame(300)
+    store(df.drop(index=df.index[150:158]))
+    assert len(run(capsys, 'verify')[1]['gaps']) == 1
+    
+    with FakeTGJUServer.from_frame(df) as server:
+        monkeypatch.setattr('src.instruments.API_URL_TEMPLATE', server.api_url_template())
+        code, result = run(capsys, '--backend', 'http', 'update', '--fill-gaps')
+    
+    assert code == 0 and result['success']
+    assert run(capsys, 'query', '--summary')[1]['total_records'] == 300
+    assert not run(capsys, 'verify')[1]['gaps']
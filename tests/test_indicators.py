@@ -0,0 +1,116 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import indicators
+from src.config import EMA_PERIODS, RSI_PERIOD
+from src.indicators import IndicatorState, compute_indicators
+from synthetic import make_frame
+
+from .conftest import INDICATOR_CSV_PATH, INDICATOR_GOLDEN_PATH
+
+RUNNING = [f'EMA {period}' for period in EMA_PERIODS] + ['MACD', 'MACD Signal', 'RSI']
+
+with open(INDICATOR_GOLDEN_PATH, encoding='utf-8') as f:
+    GOLDEN = json.load(f)
+
+
+def loop_ema(values, period: int) -> list:
+    """calculateEMA written out: seeded with the first value."""
+    multiplier = 2 / (period + 1)
+    result = [float(values[0])]
+    for value in values[1:]:
+        result.append(value * multiplier + result[-1] * (1 - multiplier))
+    return result
+
+
+def test_ema_matches_the_recurrence():
+    close = make_frame(200)['Close Price'].to_numpy()[::-1]
+    np.testing.assert_allclose(indicators.ema(close, 12), loop_ema(close, 12))
+
+
+def test_rsi_edges():
+    rising = np.arange(1, 40, dtype=float)
+    values = indicators.rsi(rising)
+    assert np.isnan(values[:RSI_PERIOD]).all()
+    assert (values[RSI_PERIOD:] == 100).all()
+    assert np.isnan(indicators.rsi(np.full(30, 5.0))[RSI_PERIOD:]).all()
+    assert np.isnan(indicators.rsi(rising[:RSI_PERIOD])).all()
+
+
+def test_momentum_and_stochastic():
+    close = np.array([100.0] * 10 + [110.0, 121.0])
+    np.testing.assert_allclose(indicators.momentum(close, 10)[10:], [10.0, 21.0])
+    
+    high, low = np.arange(10, 30, dtype=float), np.arange(0, 20, dtype=float)
+    k, d = indicators.stochastic(high, low, high, periods=(5, 3))
+    # The close is the highest high of every window
+    np.testing.assert_allclose(k[4:], 100.0)
+    np.testing.assert_allclose(d[6:], 100.0)
+    assert np.isnan(d[:6]).all()
+
+
+@pytest.fixture(scope='module')
+def fixture_indicators() -> pd.DataFrame:
+    result = compute_indicators(pd.read_csv(INDICATOR_CSV_PATH))
+    return result.set_index(result['Gregorian Date'].str.replace('/', '-'))
+
+
+@pytest.mark.parametrize('name', sorted(GOLDEN))
+def test_indicators_match_the_dashboard_javascript(fixture_indicators, name):
+    # docs/script.js draws a point for every day Python has a value, and only for those
+    drawn = fixture_indicators[name].dropna()
+    assert sorted(drawn.index) == sorted(GOLDEN[name])
+    np.testing.assert_allclose(drawn.to_numpy(), [GOLDEN[name][day] for day in drawn.index], rtol=1e-9)
+
+
+def test_compute_indicators_is_oldest_first():
+    df = make_frame(300)
+    result = compute_indicators(df)
+    
+    assert result['Gregorian Date'].tolist() == df['Gregorian Date'].tolist()[::-1]
+    assert result['RSI'].notna().sum() == len(df) - RSI_PERIOD
+    assert compute_indicators(df.iloc[:0]).empty
+
+
+def test_advancing_one_day_at_a_time_matches_the_full_calculation():
+    df = make_frame(120)
+    full = compute_indicators(df)
+    state = IndicatorState()
+    
+    advanced = state.advance_frame(df)
+    
+    for name in RUNNING:
+        np.testing.assert_allclose(advanced[name].astype(float), full[name], rtol=1e-12, equal_nan=True, err_msg=name)
+    assert state.last_date == df['Gregorian Date'].iloc[0]
+
+
+@pytest.mark.parametrize('rows', [1, RSI_PERIOD, RSI_PERIOD + 1, 26, 500])
+def test_state_from_frame_matches_advancing(rows):
+    df = make_frame(rows)
+    advanced = IndicatorState()
+    advanced.advance_frame(df)
+    built = IndicatorState.from_frame(df)
+    
+    assert built.rows == advanced.rows and built.last_date == advanced.last_date
+    for name, value in built.values().items():
+        assert value == pytest.approx(advanced.values()[name], rel=1e-12, nan_ok=True), name
+    
+    # And both continue the same way
+    next_day = make_frame(1, end=pd.Timestamp(df['Gregorian Date'].iloc[0]).date() + pd.Timedelta(days=1))
+    pd.testing.assert_frame_equal(built.advance_frame(next_day), advanced.advance_frame(next_day), rtol=1e-12)
+
+
+def test_state_round_trip(workdir):
+    state = IndicatorState.from_frame(make_frame(100))
+    state.save('state.json')
+    
+    loaded = IndicatorState.load('state.json')
+    assert loaded.to_dict() == state.to_dict()
+    assert IndicatorState.load('missing.json') is None
+    
+    state.emas.pop(EMA_PERIODS[-1])
+    state.save('state.json')
+    assert IndicatorState.load('state.json') is None
@@ -0,0 +1,145 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+import requests
+
+from fake_tgju import FakeTGJUServer, render_rows
+from src.data_manager import DataManager
+from src.scraper import DollarScraper
+from src.storage import ScrapeJournal
+from src.utils import strip_html
+from synthetic import make_frame
+
+
+def render_cells(df) -> list:
+    """Cell texts of the history table for a frame, as the browser shows them."""
+    return [[strip_html(cell) for cell in row] for row in render_rows(df.itertuples(index=False))]
+
+
+def test_journal_resumes_the_same_scrape(workdir):
+    journal = ScrapeJournal('scrape.journal')
+    assert journal.start(mode='full', total=90, page_size=30) == {}
+    journal.record(0, [{'day': 1}])
+    journal.record(30, [{'day': 2}])
+    
+    resumed = ScrapeJournal('scrape.journal')
+    assert resumed.start(mode='full', total=90, page_size=30) == {0: [{'day': 1}], 30: [{'day': 2}]}
+
+
+def test_journal_of_another_scrape_is_discarded(workdir):
+    journal = ScrapeJournal('scrape.journal')
+    journal.start(mode='full', total=90, page_size=30)
+    journal.record(0, [{'day': 1}])
+    
+    # A new day was published, so every page offset has shifted
+    assert ScrapeJournal('scrape.journal').start(mode='full', total=91, page_size=30) == {}
+
+
+def test_torn_final_line_is_ignored(workdir):
+    journal = ScrapeJournal('scrape.journal')
+    journal.start(mode='full', total=90, page_size=30)
+    journal.record(0, [{'day': 1}])
+    with open('scrape.journal', 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'offset': 30, 'rows': []})[:10])
+    
+    assert ScrapeJournal('scrape.journal').start(mode='full', total=90, page_size=30) == {0: [{'day': 1}]}
+
+
+def test_clear_and_record_without_start(workdir):
+    journal = ScrapeJournal('scrape.journal')
+    journal.record(0, [{'day': 1}])
+    journal.start(mode='full')
+    journal.clear()
+    
+    assert ScrapeJournal('scrape.journal').start(mode='full') == {}
+
+
+def backfill_scraper(server: FakeTGJUServer):
+    scraper = server.scraper(page_size=50, workers=2)
+    scraper.start_time = datetime.now()
+    return scraper
+
+
+def test_interrupted_backfill_fetches_only_the_missing_pages(workdir):
+    df = make_frame(250)
+    with FakeTGJUServer.from_frame(df) as server:
+        scraper = backfill_scraper(server)
+        fetch_page = scraper._fetch_page
+        
+        def failing_fetch(start, length):
+            if start == 150:
+                raise requests.ConnectionError("Simulated failure")
+            return fetch_page(start, length)
+        
+        scraper._fetch_page = failing_fetch
+        with pytest.raises(requests.ConnectionError):
+            scraper._backfill()
+        
+        before = server.request_count
+        rows = backfill_scraper(server)._backfill()
+        # The first page, for the record count, and the page that failed
+        assert server.request_count - before == 2
+    
+    assert [row.gregorian_date for row in rows] == df['Gregorian Date'].tolist()
+
+
+def test_quiet_run_clears_the_journal(workdir):
+    scraper = DollarScraper()
+    journal = scraper.data_manager.journal
+    journal.start(mode='incremental', total=90, page_size=30)
+    journal.record(0, [])
+    
+    assert scraper._save_scraped_data(incremental=True)
+    assert scraper.data_manager.journal.start(mode='incremental', total=90, page_size=30) == {}
+
+
+class FakeTable:
+    """Stands in for the browser: pages of the history table and the navigation the Selenium scraper uses."""
+    
+    def __init__(self, scraper: DollarScraper, rows: list, page_size: int, fail_at: int = None):
+        self.rows, self.page_size, self.fail_at = rows, page_size, fail_at
+        self.page = 0
+        self.read = []
+        scraper.driver = self
+        scraper._wait_for_table_change = lambda previous: True
+        scraper._get_pagination_info = lambda: {'total': len(rows), 'current_page_size': page_size}
+        scraper._scrape_current_page = self.scrape
+        scraper._has_next_page = lambda: (self.page + 1) * page_size < len(rows)
+        scraper._click_next_page = self.click
+        scraper._jump_to_page = self.jump
+    
+    def get(self, url):
+        pass
+    
+    def scrape(self):
+        if self.page == self.fail_at:
+            raise KeyboardInterrupt
+        self.read.append(self.page)
+        return self.rows[self.page * self.page_size:(self.page + 1) * self.page_size]
+    
+    def click(self):
+        self.page += 1
+        return True
+    
+    def jump(self, page):
+        self.page = page
+        return True
+
+
+def test_selenium_scrape_resumes_after_the_journaled_pages(workdir):
+    df = make_frame(150)
+    rows = DollarScraper()._build_rows(render_cells(df))
+    
+    scraper = DollarScraper()
+    table = FakeTable(scraper, rows, page_size=30, fail_at=3)
+    assert not scraper.scrape_all_data(incremental=False)
+    assert table.read == [0, 1, 2]
+    
+    scraper = DollarScraper()
+    table = FakeTable(scraper, rows, page_size=30)
+    assert scraper.scrape_all_data(incremental=False)
+    assert table.read == [3, 4]
+    assert DataManager().load_existing_data()['Gregorian Date'].tolist() == df['Gregorian Date'].tolist()
+    assert not os.path.exists(scraper.data_manager.journal.path)
@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+
+from fake_tgju import render_rows
+from src import utils
+from src.http_scraper import HttpScraper
+from src.models import PriceRow
+from src.scraper import DollarScraper
+from src.utils import clean_price_text, clean_prices, parse_table_html
+from synthetic import make_frame
+
+from .conftest import DATASET_PATH, HISTORY_PAGE_PATH
+
+
+def load_history_page() -> str:
+    with open(HISTORY_PAGE_PATH, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_history_page_cells():
+    cells = parse_table_html(load_history_page())
+    
+    assert len(cells) == 30
+    assert all(len(row) == 8 for row in cells)
+    # Markup inside cells (the change spans) is reduced to its text
+    assert cells[0] == ['1,880,050', '1,867,800', '1,882,200', '1,880,200', '200', '0.01%', '2026/08/06', '1405/05/15']
+
+
+def test_history_page_rows_match_the_dataset():
+    rows = [row.to_dict() for row in DollarScraper()._build_rows(parse_table_html(load_history_page()))]
+    stored = pd.read_csv(DATASET_PATH, dtype={'Change Amount': str}).head(30).to_dict('records')
+    
+    # Change amounts keep the site's thousands separators; the dataset stores them without
+    for row in rows:
+        row['Change Amount'] = row['Change Amount'].replace(',', '')
+    assert rows == stored
+
+
+def test_missing_table():
+    assert parse_table_html('') == []
+    assert parse_table_html('<html><body><p>maintenance</p></body></html>') == []
+
+
+def test_api_payload_rows_match_the_frame():
+    df = make_frame(50)
+    payload = {'recordsTotal': len(df), 'data': render_rows(df.itertuples(index=False))}
+    rows = HttpScraper()._parse_payload(payload)
+    
+    # Thousands separators and the change spans are stripped; the change columns stay text
+    expected = df.astype({'Change Amount': str}).to_dict('records')
+    assert [row.to_dict() for row in rows] == expected
+
+
+def test_api_payload_drops_invalid_rows():
+    df = make_frame(3)
+    raw = render_rows(df.itertuples(index=False))
+    raw[1][3] = '-'  # No close price
+    raw[2][6] = ''  # No date
+    rows = HttpScraper()._parse_payload({'data': raw})
+    
+    assert [row.gregorian_date for row in rows] == [df['Gregorian Date'].iloc[0]]
+    assert HttpScraper()._parse_payload({}) == []
+
+
+def test_price_row_round_trip():
+    record = make_frame(1).astype({'Change Amount': str}).to_dict('records')[0]
+    row = PriceRow.from_dict(record)
+    
+    assert row.to_dict() == record
+    assert row == PriceRow.from_dict(record)
+    assert row.is_valid()
+    assert not PriceRow.from_dict({**record, 'Gregorian Date': '2026/02/30'}).is_valid()
+
+
+@pytest.mark.parametrize('cell', [
+    '1,000', '1_000', '1 000', '1\u00a0000', '1\u2009000', ' 12.9 ', '-5', '+.5', '12.', '.', '1e3', '1E-2',
+    '۱۲۳', '١٢٣٫٥', '\u22127', 'inf', 'nan', '-Infinity', '1e400', '0x10', 'abc', '',
+])
+def test_cell_and_arrow_cleaners_agree(monkeypatch, cell):
+    per_cell = clean_price_text(cell)
+    assert clean_prices([cell]) == [per_cell]
+    
+    monkeypatch.setattr(utils, 'VECTORIZE_MIN_CELLS', 0)
+    assert clean_prices([cell]) == [per_cell]
+
+
+def test_cell_and_batch_cleaners_agree():
+    cells = ['۱,۸۸۰,۰۵۰', ' 1,867,800 ', '12.9', '-', '', None, '1e30']
+    batch = clean_prices(cells * 100)
+    
+    assert [clean_price_text(cell) for cell in cells] == [1880050, 1867800, 12, None, None, None, int(1e30)]
+    # A batch is an int64 column, so prices beyond its range are missing
+    assert batch[:len(cells)] == [1880050, 1867800, 12, None, None, None, None]
+    assert batch == clean_prices(cells) * 100
@@ -0,0 +1,97 @@
+import os
+
+import pandas as pd
+import requests
+
+from fake_tgju import FakeTGJUServer
+from src.data_manager import DataManager
+from src.scraper import DollarScraper
+from synthetic import make_frame
+
+
+def stream_scraper(server: FakeTGJUServer, **kwargs):
+    return server.scraper(page_size=50, workers=2, stream=True, **kwargs)
+
+
+def test_streamed_scrape_reproduces_the_listing(workdir):
+    df = make_frame(230)
+    with FakeTGJUServer.from_frame(df) as server:
+        scraper = stream_scraper(server)
+        assert scraper.scrape_all_data(incremental=False)
+    
+    pd.testing.assert_frame_equal(pd.read_csv(scraper.data_manager.csv_path), df)
+    assert not os.path.exists(scraper.data_manager.staging.path)
+
+
+def test_failed_sink_is_not_reported_as_success(workdir):
+    df = make_frame(230)
+    with FakeTGJUServer.from_frame(df) as server:
+        scraper = stream_scraper(server)
+        
+        def failing_stage(rows, next_offset):
+            raise OSError("disk full")
+        
+        scraper.data_manager.stage_rows = failing_stage
+        assert not scraper.scrape_all_data(incremental=False)
+    
+    assert not os.path.exists(scraper.data_manager.csv_path)
+
+
+def test_network_failure_discards_the_staged_rows_before_falling_back(workdir, monkeypatch):
+    df = make_frame(230)
+    staged_at_fallback = []
+    
+    def selenium_scrape(self, incremental=True):
+        staged_at_fallback.append(os.path.exists(self.data_manager.staging.path))
+        return False
+    
+    monkeypatch.setattr(DollarScraper, 'scrape_all_data', selenium_scrape)
+    with FakeTGJUServer.from_frame(df) as server:
+        scraper = stream_scraper(server, fallback=True)
+        fetch_page = scraper._fetch_page
+        
+        def failing_fetch(start, length):
+            if start == 150:
+                raise requests.ConnectionError("connection reset")
+            return fetch_page(start, length)
+        
+        scraper._fetch_page = failing_fetch
+        assert not scraper.scrape_all_data(incremental=False)
+    
+    assert staged_at_fallback == [False]
+    assert not os.path.exists(scraper.data_manager.staging.checkpoint_path)
+
+
+def test_network_failure_without_fallback_resumes(workdir):
+    df = make_frame(230)
+    with FakeTGJUServer.from_frame(df) as server:
+        scraper = stream_scraper(server)
+        fetch_page = scraper._fetch_page
+        
+        def failing_fetch(start, length):
+            if start == 150:
+                raise requests.ConnectionError("connection reset")
+            return fetch_page(start, length)
+        
+        scraper._fetch_page = failing_fetch
+        assert not scraper.scrape_all_data(incremental=False)
+        assert os.path.exists(scraper.data_manager.staging.path)
+        
+        before = server.request_count
+        assert stream_scraper(server).scrape_all_data(incremental=False)
+        # The first page for the total, then the two pages that were never staged
+        assert server.request_count - before == 3
+    
+    pd.testing.assert_frame_equal(pd.read_csv(scraper.data_manager.csv_path), df)
+
+
+def test_rows_staged_twice_are_dropped_at_commit(workdir):
+    df = make_frame(100)
+    manager = DataManager()
+    manager.start_staging(total=100, page_size=50)
+    manager.stage_rows(df.iloc[:50].to_dict('records'), 50)
+    # A day was published mid-scrape, so the second page starts one row early
+    manager.stage_rows(df.iloc[49:].to_dict('records'), 100)
+    
+    assert manager.commit_staged()
+    pd.testing.assert_frame_equal(pd.read_csv(manager.csv_path), df)
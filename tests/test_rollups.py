@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from src.config import ROLLUP_PERIODS, WEEK_END
+from src.data_manager import DataManager
+from src.rollups import PERIOD, FIRST_DATE, LAST_DATE, OHLC, DAYS, Rollups
+
+from .conftest import DATASET_PATH
+
+DATE, PERSIAN_DATE = 'Gregorian Date', 'Persian Date'
+# The stored rows end on a Saturday, so the appended days fill its week and start the next
+NEW_DAYS = 10
+
+
+def bars_frame(rows: list) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=[FIRST_DATE, LAST_DATE, *OHLC.values(), DAYS])
+
+
+def resampled(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Weekly or monthly bars of a whole dataset from DataFrame.resample."""
+    daily = df.assign(time=pd.to_datetime(df[DATE], format='%Y/%m/%d')).set_index('time').sort_index()
+    rule = {'weekly': f'W-{WEEK_END}', 'monthly': 'MS'}[period]
+    grouped = daily.resample(rule)
+    bars = pd.DataFrame({
+        FIRST_DATE: grouped[DATE].first(), LAST_DATE: grouped[DATE].last(),
+        OHLC['open']: grouped[OHLC['open']].first(), OHLC['high']: grouped[OHLC['high']].max(),
+        OHLC['low']: grouped[OHLC['low']].min(), OHLC['close']: grouped[OHLC['close']].last(),
+        DAYS: grouped.size()
+    })
+    return bars_frame(bars[bars[DAYS] > 0].to_dict('records'))
+
+
+def persian_bars(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Bars of consecutive days in one Persian month or year, walking the rows oldest first."""
+    rows, key = [], None
+    for row in df.iloc[::-1].to_dict('records'):
+        parts = str(row[PERSIAN_DATE]).split('/')
+        # Days published without a YYYY/MM/DD Persian date stay in the period of the day before
+        if len(parts) == 3 and all(part.isdigit() for part in parts):
+            key = parts[0] if period == 'persian_year' else f"{parts[0]}/{parts[1]}"
+        prices = [row[column] for column in OHLC.values()]
+        if rows and rows[-1][0] == key:
+            bar = rows[-1][1]
+            bar[1] = row[DATE]
+            bar[3], bar[4], bar[5] = max(bar[3], prices[1]), min(bar[4], prices[2]), prices[3]
+            bar[6] += 1
+        else:
+            rows.append((key, [row[DATE], row[DATE], *prices, 1]))
+    return bars_frame([bar for _, bar in rows])
+
+
+def expected_bars(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    return resampled(df, period) if period in ('weekly', 'monthly') else persian_bars(df, period)
+
+
+def assert_bars_equal(rollups: Rollups, df: pd.DataFrame):
+    for period in ROLLUP_PERIODS:
+        got = rollups.query(period).drop(columns=PERIOD)
+        pd.testing.assert_frame_equal(got, expected_bars(df, period), check_dtype=False, obj=period)
+
+
+@pytest.fixture(scope='module')
+def dataset() -> pd.DataFrame:
+    return pd.read_csv(DATASET_PATH)
+
+
+def test_rollups_match_a_full_regrouping(dataset):
+    assert_bars_equal(Rollups.from_frame(dataset), dataset)
+
+
+def test_appended_days_fold_into_the_open_periods(store, dataset):
+    stored = dataset.iloc[NEW_DAYS:]
+    for period in ROLLUP_PERIODS:
+        # The newest stored bar is still open: the full dataset has more days in it
+        open_bar = expected_bars(stored, period).iloc[-1]
+        full = expected_bars(dataset, period).set_index(FIRST_DATE)
+        assert full.loc[open_bar[FIRST_DATE], DAYS] > open_bar[DAYS], period
+    
+    manager = store(stored)
+    manager.get_rollups()
+    for day in reversed(range(NEW_DAYS)):
+        assert manager.append_new_data(dataset.iloc[day:day + 1].to_dict('records'))
+    
+    # A fresh manager reads the rollups the appends saved
+    assert_bars_equal(DataManager().get_rollups(), dataset)
@@ -0,0 +1,96 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.row_index import RowIndex
+from synthetic import make_frame
+
+
+def between(df: pd.DataFrame, column: str, start=None, end=None) -> pd.DataFrame:
+    keep = pd.Series(True, index=df.index)
+    if start is not None:
+        keep &= df[column] >= start
+    if end is not None:
+        keep &= df[column] <= end
+    return df[keep].reset_index(drop=True)
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2025/03/01', '2025/03/31'),
+    (None, '2024/12/31'),
+    ('2026/08/01', None),
+    ('2026/08/06', '2026/08/06'),
+])
+def test_gregorian_ranges(store, start, end):
+    df = make_frame(1000)
+    manager = store(df)
+    
+    pd.testing.assert_frame_equal(manager.get_range(start, end), between(df, 'Gregorian Date', start, end))
+    assert os.path.exists(manager.row_index_path)
+
+
+def test_empty_range(store):
+    df = make_frame(100)
+    manager = store(df)
+    
+    rows = manager.get_range('1990/01/01', '1990/12/31')
+    assert rows.empty and list(rows.columns) == list(df.columns)
+
+
+def test_persian_ranges(store):
+    df = make_frame(1000)
+    manager = store(df)
+    start, end = df['Persian Date'].iloc[400], df['Persian Date'].iloc[300]
+    
+    got = manager.get_range(start, end, calendar='persian')
+    pd.testing.assert_frame_equal(got, between(df, 'Persian Date', start, end))
+    assert manager.get_on(df['Persian Date'].iloc[10], calendar='persian') == df.iloc[10].to_dict()
+
+
+def test_lookups(store):
+    df = make_frame(500)
+    manager = store(df)
+    
+    assert manager.get_on(df['Gregorian Date'].iloc[42]) == df.iloc[42].to_dict()
+    assert manager.get_on('1990/01/01') is None
+    pd.testing.assert_frame_equal(manager.latest(30), df.head(30))
+    pd.testing.assert_frame_equal(manager.latest(10000), df)
+    assert manager.get_row_index().date_bounds() == (
+        pd.Timestamp(df['Gregorian Date'].iloc[-1]).toordinal(), pd.Timestamp(df['Gregorian Date'].iloc[0]).toordinal()
+    )
+
+
+def test_invalid_bounds(store):
+    manager = store(make_frame(10))
+    with pytest.raises(ValueError):
+        manager.get_range('2026-08-01')
+    with pytest.raises(ValueError):
+        manager.get_range('2026/02/30')
+    with pytest.raises(ValueError):
+        manager.get_range(calendar='hijri')
+
+
+def test_unsorted_dataset_is_filtered_instead(store):
+    df = make_frame(100)
+    manager = store(df.iloc[[1, 0, *range(2, 100)]])
+    
+    assert RowIndex.from_csv(manager.csv_path, pd.read_csv(manager.csv_path)) is None
+    assert manager.get_row_index() is None
+    start, end = df['Gregorian Date'].iloc[5], df['Gregorian Date'].iloc[0]
+    got = manager.get_range(start, end).sort_values('Gregorian Date', ascending=False).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, df.head(6))
+    pd.testing.assert_frame_equal(manager.latest(3), df.head(3))
+
+
+def test_saved_index_is_reused_until_the_csv_changes(store):
+    df = make_frame(100)
+    manager = store(df.iloc[1:])
+    index = manager.get_row_index()
+    
+    loaded = RowIndex.load(manager.row_index_path)
+    assert loaded.csv_signature == index.csv_signature
+    assert (loaded.table == index.table).all()
+    
+    df.to_csv(manager.csv_path, index=False)
+    assert len(manager.get_row_index()) == 100
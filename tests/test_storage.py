@@ -0,0 +1,134 @@
+import os
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+import pytest
+
+from src.config import DATA_DIR
+from src.data_manager import DataManager, to_typed_frame
+from src.storage import FileLock, atomic_write
+from synthetic import make_frame
+
+
+class FailingFile:
+    """A file that fails like a full disk once `limit` bytes or characters were written to it."""
+    
+    def __init__(self, f, limit: int):
+        self.f = f
+        self.limit = limit
+    
+    def write(self, data):
+        if len(data) > self.limit:
+            self.f.write(data[:self.limit])
+            raise OSError(28, "No space left on device")
+        self.limit -= len(data)
+        return self.f.write(data)
+    
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+
+def temp_files(directory: str) -> list:
+    return [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+
+def test_one_lock_per_path(workdir):
+    assert FileLock.shared('data.lock') is FileLock.shared(str(workdir / 'data.lock'))
+    assert FileLock.shared('data.lock') is not FileLock.shared('other.lock')
+    assert DataManager().lock is DataManager().lock
+
+
+def test_two_managers_do_not_deadlock(workdir):
+    with DataManager().lock:
+        with DataManager().lock:
+            pass
+
+
+def test_worker_threads_re_enter_a_held_lock(workdir):
+    lock = FileLock('data.lock', timeout=5)
+    entered = []
+    
+    def worker():
+        for _ in range(200):
+            with lock:
+                entered.append(1)
+    
+    with lock:
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert lock._depth == 1
+    
+    assert len(entered) == 1600
+    assert lock._depth == 0 and lock._file is None
+
+
+def test_held_lock_times_out_for_another_open_file(workdir):
+    with FileLock('data.lock'):
+        with pytest.raises(TimeoutError):
+            FileLock('data.lock', timeout=0.2, poll_interval=0.05).acquire()
+
+
+def test_failed_atomic_write_keeps_the_original(workdir):
+    with open('prices.csv', 'wb') as f:
+        f.write(b'old contents\n')
+    
+    with pytest.raises(OSError):
+        with atomic_write('prices.csv', 'wb') as f:
+            FailingFile(f, limit=4).write(b'new contents\n')
+    
+    with open('prices.csv', 'rb') as f:
+        assert f.read() == b'old contents\n'
+    assert not temp_files('.')
+
+
+@pytest.mark.parametrize('mode', ['w', 'a'])
+def test_interrupted_dataset_write_leaves_the_csv_alone(store, monkeypatch, mode):
+    df = make_frame(300)
+    manager = store(df.iloc[100:])
+    with open(manager.csv_path, 'rb') as f:
+        before = f.read()
+    
+    @contextmanager
+    def failing_atomic_write(path, *args, **kwargs):
+        with atomic_write(path, *args, **kwargs) as f:
+            yield FailingFile(f, limit=len(before) // 2)
+    
+    monkeypatch.setattr('src.data_manager.atomic_write', failing_atomic_write)
+    assert not manager.save_data(df.iloc[:100].to_dict('records'), mode=mode)
+    
+    with open(manager.csv_path, 'rb') as f:
+        assert f.read() == before
+    assert not temp_files(DATA_DIR)
+
+
+def typed_csv(manager: DataManager) -> pd.DataFrame:
+    return to_typed_frame(pd.read_csv(manager.csv_path))
+
+
+def test_columnar_copy_matches_the_csv(store):
+    df = make_frame(300)
+    manager = store(df.iloc[5:])
+    pd.testing.assert_frame_equal(manager.load_fast(), typed_csv(manager))
+    # Read back from the copy the first call wrote
+    pd.testing.assert_frame_equal(DataManager().load_fast(), typed_csv(manager))
+    
+    # Spliced rows are converted on their own and put in front of the copy
+    assert manager.append_new_data(df.iloc[:5].to_dict('records'))
+    pd.testing.assert_frame_equal(DataManager().load_fast(), typed_csv(manager))
+
+
+def test_columnar_copy_is_rebuilt_after_a_hand_edit(store):
+    df = make_frame(300)
+    manager = store(df)
+    manager.load_fast()
+    
+    # Drop a row and correct a close by hand
+    edited = df.drop(index=100)
+    edited.loc[50, 'Close Price'] = 123456
+    edited.to_csv(manager.csv_path, index=False)
+    
+    pd.testing.assert_frame_equal(DataManager().load_fast(), typed_csv(manager))
@@ -0,0 +1,61 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from fake_tgju import FakeTGJUServer
+from src.async_scraper import AsyncHttpScraper
+from src.data_manager import DataManager
+from synthetic import make_frame
+
+# Eight days missing from the stored rows, a wider hole than SYNC_MAX_GAP_DAYS
+MISSING = slice(150, 158)
+REVISED = 20
+
+
+def damaged(df: pd.DataFrame) -> pd.DataFrame:
+    """The stored rows: three days behind the site, with a hole and a close the site has since revised."""
+    stored = df.drop(index=df.index[MISSING]).copy()
+    stored.loc[REVISED, 'Close Price'] += 100
+    return stored.iloc[3:]
+
+
+def stored() -> pd.DataFrame:
+    return pd.read_csv(DataManager().csv_path)
+
+
+@pytest.mark.parametrize('update', [
+    lambda scraper: scraper.run(fill_gaps=True),
+    lambda scraper: scraper.quick_update(30, fill_gaps=True),
+], ids=['run', 'quick_update'])
+def test_update_fills_gaps_and_replaces_revised_rows(store, update):
+    df = make_frame(300)
+    store(damaged(df))
+    with FakeTGJUServer.from_frame(df) as server:
+        assert update(server.scraper(page_size=50))
+    
+    pd.testing.assert_frame_equal(stored(), df)
+    assert not DataManager().get_date_index().gaps()
+
+
+def test_gaps_are_only_checked_on_request(store):
+    df = make_frame(300)
+    store(damaged(df))
+    with FakeTGJUServer.from_frame(df) as server:
+        assert server.scraper(page_size=50).run()
+        # The first page reaches the stored rows, and the hole is further back
+        assert server.request_count == 1
+    
+    expected = df.drop(index=df.index[MISSING])
+    pd.testing.assert_frame_equal(stored(), expected.reset_index(drop=True))
+    assert len(DataManager().get_date_index().gaps()) == 1
+
+
+def test_async_update_fills_gaps(store):
+    df = make_frame(300)
+    store(damaged(df))
+    with FakeTGJUServer.from_frame(df) as server:
+        scraper = AsyncHttpScraper(api_url=server.api_url(), page_size=50, rate_limit=0, retry_delay=0)
+        assert asyncio.run(scraper.run(fill_gaps=True))
+    
+    pd.testing.assert_frame_equal(stored(), df)